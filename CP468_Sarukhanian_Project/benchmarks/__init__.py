@@ -0,0 +1,4 @@
+"""Timing benchmarks for the NPAF kernels, plan expansion and searches.
+
+Run ``python -m benchmarks.run`` from the project root; see ``run.py``.
+"""
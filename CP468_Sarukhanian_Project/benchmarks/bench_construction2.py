@@ -0,0 +1,26 @@
+"""Scoring block signs of a Construction 2 layout."""
+from __future__ import annotations
+
+import numpy as np
+
+from src.construction2 import construction2_layout
+from src.golay import golay_pair
+from src.sequences import BASE_SEQUENCES
+from src.sign_problem import sign_problem_from_layout
+
+
+class Construction2Scoring:
+    params = [2, 10]
+    param_names = ["k"]
+
+    def setup(self, k: int) -> None:
+        turyn = tuple(BASE_SEQUENCES[name] for name in "ABCD")
+        self.layout = construction2_layout(turyn, golay_pair(k, cache_dir=None))
+        self.problem = sign_problem_from_layout(self.layout)
+        self.signs = np.random.default_rng(0).choice(np.array([-1, 1], dtype=np.int8), size=self.layout.num_blocks)
+
+    def time_layout_score(self, k: int) -> None:
+        self.layout.score(self.signs)
+
+    def time_sign_problem_evaluate(self, k: int) -> None:
+        self.problem.evaluate(self.signs)
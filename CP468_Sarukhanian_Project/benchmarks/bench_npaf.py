@@ -0,0 +1,44 @@
+"""NPAF kernels across sequence lengths."""
+from __future__ import annotations
+
+import numpy as np
+
+from src.npaf import npaf_all_shifts, npaf_sum_four
+from src.packed import PackedSequences
+
+
+def _random_pm1(shape, seed: int = 0):
+    return np.random.default_rng(seed).choice(np.array([-1, 1], dtype=np.int8), size=shape)
+
+
+class NPAFAllShifts:
+    params = [10, 100, 1000, 10_000, 100_000]
+    param_names = ["length"]
+
+    def setup(self, length: int) -> None:
+        self.sequence = _random_pm1(length)
+
+    def time_npaf_all_shifts(self, length: int) -> None:
+        npaf_all_shifts(self.sequence)
+
+
+class NPAFSumFour:
+    params = [110, 1000]
+    param_names = ["length"]
+
+    def setup(self, length: int) -> None:
+        self.rows = tuple(_random_pm1(length, seed) for seed in range(4))
+
+    def time_npaf_sum_four(self, length: int) -> None:
+        npaf_sum_four(*self.rows)
+
+
+class PackedBatch:
+    params = [110]
+    param_names = ["length"]
+
+    def setup(self, length: int) -> None:
+        self.packed = PackedSequences.from_int8(_random_pm1((1000, 4, length)))
+
+    def time_packed_npaf_sum_four(self, length: int) -> None:
+        self.packed.npaf_sum_four()
@@ -0,0 +1,28 @@
+"""Expanding and scoring the default 44-block plan."""
+from __future__ import annotations
+
+from src.compiled_plan import compile_plan
+from src.construction import get_default_plan, plan_to_sequences, verify_plan
+from src.correlation_tables import correlation_tables
+
+
+class DefaultPlan:
+    def setup(self) -> None:
+        self.plan = get_default_plan()
+        self.compiled = compile_plan(self.plan)
+        self.tables = correlation_tables(self.compiled.table)
+
+    def time_plan_to_sequences(self) -> None:
+        plan_to_sequences(self.plan)
+
+    def time_compile_plan(self) -> None:
+        compile_plan(self.plan)
+
+    def time_compiled_expand(self) -> None:
+        self.compiled.expand()
+
+    def time_table_sum_series(self) -> None:
+        self.tables.plan_sum_series(self.compiled)
+
+    def time_verify_plan(self) -> None:
+        verify_plan(self.plan)
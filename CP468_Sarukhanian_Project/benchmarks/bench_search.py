@@ -0,0 +1,78 @@
+"""One step of each search routine from a scrambled default plan.
+
+Each routine is called with its smallest iteration budget, so the timings
+include its per-call setup (building the sign problem, tables, ...) as
+well as a single step. The exact searches are capped instead:
+branch-and-bound at a fixed node budget, and meet-in-the-middle on the
+k = 2 Construction 2 layout, where it finishes in well under a second.
+``parallel_multi_start`` runs two one-iteration starts. The runner
+measures the parent's CPU time only, so this times process-pool dispatch
+and plan transfer, not the workers' own work.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from src.construction import get_default_plan
+from src.construction2 import construction2_layout
+from src.exhaustive_search import (
+    branch_and_bound_sign_search,
+    exhaustive_sign_search,
+    meet_in_the_middle_sign_search,
+    simulated_annealing_search,
+)
+from src.golay import golay_pair
+from src.greedy_search import greedy_sign_optimization
+from src.parallel_search import parallel_multi_start
+from src.repair import apply_sign_flip, auto_local_search
+from src.sequences import BASE_SEQUENCES
+from src.sign_problem import sign_problem_from_layout, sign_problem_from_plan
+from src.tempering import parallel_tempering
+
+
+def scrambled_plan():
+    flips = np.flatnonzero(np.random.default_rng(0).random(44) < 0.5)
+    return apply_sign_flip(get_default_plan(), [int(idx) for idx in flips])
+
+
+class SearchStep:
+    def setup(self) -> None:
+        self.plan = scrambled_plan()
+        self.problem, self.signs = sign_problem_from_plan(self.plan)
+
+    def time_greedy_sign_optimization(self) -> None:
+        greedy_sign_optimization(self.plan, max_iterations=1)
+
+    def time_greedy_pair_flips(self) -> None:
+        greedy_sign_optimization(self.plan, max_iterations=1, pair_flips=True)
+
+    def time_exhaustive_sign_search(self) -> None:
+        exhaustive_sign_search(self.plan, max_configs=1)
+
+    def time_simulated_annealing_search(self) -> None:
+        simulated_annealing_search(self.plan, max_iterations=1, random_seed=0)
+
+    def time_auto_local_search(self) -> None:
+        auto_local_search(self.plan, max_steps=1)
+
+    def time_parallel_tempering(self) -> None:
+        parallel_tempering(self.problem, max_steps=1, initial_signs=self.signs, random_seed=0)
+
+    def time_sign_problem_from_plan(self) -> None:
+        sign_problem_from_plan(self.plan)
+
+    def time_branch_and_bound_sign_search(self) -> None:
+        branch_and_bound_sign_search(self.problem, max_nodes=2000)
+
+    def time_parallel_multi_start(self) -> None:
+        parallel_multi_start(self.plan, num_starts=2, max_workers=2, max_iterations=1)
+
+
+class ExactConstruction2:
+    def setup(self) -> None:
+        turyn = tuple(BASE_SEQUENCES[name] for name in "ABCD")
+        layout = construction2_layout(turyn, golay_pair(2, cache_dir=None))
+        self.problem = sign_problem_from_layout(layout)
+
+    def time_meet_in_the_middle_sign_search(self) -> None:
+        meet_in_the_middle_sign_search(self.problem)
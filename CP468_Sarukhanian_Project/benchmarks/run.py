@@ -0,0 +1,205 @@
+"""Run the benchmarks and compare them against stored baselines.
+
+Benchmarks follow the asv layout: every ``bench_*.py`` module in this
+package defines classes whose ``time_*`` methods are timed. A class may
+set ``params`` (a list of values, or a list of lists for several
+parameters) and ``param_names``; ``setup`` runs once per parameter
+combination before timing and is not included in it. Each benchmark is
+timed as the best per-call CPU time (``time.process_time``, which is far
+less noisy than wall time on shared machines) over ``repeat`` runs of
+``timeit``'s auto-ranged loop, with stdout silenced.
+
+    python -m benchmarks.run                   # time and compare to baselines.json
+    python -m benchmarks.run --filter npaf     # only names containing "npaf"
+    python -m benchmarks.run --save            # record new baselines
+    python -m benchmarks.run --quick           # one call each, no comparison
+
+A benchmark regresses when it is more than ``threshold`` (default 50%)
+slower than its baseline. Apparent regressions are re-timed up to
+``recheck`` more times, keeping the best time, so that a one-off stall is
+not reported; remaining regressions make the command exit with status 1.
+Baselines are machine specific, so record them on the machine that runs
+the comparison.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib
+import io
+import itertools
+import json
+import platform
+import sys
+import time
+import timeit
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+BASELINE_PATH = BENCHMARK_DIR / "baselines.json"
+REGRESSION_THRESHOLD = 0.5
+
+
+@dataclass
+class Benchmark:
+    """One ``time_*`` method bound to one parameter combination."""
+
+    name: str
+    owner: type
+    method: str
+    args: Tuple[object, ...]
+
+    def prepare(self) -> Callable[[], None]:
+        """Instantiate the class, run ``setup`` and return the timed call."""
+        instance = self.owner()
+        setup = getattr(instance, "setup", None)
+        if setup is not None:
+            setup(*self.args)
+        bound = getattr(instance, self.method)
+        return lambda: bound(*self.args)
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline: Optional[float]
+    current: float
+
+    @property
+    def ratio(self) -> Optional[float]:
+        return None if self.baseline is None else self.current / self.baseline
+
+    def regressed(self, threshold: float) -> bool:
+        return self.ratio is not None and self.ratio > 1.0 + threshold
+
+
+def _param_grid(owner: type) -> List[Tuple[object, ...]]:
+    params = getattr(owner, "params", None)
+    if params is None:
+        return [()]
+    if params and all(isinstance(values, (list, tuple)) for values in params):
+        return list(itertools.product(*params))
+    return [(value,) for value in params]
+
+
+def discover(pattern: Optional[str] = None) -> List[Benchmark]:
+    """All benchmarks in ``bench_*.py`` modules, optionally filtered by name."""
+    benchmarks = []
+    for path in sorted(BENCHMARK_DIR.glob("bench_*.py")):
+        module = importlib.import_module(f"{__package__ or 'benchmarks'}.{path.stem}")
+        for owner_name, owner in vars(module).items():
+            if not isinstance(owner, type) or owner.__module__ != module.__name__:
+                continue
+            methods = sorted(name for name in vars(owner) if name.startswith("time_"))
+            for method, args in itertools.product(methods, _param_grid(owner)):
+                suffix = f"({', '.join(map(repr, args))})" if args else ""
+                name = f"{path.stem}.{owner_name}.{method}{suffix}"
+                if pattern is None or pattern in name:
+                    benchmarks.append(Benchmark(name, owner, method, args))
+    return benchmarks
+
+
+def time_benchmark(benchmark: Benchmark, repeat: int = 5, quick: bool = False) -> float:
+    """Best seconds per call; ``quick`` times a single call."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        call = benchmark.prepare()
+        timer = timeit.Timer(call, timer=time.process_time)
+        if quick:
+            return timer.timeit(number=1)
+        number, _ = timer.autorange()
+        return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def load_baselines(path: Path = BASELINE_PATH) -> Dict[str, float]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())["results"]
+
+
+def save_baselines(results: Dict[str, float], path: Path = BASELINE_PATH) -> None:
+    """Merge ``results`` into the baseline file, recording the machine they came from."""
+    merged = {**load_baselines(path), **results}
+    payload = {
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.machine(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+        },
+        "results": dict(sorted(merged.items())),
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n")
+
+
+def compare(results: Dict[str, float], baselines: Dict[str, float]) -> List[Comparison]:
+    return [Comparison(name, baselines.get(name), seconds) for name, seconds in results.items()]
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g}{unit}"
+    return f"{seconds / 1e-9:.3g}ns"
+
+
+def report(comparisons: Iterable[Comparison], threshold: float) -> List[Comparison]:
+    """Print a results table and return the regressions."""
+    regressions = []
+    for item in comparisons:
+        ratio = "new" if item.ratio is None else f"{item.ratio:.2f}x"
+        flag = ""
+        if item.regressed(threshold):
+            flag = "  REGRESSION"
+            regressions.append(item)
+        print(f"{item.name:<70} {_format_seconds(item.current):>9} {_format_seconds(item.baseline):>9} "
+              f"{ratio:>7}{flag}")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run timing benchmarks against stored baselines.")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this string.")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Allowed slowdown before a benchmark counts as regressed (0.5 = 50%%).")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON file.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats per benchmark.")
+    parser.add_argument("--recheck", type=int, default=2, help="Re-timings of an apparent regression.")
+    parser.add_argument("--save", action="store_true", help="Store these timings as the new baselines.")
+    parser.add_argument("--quick", action="store_true", help="Time one call each and skip the comparison.")
+    args = parser.parse_args(argv)
+
+    benchmarks = discover(args.filter)
+    results = {}
+    for benchmark in benchmarks:
+        results[benchmark.name] = time_benchmark(benchmark, repeat=args.repeat, quick=args.quick)
+    if args.quick:
+        report(compare(results, {}), args.threshold)
+        return 0
+    if args.save:
+        save_baselines(results, args.baseline)
+        print(f"Saved {len(results)} baselines to {args.baseline}")
+        return 0
+    baselines = load_baselines(args.baseline)
+    for benchmark in benchmarks:
+        for _ in range(args.recheck):
+            if not Comparison(benchmark.name, baselines.get(benchmark.name), results[benchmark.name]).regressed(
+                    args.threshold):
+                break
+            retimed = time_benchmark(benchmark, repeat=args.repeat)
+            results[benchmark.name] = min(results[benchmark.name], retimed)
+    print(f"{'benchmark':<70} {'time':>9} {'baseline':>9} {'ratio':>7}")
+    regressions = report(compare(results, baselines), args.threshold)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,186 +9,78 @@ import json
 # Add current directory to path
 sys.path.insert(0, str(Path(".").resolve()))
 
+from src.checkpoint import Checkpointer, load_checkpoint
+from src.construction2 import build_construction2, construction2_layout
+from src.exhaustive_search import gray_code_sign_search, meet_in_the_middle_sign_search
+from src.golay import golay_pair
 from src.npaf import npaf_sum_four
+from src.result_store import ResultStore, search_hash
+from src.sequences import BASE_SEQUENCES
+from src.sign_problem import sign_problem_from_layout
 
 def get_turyn_n3():
-    A = np.array([1, 1, 1])
-    B = np.array([1, 1, -1])
-    C = np.array([1, -1])
-    D = np.array([1, -1])
-    return A, B, C, D
+    return tuple(BASE_SEQUENCES[name] for name in "ABCD")
 
 def get_golay_k2():
-    F = np.array([1, 1])
-    G = np.array([1, -1])
-    return F, G
+    return golay_pair(2)
 
 def build_sequence(signs, A, B, C, D, F, G):
-    n = len(A)
-    k = len(F)
-    
-    x = np.array([1, 1, 0, 0])
-    y = np.array([1, -1, 0, 0])
-    z = np.array([0, 0, 1, 1])
-    w = np.array([0, 0, 1, -1])
-    
-    blocks = []
-    
-    # We will use the 'signs' list to flip signs of entire blocks if needed.
-    # There are many blocks.
-    # Let's define the structure first, then apply signs.
-    
-    # To make SA effective, we need to parameterize the signs of each term in the formula.
-    # The formula has 8 main groups.
-    # Groups 1, 4, 5, 8 have 'k' iterations.
-    # Groups 2, 3, 6, 7 have 1 iteration.
-    # Total "terms" = 4*k + 4.
-    # But each term inside the loop has sub-parts (length n and length n-1).
-    # Let's count the distinct "atomic" blocks we are concatenating.
-    # 1. k pairs of (n, n-1) -> 2k blocks
-    # 2. 1 pair (n, n-1) -> 2 blocks
-    # 3. k pairs -> 2k blocks
-    # 4. k pairs -> 2k blocks
-    # 5. 1 pair -> 2 blocks
-    # 6. k pairs -> 2k blocks
-    # Total blocks = 2k + 2 + 2k + 2k + 2 + 2k = 8k + 4.
-    # For k=2, that's 16 + 4 = 20 blocks.
-    
-    # We will pass a list of 20 signs.
-    
-    s_idx = 0
-    
-    # 1. Loop j=1 to k
-    for j in range(1, k + 1):
-        # Block 1a (len n)
-        val_f = F[k-j]
-        val_g = G[k-j]
-        coeff = x * val_f + z * val_g
-        for val_a in A:
-            blocks.append(coeff * val_a * signs[s_idx])
-        s_idx += 1
-            
-        # Block 1b (len n-1)
-        val_g_j = G[j-1]
-        val_f_k = F[k-j]
-        coeff = x * val_g_j + z * val_f_k
-        for val_c in C:
-            blocks.append(coeff * val_c * signs[s_idx])
-        s_idx += 1
-
-    # 2. {x a_i - z b_i}_{i=1}^n
-    # Block 2a (len n)
-    for i in range(n):
-        val_a = A[i]
-        val_b = B[i]
-        col = (x * val_a - z * val_b) * signs[s_idx]
-        blocks.append(col)
-    s_idx += 1
-        
-    # 3. {x d_i - z c_i}_{i=1}^{n-1}
-    # Block 3a (len n-1)
-    for i in range(n-1):
-        val_d = D[i]
-        val_c = C[i]
-        col = (x * val_d - z * val_c) * signs[s_idx]
-        blocks.append(col)
-    s_idx += 1
-        
-    # 4. Loop j=1 to k
-    for j in range(1, k + 1):
-        # Block 4a (len n)
-        val_g = G[j-1]
-        val_f = F[k-j]
-        coeff = x * val_g + z * val_f
-        for val_b in B:
-            blocks.append(coeff * val_b * signs[s_idx])
-        s_idx += 1
-            
-        # Block 4b (len n-1)
-        val_f_j = F[j-1]
-        val_g_k = G[k-j]
-        coeff = -x * val_f_j + z * val_g_k
-        for val_d in D:
-            blocks.append(coeff * val_d * signs[s_idx])
-        s_idx += 1
-            
-    # 5. Loop j=1 to k
-    for j in range(1, k + 1):
-        # Block 5a (len n)
-        val_f = F[k-j]
-        val_g = G[k-j]
-        coeff = y * val_f + w * val_g
-        for val_a in A:
-            blocks.append(coeff * val_a * signs[s_idx])
-        s_idx += 1
-            
-        # Block 5b (len n-1)
-        val_g_j = G[j-1]
-        val_f_j = F[j-1]
-        coeff = y * val_g_j - w * val_f_j
-        for val_c in C:
-            blocks.append(coeff * val_c * signs[s_idx])
-        s_idx += 1
-            
-    # 6. {-y a_i + w b_i}_{i=1}^n
-    # Block 6a (len n)
-    for i in range(n):
-        val_a = A[i]
-        val_b = B[i]
-        col = (-y * val_a + w * val_b) * signs[s_idx]
-        blocks.append(col)
-    s_idx += 1
-        
-    # 7. {y d_i + w c_i}_{i=1}^{n-1}
-    # Block 7a (len n-1)
-    for i in range(n-1):
-        val_d = D[i]
-        val_c = C[i]
-        col = (y * val_d + w * val_c) * signs[s_idx]
-        blocks.append(col)
-    s_idx += 1
-        
-    # 8. Loop j=1 to k
-    for j in range(1, k + 1):
-        # Block 8a (len n)
-        val_g = G[j-1]
-        val_f = F[k-j]
-        coeff = y * val_g + w * val_f
-        # Note: Original formula had -b_i. We capture that in the base logic or let SA find it.
-        # Original: -b_i(y g_j + w f_{k-j+1})
-        # My code here: coeff * val_b * signs[...]
-        # If signs is -1, it matches.
-        for val_b in B:
-            blocks.append(coeff * val_b * signs[s_idx])
-        s_idx += 1
-            
-        # Block 8b (len n-1)
-        val_f_j = F[j-1]
-        val_g_k = G[k-j]
-        coeff = y * val_f_j - w * val_g_k
-        for val_d in D:
-            blocks.append(coeff * val_d * signs[s_idx])
-        s_idx += 1
-            
-    X, Y, Z, W = [], [], [], []
-    for col in blocks:
-        X.append(col[0])
-        Y.append(col[1])
-        Z.append(col[2])
-        W.append(col[3])
-        
-    return np.array(X), np.array(Y), np.array(Z), np.array(W)
+    # The 8k + 4 blocks of the formula (20 for k=2) are laid out in
+    # src/construction2.py; `signs` flips each block as a whole.
+    return build_construction2((A, B, C, D), (F, G), signs)
 
-def get_score(signs, A, B, C, D, F, G):
-    x, y, z, w = build_sequence(signs, A, B, C, D, F, G)
-    diag = npaf_sum_four(x, y, z, w)
-    non_zero = np.nonzero(diag)[0]
-    max_abs = np.max(np.abs(diag)) if diag.size else 0
-    return non_zero.size * 1000 + max_abs
+# Layouts by input sequences, so repeated get_score calls only re-apply signs.
+_LAYOUTS = {}
 
-def solve():
+def get_layout(A, B, C, D, F, G):
+    key = tuple(np.asarray(seq, dtype=np.int8).tobytes() for seq in (A, B, C, D, F, G))
+    if key not in _LAYOUTS:
+        _LAYOUTS[key] = construction2_layout((A, B, C, D), (F, G))
+    return _LAYOUTS[key]
+
+def get_score(signs, A, B, C, D, F, G, layout=None):
+    if layout is None:
+        layout = get_layout(A, B, C, D, F, G)
+    return layout.score(signs)
+
+def solve_exact(method="gray", store=None):
+    """Decide the sign problem outright: every zero-NPAF sign vector, or none.
+
+    ``gray`` walks all 2^19 sign vectors (block 0 pinned) in Gray-code
+    order; ``meet`` joins two half tables instead. With a ``store`` an
+    earlier answer for the same problem is reused.
+    """
     A, B, C, D = get_turyn_n3()
     F, G = get_golay_k2()
+    layout = get_layout(A, B, C, D, F, G)
+    problem = sign_problem_from_layout(layout)
+    if method == "gray":
+        result = gray_code_sign_search(problem, store=store)
+    else:
+        result = meet_in_the_middle_sign_search(problem, store=store)
+    count = len(result['solutions']) * result['symmetry']
+    print(f"Exact search ({method}): {count} perfect sign assignments out of 2^{layout.num_blocks}")
+    for signs in result['solutions']:
+        print(signs.tolist())
+    return result
+
+def solve(exact=False, random_seed=None, checkpoint_path=None, checkpoint_every=1000,
+          resume_from=None, exact_method="gray", store=None):
+    if exact:
+        return solve_exact(exact_method, store=store)
+    A, B, C, D = get_turyn_n3()
+    F, G = get_golay_k2()
+    # A finished annealing run with the same seed is read back from the store;
+    # unseeded runs always search afresh.
+    if random_seed is None:
+        store = None
+    key = search_hash("solve_construction_2", {"random_seed": random_seed}, None, A, B, C, D, F, G)
+    if store is not None and resume_from is None:
+        stored = store.get("solve_construction_2", len(A), len(F), key)
+        if stored is not None:
+            print(f"Stored result: best score {stored.provenance['best_score']}")
+            return list(stored.provenance["best_signs"]), stored.provenance["best_score"]
+    rng = random.Random(random_seed)
     
     # Initial signs: All 1s (except where formula explicitly had minus, but we simplified)
     # Actually, let's try to match the formula's explicit signs first.
@@ -203,24 +95,48 @@ def solve():
     # Block 8a: -b_i.
     # Let's just let SA find it.
     
-    current_score = get_score(current_signs, A, B, C, D, F, G)
+    # Build the block layout once; each step only re-applies the signs.
+    layout = get_layout(A, B, C, D, F, G)
+    temp = 100.0
+    first_iter = 0
+    if resume_from is not None:
+        # Pick up an interrupted run: signs, temperature, RNG state and step.
+        state = load_checkpoint(resume_from, "solve_construction_2")
+        current_signs = list(state["current_signs"])
+        temp = state["temp"]
+        first_iter = state["iteration"]
+        rng.setstate(state["rng_state"])
+    current_score = layout.score(current_signs)
     print(f"Initial score: {current_score}")
     
     best_signs = list(current_signs)
     best_score = current_score
+    if resume_from is not None:
+        best_signs = list(state["best_signs"])
+        best_score = layout.score(best_signs)
     
-    temp = 100.0
     cooling_rate = 0.995
+    checkpointer = Checkpointer(checkpoint_path, "solve_construction_2", checkpoint_every)
+
+    def snapshot(next_iter):
+        return {
+            "iteration": next_iter,
+            "temp": temp,
+            "current_signs": list(current_signs),
+            "best_signs": list(best_signs),
+            "rng_state": rng.getstate(),
+        }
     
-    for i in range(50000):
-        idx = random.randint(0, 19)
+    next_iter = 50000
+    for i in range(first_iter, 50000):
+        idx = rng.randint(0, 19)
         neighbor_signs = list(current_signs)
         neighbor_signs[idx] *= -1
         
-        neighbor_score = get_score(neighbor_signs, A, B, C, D, F, G)
+        neighbor_score = layout.score(neighbor_signs)
         
         delta = neighbor_score - current_score
-        if delta < 0 or random.random() < np.exp(-delta / temp):
+        if delta < 0 or rng.random() < np.exp(-delta / temp):
             current_signs = neighbor_signs
             current_score = neighbor_score
             
@@ -230,11 +146,15 @@ def solve():
                 print(f"Iter {i}: New best score {best_score}")
                 if best_score == 0:
                     print("FOUND PERFECT SOLUTION!")
+                    next_iter = i + 1
                     break
         
         temp *= cooling_rate
         if temp < 0.1:
             temp = 100.0
+        checkpointer.maybe_save(i + 1, lambda: snapshot(i + 1))
+
+    checkpointer.save(snapshot(next_iter))
             
     print("\nBest signs found:")
     print(best_signs)
@@ -243,6 +163,22 @@ def solve():
     x, y, z, w = build_sequence(best_signs, A, B, C, D, F, G)
     diag = npaf_sum_four(x, y, z, w)
     print(f"Final Non-zero shifts: {np.nonzero(diag)[0].size}")
+    if store is not None and resume_from is None:
+        store.put("solve_construction_2", len(A), len(F), key, (x, y, z, w),
+                  provenance={"source": "solve_construction_2", "params": {"random_seed": random_seed},
+                              "best_signs": [int(sign) for sign in best_signs], "best_score": int(best_score)})
+    return best_signs, best_score
 
 if __name__ == "__main__":
-    solve()
+    def option(flag):
+        return sys.argv[sys.argv.index(flag) + 1] if flag in sys.argv else None
+
+    # --checkpoint PATH saves progress; --resume PATH continues a saved run.
+    # --exact enumerates every sign vector (add --meet for the half-table join).
+    # --store PATH reuses (and records) results in a result store.
+    store = ResultStore(option("--store")) if option("--store") else None
+    solve(exact="--exact" in sys.argv, checkpoint_path=option("--checkpoint"),
+          resume_from=option("--resume"), exact_method="meet" if "--meet" in sys.argv else "gray",
+          store=store)
+    if store is not None:
+        store.close()
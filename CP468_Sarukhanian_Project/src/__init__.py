@@ -1,4 +1,48 @@
-"""CP468 Sarukhanian project modules."""
+"""CP468 Sarukhanian project modules.
+
+Submodules are imported on first attribute access (``src.viz``,
+``src.hadamard``, ...), so ``import src`` stays cheap and only the
+modules a caller uses (matplotlib for ``viz`` in particular) are loaded.
+"""
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+from typing import List
+
+_SUBMODULES = frozenset({
+    "checkpoint",
+    "compiled_plan",
+    "construction",
+    "construction2",
+    "correlation_tables",
+    "exhaustive_search",
+    "golay",
+    "greedy_search",
+    "hadamard",
+    "incremental",
+    "npaf",
+    "packed",
+    "parallel_search",
+    "repair",
+    "result_store",
+    "sequences",
+    "sign_problem",
+    "tempering",
+    "turyn",
+    "viz",
+})
+
+
+def __getattr__(name: str) -> ModuleType:
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | _SUBMODULES)
+
 
 __all__ = [
     "sequences",
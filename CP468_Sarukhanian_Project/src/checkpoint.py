@@ -0,0 +1,69 @@
+"""Checkpoint files for long-running searches.
+
+A checkpoint is a small pickled dict holding whatever a search needs to
+carry on exactly where it stopped: current and best plan (or sign vector),
+scores, RNG state, temperature and the next iteration. Files are replaced
+atomically, so a job killed mid-write leaves the previous checkpoint intact.
+Each file records which search wrote it, and loading it into a different
+search is an error.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+CHECKPOINT_VERSION = 1
+
+Checkpoint = Dict[str, object]
+
+
+def save_checkpoint(path: str | Path, kind: str, state: Checkpoint) -> Path:
+    """Atomically write ``state`` for the search named ``kind`` to ``path``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": CHECKPOINT_VERSION, "kind": kind, "state": state}
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".ckpt.tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return path
+
+
+def load_checkpoint(path: str | Path, kind: str) -> Checkpoint:
+    """Read a checkpoint written by the search named ``kind``."""
+    with open(path, "rb") as handle:
+        payload = pickle.load(handle)
+    if not isinstance(payload, dict) or payload.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"{path} is not a version {CHECKPOINT_VERSION} search checkpoint.")
+    if payload["kind"] != kind:
+        raise ValueError(f"{path} holds a {payload['kind']!r} checkpoint, not {kind!r}.")
+    return payload["state"]
+
+
+@dataclass
+class Checkpointer:
+    """Writes a search's state every ``every`` iterations when ``path`` is set."""
+
+    path: Optional[str | Path]
+    kind: str
+    every: int = 1000
+
+    def maybe_save(self, count: int, make_state: Callable[[], Checkpoint]) -> None:
+        """Save ``make_state()`` if ``count`` completed iterations hit the interval."""
+        if self.path is not None and self.every > 0 and count % self.every == 0:
+            self.save(make_state())
+
+    def save(self, state: Checkpoint) -> None:
+        if self.path is not None:
+            save_checkpoint(self.path, self.kind, state)
+
+
+__all__ = ["CHECKPOINT_VERSION", "Checkpoint", "Checkpointer", "save_checkpoint", "load_checkpoint"]
@@ -0,0 +1,192 @@
+"""Compact array form of the Sarukhanian block plan."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Mapping, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .construction import ConstructionResult, PlanType
+from .sequences import ALL_SEQUENCES, PATTERN_COLUMNS, SequenceArray, tile_block
+
+PATTERN_TOKENS: Tuple[str, ...] = tuple(PATTERN_COLUMNS)
+
+
+@dataclass(frozen=True)
+class BlockTable:
+    """Every pattern x sequence tile, stored side by side in one column table.
+
+    ``columns[:, tile_starts[p, s]:tile_starts[p, s] + seq_lengths[s]]`` is the
+    unsigned 4xlen tile for pattern ``p`` and sequence ``s``.
+    """
+
+    sequence_tokens: Tuple[str, ...]
+    columns: NDArray[np.int8]
+    tile_starts: NDArray[np.int64]
+    seq_lengths: NDArray[np.int64]
+
+    def pattern_id(self, token: str) -> int:
+        if token not in PATTERN_TOKENS:
+            raise KeyError(f"Unknown pattern token '{token}'.")
+        return PATTERN_TOKENS.index(token)
+
+    def sequence_id(self, token: str) -> int:
+        if token not in self.sequence_tokens:
+            raise KeyError(f"Unknown sequence token '{token}'.")
+        return self.sequence_tokens.index(token)
+
+
+def build_block_table(sequences: Mapping[str, SequenceArray]) -> BlockTable:
+    """Validate and tile every pattern against every sequence once."""
+    tokens = tuple(sequences)
+    seq_lengths = np.array([sequences[token].size for token in tokens], dtype=np.int64)
+    tiles = []
+    tile_starts = np.empty((len(PATTERN_TOKENS), len(tokens)), dtype=np.int64)
+    cursor = 0
+    for p_id, pattern in enumerate(PATTERN_TOKENS):
+        for s_id, token in enumerate(tokens):
+            tiles.append(tile_block(PATTERN_COLUMNS[pattern], sequences[token]))
+            tile_starts[p_id, s_id] = cursor
+            cursor += seq_lengths[s_id]
+    columns = np.concatenate(tiles, axis=1)
+    columns.setflags(write=False)
+    return BlockTable(tokens, columns, tile_starts, seq_lengths)
+
+
+@lru_cache(maxsize=1)
+def default_block_table() -> BlockTable:
+    """Block table for the module-level base and reversed sequences."""
+    return build_block_table(ALL_SEQUENCES)
+
+
+@dataclass
+class CompiledPlan:
+    """A plan as parallel int8 arrays of pattern id, sequence id and sign.
+
+    Block offsets and the column gather index are cached and only
+    recomputed after the block order changes, so expanding a plan is a
+    single ``np.take`` into a preallocated ``(4, L)`` buffer plus a sign
+    multiply, and copying a plan copies three small arrays.
+    """
+
+    pattern_ids: NDArray[np.int8]
+    seq_ids: NDArray[np.int8]
+    signs: NDArray[np.int8]
+    table: BlockTable = field(default_factory=default_block_table, repr=False)
+    _offsets: NDArray[np.int64] | None = field(default=None, init=False, repr=False, compare=False)
+    _gather: NDArray[np.int64] | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def num_blocks(self) -> int:
+        return int(self.signs.size)
+
+    @property
+    def block_lengths(self) -> NDArray[np.int64]:
+        return self.table.seq_lengths[self.seq_ids]
+
+    @property
+    def offsets(self) -> NDArray[np.int64]:
+        """Start column of every block, followed by the total length."""
+        if self._offsets is None:
+            self._offsets = np.concatenate(([0], np.cumsum(self.block_lengths)))
+        return self._offsets
+
+    @property
+    def total_length(self) -> int:
+        return int(self.offsets[-1])
+
+    def _gather_index(self) -> NDArray[np.int64]:
+        if self._gather is None:
+            lengths = self.block_lengths
+            starts = self.table.tile_starts[self.pattern_ids, self.seq_ids]
+            within = np.arange(self.total_length) - np.repeat(self.offsets[:-1], lengths)
+            self._gather = np.repeat(starts, lengths) + within
+        return self._gather
+
+    def _invalidate_layout(self) -> None:
+        self._offsets = None
+        self._gather = None
+
+    def expand(self, out: NDArray[np.int8] | None = None) -> NDArray[np.int8]:
+        """Fill (and return) a ``(4, L)`` array with the X, Y, Z, W rows."""
+        if out is None:
+            out = np.empty((4, self.total_length), dtype=np.int8)
+        np.take(self.table.columns, self._gather_index(), axis=1, out=out)
+        out *= np.repeat(self.signs, self.block_lengths)
+        return out
+
+    def to_sequences(self) -> ConstructionResult:
+        """Expand into a :class:`ConstructionResult` whose rows share one buffer."""
+        return ConstructionResult(*self.expand())
+
+    def copy(self) -> "CompiledPlan":
+        """Copy the per-block arrays; the tile table and layout caches are shared."""
+        clone = CompiledPlan(self.pattern_ids.copy(), self.seq_ids.copy(), self.signs.copy(), self.table)
+        clone._offsets = self._offsets
+        clone._gather = self._gather
+        return clone
+
+    def flip(self, idx: int) -> None:
+        """Negate the sign of block *idx* in place."""
+        self.signs[idx] = -self.signs[idx]
+
+    def swap(self, i: int, j: int) -> None:
+        """Swap blocks *i* and *j* in place."""
+        if not (0 <= i < self.num_blocks and 0 <= j < self.num_blocks):
+            raise IndexError("Swap indices out of range.")
+        for arr in (self.pattern_ids, self.seq_ids, self.signs):
+            arr[i], arr[j] = arr[j], arr[i]
+        if self.seq_ids[i] != self.seq_ids[j]:
+            self._invalidate_layout()
+        else:
+            self._gather = None
+
+    def with_table(self, table: BlockTable) -> "CompiledPlan":
+        """Reuse this plan's block structure over another sequence table.
+
+        The table must list the same sequence tokens in the same order, as
+        tables from :func:`~src.sequences.make_sequence_table` do. The
+        per-block arrays are copied, as in :meth:`copy`.
+        """
+        if table.sequence_tokens != self.table.sequence_tokens:
+            raise ValueError("Block tables must share the same sequence tokens.")
+        return CompiledPlan(self.pattern_ids.copy(), self.seq_ids.copy(), self.signs.copy(), table)
+
+    def to_plan(self) -> PlanType:
+        """Convert back to the list-of-dict plan form."""
+        return [
+            {
+                "pattern": PATTERN_TOKENS[int(p_id)],
+                "seq": self.table.sequence_tokens[int(s_id)],
+                "sign": int(sign),
+            }
+            for p_id, s_id, sign in zip(self.pattern_ids, self.seq_ids, self.signs)
+        ]
+
+
+def compile_plan(plan: PlanType, sequences: Mapping[str, SequenceArray] | None = None) -> CompiledPlan:
+    """Validate a list-of-dict plan once and convert it to a :class:`CompiledPlan`."""
+    table = default_block_table() if sequences is None else build_block_table(sequences)
+    pattern_ids = np.empty(len(plan), dtype=np.int8)
+    seq_ids = np.empty(len(plan), dtype=np.int8)
+    signs = np.empty(len(plan), dtype=np.int8)
+    for idx, block in enumerate(plan):
+        sign = int(block.get("sign", 1))
+        if sign not in (-1, 1):
+            raise ValueError("Sign must be ±1.")
+        pattern_ids[idx] = table.pattern_id(str(block["pattern"]))
+        seq_ids[idx] = table.sequence_id(str(block["seq"]))
+        signs[idx] = sign
+    return CompiledPlan(pattern_ids, seq_ids, signs, table)
+
+
+__all__ = [
+    "PATTERN_TOKENS",
+    "BlockTable",
+    "CompiledPlan",
+    "build_block_table",
+    "default_block_table",
+    "compile_plan",
+]
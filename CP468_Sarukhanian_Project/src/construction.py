@@ -3,12 +3,26 @@ from __future__ import annotations
 
 from copy import deepcopy
 from dataclasses import dataclass
-from typing import Dict, List, Sequence, Tuple
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Sequence, Tuple
 
 import numpy as np
+from numpy.typing import NDArray
 
-from .npaf import npaf_sum_four
-from .sequences import SequenceArray, get_pattern, get_sequence, tile_block
+from .npaf import npaf_and_paf_sum_four, npaf_sum_four
+from .sequences import (
+    BASE_SEQUENCES,
+    SequenceArray,
+    TurynQuadruple,
+    get_pattern,
+    get_sequence,
+    make_sequence_table,
+    tile_block,
+    validate_turyn,
+)
+
+if TYPE_CHECKING:
+    from .result_store import ResultStore
 
 PlanBlock = Dict[str, object]
 PlanType = List[PlanBlock]
@@ -92,56 +106,196 @@ def get_default_plan() -> PlanType:
     return deepcopy(DEFAULT_PLAN)
 
 
+@lru_cache(maxsize=256)
+def _total_length_for(seq_tokens: Tuple[str, ...]) -> int:
+    return sum(get_sequence(token).size for token in seq_tokens)
+
+
+@lru_cache(maxsize=None)
+def _block_tile(pattern_name: str, seq_name: str) -> NDArray[np.int8]:
+    """Validated, read-only 4xN tile for a pattern/sequence token pair."""
+    tile = tile_block(get_pattern(pattern_name), get_sequence(seq_name))
+    tile.setflags(write=False)
+    return tile
+
+
 def plan_total_length(plan: PlanType) -> int:
     """Compute the resulting sequence length from the block plan."""
-    length = 0
-    for block in plan:
-        seq = get_sequence(str(block["seq"]))
-        length += seq.size
-    return length
+    return _total_length_for(tuple(str(block["seq"]) for block in plan))
 
 
-def plan_to_sequences(plan: PlanType) -> ConstructionResult:
-    """Expand a plan into concrete X, Y, Z, W sequences."""
-    row_blocks = [[] for _ in range(4)]
+def plan_block_offsets(plan: PlanType) -> NDArray[np.int64]:
+    """Return the start column of every block plus the total length at the end."""
+    lengths = [get_sequence(str(block["seq"])).size for block in plan]
+    return np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+
+
+def plan_to_sequences(plan: PlanType, unchecked: bool = False) -> ConstructionResult:
+    """Expand a plan into concrete X, Y, Z, W sequences.
+
+    Blocks are written into one preallocated ``(4, L)`` int8 buffer and the
+    returned sequences are views of its rows. With ``unchecked=True`` the
+    plan is trusted: tiles come from a per-token cache that was validated on
+    first use and signs are not re-checked, which is the mode search loops
+    should use once their starting plan has been expanded normally.
+    """
+    buffer = np.empty((4, plan_total_length(plan)), dtype=np.int8)
+    offset = 0
     for block in plan:
-        pattern_name = str(block["pattern"])
-        seq_name = str(block["seq"])
         sign = int(block.get("sign", 1))
-        if sign not in (-1, 1):
-            raise ValueError("Sign must be ±1.")
-        pattern = get_pattern(pattern_name)
-        seq = get_sequence(seq_name)
-        block_values = tile_block(pattern, seq) * sign
-        for idx in range(4):
-            row_blocks[idx].append(block_values[idx])
-    concatenated = tuple(np.concatenate(chunks).astype(np.int8) for chunks in row_blocks)
-    return ConstructionResult(*concatenated)  # type: ignore[arg-type]
+        if unchecked:
+            tile = _block_tile(str(block["pattern"]), str(block["seq"]))
+        else:
+            if sign not in (-1, 1):
+                raise ValueError("Sign must be ±1.")
+            tile = tile_block(get_pattern(str(block["pattern"])), get_sequence(str(block["seq"])))
+        stop = offset + tile.shape[1]
+        if sign == 1:
+            buffer[:, offset:stop] = tile
+        else:
+            np.negative(tile, out=buffer[:, offset:stop])
+        offset = stop
+    return ConstructionResult(*buffer)
 
 
-def build_sarukhanian_110(config: Dict[str, object] | None = None) -> Tuple[SequenceArray, SequenceArray, SequenceArray, SequenceArray]:
-    """Build the Sarukhanian sequences (default length 110) from a config."""
+@dataclass
+class FamilyMember:
+    """One δ-code built by :func:`iter_sarukhanian_family`."""
+
+    n: int
+    result: ConstructionResult
+    diagnostics: Dict[str, object]
+
+
+def expected_length(n: int) -> int:
+    """Length 22(2n-1) of the Proposition 1 δ-codes built from a Turyn quadruple of order n."""
+    return 22 * (2 * n - 1)
+
+
+def iter_sarukhanian_family(
+    turyns: Iterable[TurynQuadruple],
+    config: Dict[str, object] | None = None,
+    verify: bool = True,
+) -> Iterator[FamilyMember]:
+    """Stream Proposition 1 δ-codes for a sequence of Turyn quadruples.
+
+    The plan is validated and compiled once; each quadruple only needs its
+    own tile table, so sweeping many values of n does not redo the
+    plan-level work. With ``verify`` every member must have a zero summed
+    NPAF or a ``ValueError`` is raised for that n.
+    """
+    from .compiled_plan import build_block_table, compile_plan
+
     cfg = deepcopy(DEFAULT_CONFIG)
     if config:
         cfg.update(config)
     plan = cfg.get("plan")
     if not isinstance(plan, list):
         raise TypeError("Config must provide a list[dict] plan.")
-    sequences = plan_to_sequences(plan).as_tuple()
-    lengths = {seq.size for seq in sequences}
-    if len(lengths) != 1:
-        raise ValueError("Sequences must share a common length.")
-    total_length = lengths.pop()
-    if total_length != 110:
-        raise AssertionError(
-            f"Plan produced sequences of length {total_length}, expected 110."
+    compiled = compile_plan(plan)
+    for turyn in turyns:
+        n = validate_turyn(turyn)
+        member_plan = compiled.with_table(build_block_table(make_sequence_table(turyn)))
+        result = member_plan.to_sequences()
+        total_length = member_plan.total_length
+        if total_length != expected_length(n):
+            raise AssertionError(
+                f"Plan produced sequences of length {total_length}, expected {expected_length(n)}."
+            )
+        diagnostics = verify_four_sequences(*result.as_tuple()) if verify else {}
+        if verify and diagnostics["num_nonzero_shifts"]:
+            raise ValueError(
+                f"Turyn quadruple of order n={n} gave {diagnostics['num_nonzero_shifts']} "
+                "non-zero NPAF shifts; it is not a valid base sequence quadruple for this plan."
+            )
+        yield FamilyMember(n, result, diagnostics)
+
+
+def build_sarukhanian(
+    turyn: TurynQuadruple,
+    config: Dict[str, object] | None = None,
+    verify: bool = True,
+    store: ResultStore | None = None,
+) -> Tuple[SequenceArray, SequenceArray, SequenceArray, SequenceArray]:
+    """Build length-22(2n-1) Sarukhanian sequences from any Turyn quadruple (A, B, C, D).
+
+    With a ``store`` the result is looked up by (n, plan, quadruple) first
+    and only built, verified and recorded on a miss.
+    """
+    if store is None:
+        member = next(iter_sarukhanian_family([turyn], config=config, verify=verify))
+        return member.result.as_tuple()
+
+    from .result_store import plan_hash
+
+    plan = (config or {}).get("plan", DEFAULT_CONFIG["plan"])
+    n = validate_turyn(turyn)
+
+    def compute() -> Tuple[Tuple[SequenceArray, ...], Dict[str, object]]:
+        member = next(iter_sarukhanian_family([turyn], config=config, verify=verify))
+        return member.result.as_tuple(), {"source": "build_sarukhanian", "verified": verify}
+
+    stored = store.get_or_compute("sarukhanian", n, 0, plan_hash(plan, *turyn), compute)  # type: ignore[arg-type]
+    if verify and not stored.is_perfect:
+        raise ValueError(
+            f"Stored result for n={n} has {stored.diagnostics['num_nonzero_shifts']} non-zero NPAF shifts."
         )
-    return sequences
+    x, y, z, w = stored.sequences
+    return x, y, z, w
+
+
+def build_sarukhanian_110(config: Dict[str, object] | None = None) -> Tuple[SequenceArray, SequenceArray, SequenceArray, SequenceArray]:
+    """Build the Sarukhanian sequences (default length 110) from a config."""
+    turyn = tuple(BASE_SEQUENCES[name] for name in "ABCD")
+    return build_sarukhanian(turyn, config=config, verify=False)  # type: ignore[arg-type]
 
 
-def verify_four_sequences(x: SequenceArray, y: SequenceArray, z: SequenceArray, w: SequenceArray) -> Dict[str, object]:
-    """Return diagnostics describing the four-sequence summed NPAF."""
-    sum_series = npaf_sum_four(x, y, z, w)
+def verify_four_sequences(
+    x: SequenceArray,
+    y: SequenceArray,
+    z: SequenceArray,
+    w: SequenceArray,
+    include_paf: bool = False,
+    allow_zero: bool = False,
+) -> Dict[str, object]:
+    """Return diagnostics describing the four-sequence summed NPAF.
+
+    Entries must be ±1 unless ``include_paf`` or ``allow_zero`` is set, in
+    which case 0 entries (T-sequences) are accepted too. With
+    ``include_paf=True`` the periodic sum is folded from the same
+    correlation pass and reported under ``"paf"`` with the same keys.
+    """
+    if not (include_paf or allow_zero):
+        return diagnostics_from_sum_series(npaf_sum_four(x, y, z, w), x.size)
+    sum_series, paf_series = npaf_and_paf_sum_four(x, y, z, w)
+    diagnostics = diagnostics_from_sum_series(sum_series, x.size)
+    if include_paf:
+        diagnostics["paf"] = diagnostics_from_sum_series(paf_series, x.size)
+    return diagnostics
+
+
+def verify_plan(plan: PlanType, sequences: Dict[str, SequenceArray] | None = None) -> Dict[str, object]:
+    """:func:`verify_four_sequences` diagnostics for a plan, without expanding it.
+
+    The summed NPAF is assembled from memoized block-pair correlation tables
+    (see :mod:`src.correlation_tables`); ``sequences`` overrides the token
+    table as in :func:`~src.compiled_plan.compile_plan`.
+    """
+    from .compiled_plan import compile_plan
+    from .correlation_tables import correlation_tables
+
+    compiled = compile_plan(plan, sequences)
+    return diagnostics_from_sum_series(correlation_tables(compiled.table).plan_sum_series(compiled))
+
+
+def diagnostics_from_sum_series(sum_series: NDArray[np.int32], length: int | None = None) -> Dict[str, object]:
+    """Build the :func:`verify_four_sequences` diagnostics from a summed NPAF.
+
+    ``length`` is the sequence length; without it it is inferred as one more
+    than the number of shifts, or 0 for an empty series.
+    """
+    if length is None:
+        length = sum_series.size + 1 if sum_series.size else 0
     non_zero = np.nonzero(sum_series)[0]
     nonzero_pairs = [
         (int(shift + 1), int(sum_series[shift]))
@@ -150,7 +304,7 @@ def verify_four_sequences(x: SequenceArray, y: SequenceArray, z: SequenceArray,
     max_abs = int(np.max(np.abs(sum_series))) if sum_series.size else 0
     worst_shift = int(non_zero[np.argmax(np.abs(sum_series[non_zero]))] + 1) if non_zero.size else None
     return {
-        "length": int(x.size),
+        "length": int(length),
         "num_nonzero_shifts": int(non_zero.size),
         "nonzero_pairs": nonzero_pairs,
         "max_abs_deviation": max_abs,
@@ -167,7 +321,14 @@ __all__ = [
     "DEFAULT_CONFIG",
     "get_default_plan",
     "plan_total_length",
+    "plan_block_offsets",
     "plan_to_sequences",
+    "FamilyMember",
+    "expected_length",
+    "iter_sarukhanian_family",
+    "build_sarukhanian",
     "build_sarukhanian_110",
     "verify_four_sequences",
+    "verify_plan",
+    "diagnostics_from_sum_series",
 ]
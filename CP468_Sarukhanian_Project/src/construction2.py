@@ -0,0 +1,176 @@
+"""Block layout and vectorized builder for Sarukhanian's second construction.
+
+Proposition 2 combines a Turyn quadruple (A, B, C, D) of order n with a
+Golay pair (F, G) of length k into four sequences of length
+2(2n-1)(2k+1). The formula is a concatenation of 8k + 4 blocks; each block
+is one or two outer products of a 4-entry column (built from the x, y, z,
+w vectors and Golay entries) with a Turyn sequence. The layout is built
+once and the per-block signs searched over by
+``solve_construction_2.py`` are applied as a column multiplier.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .golay import GolayPair
+from .npaf import npaf_sum_four
+from .sequences import SequenceArray, TurynQuadruple, validate_turyn
+
+if TYPE_CHECKING:
+    from .result_store import ResultStore
+
+X_VEC = np.array([1, 1, 0, 0], dtype=np.int8)
+Y_VEC = np.array([1, -1, 0, 0], dtype=np.int8)
+Z_VEC = np.array([0, 0, 1, 1], dtype=np.int8)
+W_VEC = np.array([0, 0, 1, -1], dtype=np.int8)
+
+_Term = Tuple[NDArray[np.int8], SequenceArray]
+
+
+@dataclass
+class Construction2Layout:
+    """Unsigned Construction 2 rows plus the block boundaries.
+
+    ``base`` holds the four rows with every block sign set to +1; block
+    ``b`` occupies columns ``offsets[b]:offsets[b + 1]`` and ``labels[b]``
+    names the formula term it came from.
+    """
+
+    base: NDArray[np.int8]
+    offsets: NDArray[np.int64]
+    labels: Tuple[str, ...]
+
+    @property
+    def num_blocks(self) -> int:
+        return len(self.labels)
+
+    @property
+    def length(self) -> int:
+        return int(self.base.shape[1])
+
+    @property
+    def block_lengths(self) -> NDArray[np.int64]:
+        return np.diff(self.offsets)
+
+    def block_tiles(self) -> List[NDArray[np.int8]]:
+        """Per-block ``(4, len)`` views of the unsigned rows."""
+        return [self.base[:, start:stop] for start, stop in zip(self.offsets[:-1], self.offsets[1:])]
+
+    def apply_signs(self, signs: Sequence[int] | NDArray, out: NDArray[np.int8] | None = None) -> NDArray[np.int8]:
+        """Return the ``(4, L)`` rows with block ``b`` multiplied by ``signs[b]``."""
+        signs = np.asarray(signs, dtype=np.int8)
+        if signs.shape != (self.num_blocks,):
+            raise ValueError(f"Expected {self.num_blocks} block signs, got shape {signs.shape}.")
+        if out is None:
+            out = np.empty_like(self.base)
+        return np.multiply(self.base, np.repeat(signs, self.block_lengths), out=out)
+
+    def score(self, signs: Sequence[int] | NDArray) -> int:
+        """Lexicographic ``1000 * num_nonzero + max_abs`` score used by the annealer."""
+        sum_series = npaf_sum_four(*self.apply_signs(signs))
+        max_abs = int(np.max(np.abs(sum_series))) if sum_series.size else 0
+        return int(np.count_nonzero(sum_series)) * 1000 + max_abs
+
+
+def _validate_golay(golay: GolayPair) -> Tuple[SequenceArray, SequenceArray]:
+    f, g = (np.asarray(seq) for seq in golay)
+    if f.ndim != 1 or f.shape != g.shape or f.size < 1:
+        raise ValueError("Golay sequences must be non-empty 1-D arrays of equal length.")
+    if not (np.all(np.isin(f, (-1, 1))) and np.all(np.isin(g, (-1, 1)))):
+        raise ValueError("Golay sequences must be ±1.")
+    return f.astype(np.int8), g.astype(np.int8)
+
+
+def _block_terms(turyn: TurynQuadruple, golay: GolayPair) -> List[Tuple[str, List[_Term]]]:
+    """The formula's blocks in order, each as a list of (column, sequence) terms."""
+    a, b, c, d = (np.asarray(seq, dtype=np.int8) for seq in turyn)
+    f, g = golay
+    k = f.size
+    x, y, z, w = X_VEC, Y_VEC, Z_VEC, W_VEC
+    blocks: List[Tuple[str, List[_Term]]] = []
+    for j in range(1, k + 1):
+        blocks.append((f"1a[j={j}]", [(x * f[k - j] + z * g[k - j], a)]))
+        blocks.append((f"1b[j={j}]", [(x * g[j - 1] + z * f[k - j], c)]))
+    blocks.append(("2", [(x, a), (-z, b)]))
+    blocks.append(("3", [(x, d), (-z, c)]))
+    for j in range(1, k + 1):
+        blocks.append((f"4a[j={j}]", [(x * g[j - 1] + z * f[k - j], b)]))
+        blocks.append((f"4b[j={j}]", [(-x * f[j - 1] + z * g[k - j], d)]))
+    for j in range(1, k + 1):
+        blocks.append((f"5a[j={j}]", [(y * f[k - j] + w * g[k - j], a)]))
+        blocks.append((f"5b[j={j}]", [(y * g[j - 1] - w * f[j - 1], c)]))
+    blocks.append(("6", [(-y, a), (w, b)]))
+    blocks.append(("7", [(y, d), (w, c)]))
+    for j in range(1, k + 1):
+        blocks.append((f"8a[j={j}]", [(y * g[j - 1] + w * f[k - j], b)]))
+        blocks.append((f"8b[j={j}]", [(y * f[j - 1] - w * g[k - j], d)]))
+    return blocks
+
+
+def construction2_length(n: int, k: int) -> int:
+    """Length 2(2n-1)(2k+1) of Construction 2 sequences."""
+    return 2 * (2 * n - 1) * (2 * k + 1)
+
+
+def construction2_layout(turyn: TurynQuadruple, golay: GolayPair) -> Construction2Layout:
+    """Build the unsigned rows and block table for a Turyn quadruple and Golay pair."""
+    n = validate_turyn(turyn)
+    golay = _validate_golay(golay)
+    blocks = _block_terms(turyn, golay)
+    lengths = np.array([terms[0][1].size for _, terms in blocks], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    base = np.zeros((4, int(offsets[-1])), dtype=np.int8)
+    for (_, terms), start, stop in zip(blocks, offsets[:-1], offsets[1:]):
+        view = base[:, start:stop]
+        for column, seq in terms:
+            view += np.outer(column, seq).astype(np.int8)
+    if base.shape[1] != construction2_length(n, golay[0].size):
+        raise AssertionError("Construction 2 layout has an unexpected length.")
+    return Construction2Layout(base, offsets, tuple(label for label, _ in blocks))
+
+
+def build_construction2(
+    turyn: TurynQuadruple,
+    golay: GolayPair,
+    signs: Sequence[int] | NDArray | None = None,
+    store: ResultStore | None = None,
+) -> Tuple[SequenceArray, SequenceArray, SequenceArray, SequenceArray]:
+    """Build the X, Y, Z, W rows of Construction 2 with optional per-block signs.
+
+    With a ``store`` the rows are looked up by (n, k, inputs, signs) before
+    building, and recorded with their diagnostics on a miss.
+    """
+    def build() -> Tuple[SequenceArray, SequenceArray, SequenceArray, SequenceArray]:
+        layout = construction2_layout(turyn, golay)
+        rows = layout.base.copy() if signs is None else layout.apply_signs(signs)
+        x, y, z, w = rows
+        return x, y, z, w
+
+    if store is None:
+        return build()
+
+    from .result_store import plan_hash
+
+    n, k = len(turyn[0]), len(golay[0])
+    sign_key = () if signs is None else (signs,)
+    key = plan_hash(None, *turyn, *golay, *sign_key)
+    stored = store.get_or_compute("construction2", n, k, key,
+                                  lambda: (build(), {"source": "build_construction2"}))
+    x, y, z, w = stored.sequences
+    return x, y, z, w
+
+
+__all__ = [
+    "X_VEC",
+    "Y_VEC",
+    "Z_VEC",
+    "W_VEC",
+    "Construction2Layout",
+    "construction2_length",
+    "construction2_layout",
+    "build_construction2",
+]
@@ -0,0 +1,315 @@
+"""Memoized cross-correlation tables for scoring plans without expansion.
+
+Block ``b`` of a plan is the outer product of its pattern column ``P_b``
+with its (small) sequence ``S_b``, placed at column offset ``o_b`` and
+multiplied by its sign. The summed NPAF of the four rows is therefore
+
+    total(s) = sum_b (P_b . P_b) naf(S_b, s)
+             + sum_{b<c} sign_b sign_c (P_b . P_c) xc(S_b, S_c, s - (o_c - o_b))
+
+where ``xc(S_b, S_c, lag)`` correlates ``S_b[i]`` with ``S_c[i + lag]``.
+Both ingredients only depend on the handful of sequence tokens and the four
+pattern columns, so they are computed once per sequence table and scoring a
+plan is a ``bincount`` over the block pairs, never touching the length-L
+rows. Orthogonal patterns (the default x, y, z, w) have zero inner products
+and their block pairs drop out entirely.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .compiled_plan import PATTERN_TOKENS, BlockTable, CompiledPlan, compile_plan
+from .construction import PlanType
+from .sequences import PATTERN_COLUMNS
+
+# Number of block arrangements whose pair layout each table keeps.
+LAYOUT_CACHE_SIZE = 256
+# Number of distinct sequence tables whose correlation tables are kept.
+TABLE_CACHE_SIZE = 32
+
+
+@dataclass(frozen=True)
+class PairLayout:
+    """Sign-independent part of a block arrangement's summed NPAF.
+
+    ``constant`` collects every block's own autocorrelation; entry ``e`` of
+    ``values`` adds ``sign[first[pair[e]]] * sign[second[pair[e]]] * values[e]``
+    at shift index ``positions[e]``.
+    """
+
+    constant: NDArray[np.int64]
+    first: NDArray[np.int64]
+    second: NDArray[np.int64]
+    pair: NDArray[np.int64]
+    positions: NDArray[np.int64]
+    values: NDArray[np.float64]
+
+    def sum_series(self, signs: NDArray) -> NDArray[np.int64]:
+        if not self.positions.size:
+            return self.constant.copy()
+        signs = np.asarray(signs, dtype=np.int64)
+        weights = self.values * (signs[self.first] * signs[self.second])[self.pair]
+        series = np.bincount(self.positions, weights=weights, minlength=self.constant.size)
+        return self.constant + np.rint(series).astype(np.int64)
+
+
+@dataclass(frozen=True)
+class CorrelationTables:
+    """Pattern inner products plus every sequence auto- and cross-correlation.
+
+    ``pair_values[pair_starts[s, t]:...]`` holds ``np.correlate(S_t, S_s, "full")``
+    (length ``len_s + len_t - 1``, entry ``k`` at lag ``k - (len_s - 1)``), and
+    ``auto_values[auto_starts[s]:...]`` the NPAF of ``S_s`` at shifts 1..len-1.
+    Layouts of recently scored block arrangements are kept in a small LRU
+    cache, so re-scoring an arrangement after sign changes is one
+    ``bincount``.
+    """
+
+    sequence_tokens: Tuple[str, ...]
+    seq_lengths: NDArray[np.int64]
+    gram: NDArray[np.int64]
+    pair_values: NDArray[np.int64]
+    pair_starts: NDArray[np.int64]
+    auto_values: NDArray[np.int64]
+    auto_starts: NDArray[np.int64]
+    _layouts: "OrderedDict[bytes, PairLayout]" = field(default_factory=OrderedDict, repr=False, compare=False)
+
+    def layout(self, pattern_ids: NDArray, seq_ids: NDArray) -> PairLayout:
+        """The (cached) :class:`PairLayout` for one block arrangement."""
+        pattern_ids = np.asarray(pattern_ids, dtype=np.int8)
+        seq_ids = np.asarray(seq_ids, dtype=np.int8)
+        key = pattern_ids.tobytes() + b"|" + seq_ids.tobytes()
+        cached = self._layouts.get(key)
+        if cached is not None:
+            self._layouts.move_to_end(key)
+            return cached
+        built = self._build_layout(pattern_ids.astype(np.int64), seq_ids.astype(np.int64))
+        self._layouts[key] = built
+        if len(self._layouts) > LAYOUT_CACHE_SIZE:
+            self._layouts.popitem(last=False)
+        return built
+
+    def _build_layout(self, pattern_ids: NDArray[np.int64], seq_ids: NDArray[np.int64]) -> PairLayout:
+        lengths = self.seq_lengths[seq_ids]
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        num_shifts = max(int(offsets[-1]) - 1, 0)
+
+        # Each block's own autocorrelation, weighted by |P_b|^2, is sign-free.
+        auto_len = lengths - 1
+        auto_pos = _ragged_arange(auto_len)
+        auto_idx = np.repeat(self.auto_starts[seq_ids], auto_len) + auto_pos
+        auto_weight = np.repeat(self.gram[pattern_ids, pattern_ids], auto_len)
+        constant = np.bincount(auto_pos, weights=self.auto_values[auto_idx] * auto_weight,
+                               minlength=num_shifts)
+        constant = np.rint(constant).astype(np.int64)
+
+        first, second = _upper_pairs(seq_ids.size)
+        coeff = self.gram[pattern_ids[first], pattern_ids[second]]
+        keep = np.flatnonzero(coeff)
+        first, second, coeff = first[keep], second[keep], coeff[keep]
+        span = lengths[first] + lengths[second] - 1
+        within = _ragged_arange(span)
+        base = offsets[second] - offsets[first] - lengths[first]
+        pair = np.repeat(np.arange(first.size), span)
+        positions = base[pair] + within
+        values = self.pair_values[self.pair_starts[seq_ids[first], seq_ids[second]][pair] + within] * coeff[pair]
+        return PairLayout(constant, first, second, pair, positions, values.astype(np.float64))
+
+    def sum_series(self, pattern_ids: NDArray, seq_ids: NDArray, signs: NDArray) -> NDArray[np.int64]:
+        """Summed NPAF (shifts 1..L-1) of the plan given as parallel id/sign arrays."""
+        return self.layout(pattern_ids, seq_ids).sum_series(signs)
+
+    def plan_sum_series(self, plan: CompiledPlan) -> NDArray[np.int64]:
+        return self.sum_series(plan.pattern_ids, plan.seq_ids, plan.signs)
+
+
+class IncrementalPlanScore:
+    """A compiled plan and its summed NPAF, updated under flips and swaps.
+
+    The state keeps every signed cross term of the current arrangement as
+    an entry ``(a, b, d, w)``: blocks ``a`` and ``b``, the signed distance
+    ``d`` from the element in ``a`` to the element in ``b`` and the weight
+    ``w`` it adds at shift ``d`` (entries are oriented so ``d > 0``). Block autocorrelations never change
+    under flips or swaps, and a move only touches the entries whose blocks
+    it affects:
+
+    * flipping block ``b`` negates the entries touching ``b``;
+    * swapping two blocks of equal length moves only those two blocks, so
+      it is two segment replacements and only their entries are re-placed;
+    * swapping blocks of different lengths also slides the window of blocks
+      between them, so entries joining the window to the blocks outside it
+      are re-placed as well; entries within the window or outside it stay.
+
+    Re-placing an entry is ``d += move[b] - move[a]``, so no correlation
+    is ever recomputed and the state never needs a fresh layout. Weights are
+    integers held in float64 for ``bincount``, so the sums stay exact.
+    """
+
+    def __init__(self, plan: CompiledPlan, tables: CorrelationTables | None = None) -> None:
+        self.plan = plan.copy()
+        self.tables = correlation_tables(plan.table) if tables is None else tables
+        layout = self.tables.layout(self.plan.pattern_ids, self.plan.seq_ids)
+        signs = self.plan.signs.astype(np.int64)
+        self._first = layout.first[layout.pair]
+        self._second = layout.second[layout.pair]
+        self._distance = layout.positions + 1
+        self._weight = layout.values * (signs[self._first] * signs[self._second])
+        self.sum_series = layout.sum_series(self.plan.signs)
+
+    def _touching(self, idx: int) -> NDArray[np.bool_]:
+        return (self._first == idx) | (self._second == idx)
+
+    def flip_delta(self, idx: int) -> NDArray[np.int64]:
+        """Change in the summed NPAF if block ``idx`` were negated."""
+        touched = self._touching(idx)
+        series = np.bincount(self._distance[touched] - 1, weights=self._weight[touched],
+                             minlength=self.sum_series.size)
+        return -2 * series.astype(np.int64)
+
+    def _swap_moves(self, i: int, j: int) -> NDArray[np.int64]:
+        """How far each block's contents travel when blocks ``i < j`` swap."""
+        lengths = self.plan.block_lengths
+        offsets = self.plan.offsets
+        shift = int(lengths[j] - lengths[i])
+        moves = np.zeros(self.plan.num_blocks, dtype=np.int64)
+        moves[i + 1:j] = shift
+        moves[i] = offsets[j] - offsets[i] + shift
+        moves[j] = offsets[i] - offsets[j]
+        return moves
+
+    def _swap_entries(self, i: int, j: int) -> Tuple[NDArray[np.bool_], NDArray[np.int64]]:
+        """The entries a swap re-places and their new signed distances."""
+        moves = self._swap_moves(min(i, j), max(i, j))
+        travel = moves[self._second] - moves[self._first]
+        moved = travel != 0
+        return moved, self._distance[moved] + travel[moved]
+
+    def swap_delta(self, i: int, j: int) -> NDArray[np.int64]:
+        """Change in the summed NPAF if blocks ``i`` and ``j`` were swapped."""
+        if not (0 <= i < self.plan.num_blocks and 0 <= j < self.plan.num_blocks):
+            raise IndexError("Swap indices out of range.")
+        if i == j:
+            return np.zeros_like(self.sum_series)
+        moved, distance = self._swap_entries(i, j)
+        weight = self._weight[moved]
+        positions = np.concatenate((np.abs(distance), self._distance[moved])) - 1
+        series = np.bincount(positions, weights=np.concatenate((weight, -weight)),
+                             minlength=self.sum_series.size)
+        return series.astype(np.int64)
+
+    def apply_flip(self, idx: int, delta: NDArray[np.int64] | None = None) -> None:
+        """Negate block ``idx``; pass the ``flip_delta`` result to skip recomputing it."""
+        self.sum_series = self.sum_series + (self.flip_delta(idx) if delta is None else delta)
+        self._weight[self._touching(idx)] *= -1
+        self.plan.flip(idx)
+
+    def apply_swap(self, i: int, j: int, delta: NDArray[np.int64] | None = None) -> None:
+        """Swap blocks ``i`` and ``j``; pass the ``swap_delta`` result to skip recomputing it."""
+        if delta is None:
+            delta = self.swap_delta(i, j)
+        if i == j:
+            return
+        moved, distance = self._swap_entries(i, j)
+        first, second = self._first, self._second
+        # Relabel blocks i and j, then orient re-placed entries so d > 0 again.
+        for ends in (first, second):
+            at_i, at_j = ends == i, ends == j
+            ends[at_i], ends[at_j] = j, i
+        crossed = np.flatnonzero(moved)[distance < 0]
+        first[crossed], second[crossed] = second[crossed], first[crossed].copy()
+        self._distance[moved] = np.abs(distance)
+        self.sum_series = self.sum_series + delta
+        self.plan.swap(i, j)
+
+
+@lru_cache(maxsize=None)
+def _upper_pairs(count: int) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+    first, second = np.triu_indices(count, k=1)
+    return first.astype(np.int64), second.astype(np.int64)
+
+
+def _ragged_arange(lengths: NDArray[np.int64]) -> NDArray[np.int64]:
+    """Concatenation of ``arange(n)`` for each ``n`` in ``lengths``."""
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    return np.arange(total) - np.repeat(starts, lengths)
+
+
+def _table_sequences(table: BlockTable) -> Tuple[NDArray[np.int64], ...]:
+    """Recover each sequence from its tile under the first pattern."""
+    first_pattern = PATTERN_COLUMNS[PATTERN_TOKENS[0]]
+    sequences = []
+    for s_id, length in enumerate(table.seq_lengths):
+        start = table.tile_starts[0, s_id]
+        sequences.append(table.columns[0, start:start + length].astype(np.int64) * int(first_pattern[0]))
+    return tuple(sequences)
+
+
+_TABLES: "OrderedDict[Tuple[Tuple[str, ...], bytes, bytes], CorrelationTables]" = OrderedDict()
+
+
+def correlation_tables(table: BlockTable) -> CorrelationTables:
+    """Build (once per distinct sequence table) the correlation tables for ``table``.
+
+    The ``TABLE_CACHE_SIZE`` most recently used tables are kept, so family
+    sweeps over many Turyn or Golay inputs do not grow the cache without bound.
+    """
+    key = (table.sequence_tokens, table.seq_lengths.tobytes(), table.columns.tobytes())
+    cached = _TABLES.get(key)
+    if cached is not None:
+        _TABLES.move_to_end(key)
+        return cached
+    sequences = _table_sequences(table)
+    patterns = np.stack([PATTERN_COLUMNS[token] for token in PATTERN_TOKENS]).astype(np.int64)
+    count = len(sequences)
+    pair_chunks, pair_starts, cursor = [], np.empty((count, count), dtype=np.int64), 0
+    for s in range(count):
+        for t in range(count):
+            corr = np.correlate(sequences[t], sequences[s], mode="full")
+            pair_starts[s, t] = cursor
+            pair_chunks.append(corr)
+            cursor += corr.size
+    auto_chunks, auto_starts, cursor = [], np.empty(count, dtype=np.int64), 0
+    for s, seq in enumerate(sequences):
+        auto_starts[s] = cursor
+        auto = np.correlate(seq, seq, mode="full")[seq.size:]
+        auto_chunks.append(auto)
+        cursor += auto.size
+    tables = CorrelationTables(
+        sequence_tokens=table.sequence_tokens,
+        seq_lengths=table.seq_lengths.copy(),
+        gram=patterns @ patterns.T,
+        pair_values=np.concatenate(pair_chunks),
+        pair_starts=pair_starts,
+        auto_values=np.concatenate(auto_chunks) if auto_chunks else np.zeros(0, dtype=np.int64),
+        auto_starts=auto_starts,
+    )
+    _TABLES[key] = tables
+    if len(_TABLES) > TABLE_CACHE_SIZE:
+        _TABLES.popitem(last=False)
+    return tables
+
+
+def plan_sum_series(plan: PlanType | CompiledPlan) -> NDArray[np.int64]:
+    """Summed NPAF of a plan assembled from cached tables (no sequence expansion)."""
+    compiled = plan if isinstance(plan, CompiledPlan) else compile_plan(plan)
+    return correlation_tables(compiled.table).plan_sum_series(compiled)
+
+
+__all__ = [
+    "LAYOUT_CACHE_SIZE",
+    "TABLE_CACHE_SIZE",
+    "PairLayout",
+    "CorrelationTables",
+    "IncrementalPlanScore",
+    "correlation_tables",
+    "plan_sum_series",
+]
@@ -1,127 +1,551 @@
 """Exhaustive search for correct Sarukhanian construction."""
 import numpy as np
 from itertools import product
-from .construction import PlanType, plan_to_sequences, verify_four_sequences, get_default_plan
+from math import exp
+from random import Random
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Sequence, Tuple, Union
+from .checkpoint import Checkpointer, load_checkpoint
+from .construction import (
+    PlanType,
+    diagnostics_from_sum_series,
+    get_default_plan,
+    plan_block_offsets,
+    plan_to_sequences,
+    verify_four_sequences,
+)
+from .greedy_search import greedy_sign_optimization
+from .incremental import IncrementalNPAF
+from .sign_problem import SignProblem
 
+if TYPE_CHECKING:
+    from .result_store import ResultStore
 
-def exhaustive_sign_search(plan: PlanType, max_configs: int = 100000) -> dict:
+
+def exhaustive_sign_search(plan: PlanType, max_configs: int = 100000, verbose: bool = False,
+                           pair_flips: bool = False, tabu_tenure: int = 0,
+                           max_stall: Optional[int] = None) -> dict:
     """
     Try different sign configurations exhaustively.
     With 44 blocks, we have 2^44 possibilities which is too many.
     Instead, use a greedy approach: flip signs one at a time, keep improvements.
+
+    This runs ``greedy_sign_optimization`` for at most ``max_configs``
+    neighbourhood scans: each scan scores every single flip (and, with
+    ``pair_flips``, every pair flip) in one vectorized pass and takes the
+    best. With ``tabu_tenure == 0`` it stops at the first local minimum;
+    otherwise tabu memory lets it climb out, and ``max_stall`` ends it after
+    that many scans without a new best. ``iterations`` counts the scans.
     """
-    best_plan = plan.copy()
-    best_seqs = plan_to_sequences(best_plan).as_tuple()
-    best_diag = verify_four_sequences(*best_seqs)
-    best_score = (best_diag['num_nonzero_shifts'], best_diag['max_abs_deviation'])
-    
-    improved = True
-    iterations = 0
-    
-    while improved and iterations < max_configs:
-        improved = False
-        iterations += 1
-        
-        # Try flipping each sign individually
-        for idx in range(len(best_plan)):
-            test_plan = best_plan.copy()
-            test_plan[idx] = {**test_plan[idx], 'sign': -test_plan[idx].get('sign', 1)}
-            
-            test_seqs = plan_to_sequences(test_plan).as_tuple()
-            test_diag = verify_four_sequences(*test_seqs)
-            test_score = (test_diag['num_nonzero_shifts'], test_diag['max_abs_deviation'])
-            
-            if test_score < best_score:
-                best_plan = test_plan
-                best_seqs = test_seqs
-                best_diag = test_diag
-                best_score = test_score
-                improved = True
-                print(f"  Iteration {iterations}: flipped block {idx}, score now {best_score}")
-                
-                if best_score == (0, 0):
-                    print("  ✓ Found perfect solution!")
-                    return {
-                        'plan': best_plan,
-                        'sequences': best_seqs,
-                        'diagnostics': best_diag,
-                        'iterations': iterations
-                    }
-                break  # Start over from the beginning with the improved plan
-    
-    return {
-        'plan': best_plan,
-        'sequences': best_seqs,
-        'diagnostics': best_diag,
-        'iterations': iterations
-    }
+    return greedy_sign_optimization(plan, max_iterations=max_configs, pair_flips=pair_flips,
+                                    tabu_tenure=tabu_tenure, max_stall=max_stall, verbose=verbose)
 
 
 def simulated_annealing_search(plan: PlanType, max_iterations: int = 50000, 
-                                initial_temp: float = 100.0, cooling_rate: float = 0.995) -> dict:
-    """Use simulated annealing to find better sign configurations."""
-    import random
-    from math import exp
+                                initial_temp: float = 100.0, cooling_rate: float = 0.995,
+                                random_seed: Optional[int] = None,
+                                should_stop: Optional[Callable[[], bool]] = None,
+                                checkpoint_path: Optional[Union[str, Path]] = None,
+                                checkpoint_every: int = 1000,
+                                resume_from: Optional[Union[str, Path]] = None,
+                                verbose: bool = False,
+                                store: Optional['ResultStore'] = None) -> dict:
+    """Use simulated annealing to find better sign configurations.
+
+    Sign flips are scored incrementally: only the flipped block's cross terms
+    are recomputed, and the four sequences are never rebuilt from the plan.
+    ``random_seed`` makes a run reproducible. The search draws from its own
+    ``random.Random``, so the global ``random.seed`` has no effect.
+    ``should_stop`` is polled every iteration and ends the search early
+    with the best plan so far. Progress is printed only with ``verbose``.
+
+    With ``checkpoint_path`` the current and best plans, temperature, RNG
+    state and iteration are saved every ``checkpoint_every`` iterations and
+    on exit. ``resume_from`` picks such a run up where it stopped (the
+    ``plan`` argument is then ignored) and follows the same trajectory an
+    uninterrupted run would have.
+
+    With a ``store`` (see :mod:`src.result_store`) a finished run with the
+    same plan and parameters is returned from the store instead of rerun;
+    unseeded and resumed runs bypass it.
+    """
+    if store is not None and random_seed is not None and resume_from is None:
+        from .result_store import cached_search
+
+        params = {'max_iterations': max_iterations, 'initial_temp': initial_temp,
+                  'cooling_rate': cooling_rate, 'random_seed': random_seed}
+        return cached_search(store, 'simulated_annealing_search', plan, params,
+                             lambda poll: simulated_annealing_search(
+                                 plan, max_iterations, initial_temp, cooling_rate, random_seed,
+                                 should_stop=poll, checkpoint_path=checkpoint_path,
+                                 checkpoint_every=checkpoint_every, verbose=verbose),
+                             should_stop=should_stop)
+    rng = Random(random_seed)
+    temp = initial_temp
+    first_iteration = 0
+    if resume_from is not None:
+        saved = load_checkpoint(resume_from, 'simulated_annealing_search')
+        rng.setstate(saved['rng_state'])
+        temp = saved['temp']
+        first_iteration = saved['iteration']
+        plan = saved['current_plan']
     
     current_plan = plan.copy()
-    current_seqs = plan_to_sequences(current_plan).as_tuple()
-    current_diag = verify_four_sequences(*current_seqs)
+    offsets = plan_block_offsets(current_plan)
+    state = IncrementalNPAF(*plan_to_sequences(current_plan).as_tuple())
+    current_diag = diagnostics_from_sum_series(state.sum_series)
     current_score = current_diag['num_nonzero_shifts'] * 1000 + current_diag['max_abs_deviation']
     
     best_plan = current_plan.copy()
     best_score = current_score
     best_diag = current_diag
-    best_seqs = current_seqs
-    
-    temp = initial_temp
-    
-    for iteration in range(max_iterations):
+    best_seqs = state.as_tuple()
+    if resume_from is not None:
+        best_plan = list(saved['best_plan'])
+        best_seqs = plan_to_sequences(best_plan).as_tuple()
+        best_diag = verify_four_sequences(*best_seqs)
+        best_score = best_diag['num_nonzero_shifts'] * 1000 + best_diag['max_abs_deviation']
+
+    checkpointer = Checkpointer(checkpoint_path, 'simulated_annealing_search', checkpoint_every)
+
+    def snapshot(next_iteration: int) -> dict:
+        return {
+            'iteration': next_iteration,
+            'temp': temp,
+            'current_plan': current_plan,
+            'best_plan': best_plan,
+            'rng_state': rng.getstate(),
+        }
+
+    def finish(iterations: int, next_iteration: int) -> dict:
+        checkpointer.save(snapshot(next_iteration))
+        return {
+            'plan': best_plan,
+            'sequences': best_seqs,
+            'diagnostics': best_diag,
+            'iterations': iterations
+        }
+
+    for iteration in range(first_iteration, max_iterations):
+        if should_stop is not None and should_stop():
+            return finish(iteration, iteration)
         # Cool down
         temp *= cooling_rate
         
         # Random modification: flip a random sign
-        test_plan = current_plan.copy()
-        flip_idx = random.randint(0, len(test_plan) - 1)
-        test_plan[flip_idx] = {**test_plan[flip_idx], 'sign': -test_plan[flip_idx].get('sign', 1)}
-        
-        test_seqs = plan_to_sequences(test_plan).as_tuple()
-        test_diag = verify_four_sequences(*test_seqs)
-        test_score = test_diag['num_nonzero_shifts'] * 1000 + test_diag['max_abs_deviation']
+        flip_idx = rng.randint(0, len(current_plan) - 1)
+        start, stop = int(offsets[flip_idx]), int(offsets[flip_idx + 1])
+        flip_delta = state.flip_delta(start, stop)
+        test_nonzero, test_max = state.score(state.sum_series + flip_delta)
+        test_score = test_nonzero * 1000 + test_max
         
         # Accept if better, or with probability based on temperature
         delta = test_score - current_score
-        if delta < 0 or (temp > 0 and random.random() < exp(-delta / temp)):
-            current_plan = test_plan
-            current_seqs = test_seqs
-            current_diag = test_diag
+        if delta < 0 or (temp > 0 and rng.random() < exp(-delta / temp)):
+            current_plan = current_plan.copy()
+            current_plan[flip_idx] = {**current_plan[flip_idx], 'sign': -current_plan[flip_idx].get('sign', 1)}
+            state.apply_flip(start, stop, flip_delta)
+            state.clear_history()
             current_score = test_score
             
             if current_score < best_score:
                 best_plan = current_plan.copy()
                 best_score = current_score
-                best_diag = current_diag
-                best_seqs = current_seqs
+                best_diag = diagnostics_from_sum_series(state.sum_series)
+                best_seqs = state.as_tuple()
                 
-                if iteration % 1000 == 0:
+                if verbose and iteration % 1000 == 0:
                     print(f"  Iteration {iteration}: score={best_score}, "
                           f"non-zero={best_diag['num_nonzero_shifts']}, "
                           f"max={best_diag['max_abs_deviation']}")
                 
                 if best_score == 0:
-                    print(f"  ✓ Found perfect solution at iteration {iteration}!")
-                    return {
-                        'plan': best_plan,
-                        'sequences': best_seqs,
-                        'diagnostics': best_diag,
-                        'iterations': iteration
-                    }
+                    if verbose:
+                        print(f"  ✓ Found perfect solution at iteration {iteration}!")
+                    return finish(iteration, iteration + 1)
+
+        checkpointer.maybe_save(iteration + 1, lambda: snapshot(iteration + 1))
     
+    return finish(max_iterations, max_iterations)
+
+
+def _assignment_order(problem: SignProblem) -> List[int]:
+    """Blocks sorted by the largest shift at which they couple to another block.
+
+    A shift is fully known once every block reaching it is assigned, so this
+    order fixes the high shifts first. For a plain left-to-right block layout
+    that is the outermost blocks from both ends; for plans whose blocks only
+    couple within pattern groups it walks each group from its ends inwards.
+    """
+    num_blocks = problem.num_blocks
+    active = np.any(problem.coupling != 0, axis=1)
+    reach = np.where(active.any(axis=1), active.shape[1] - np.argmax(active[:, ::-1], axis=1), 0)
+    centre = (num_blocks - 1) / 2
+    return sorted(range(num_blocks), key=lambda b: (-reach[b], -abs(b - centre), b))
+
+
+def branch_and_bound_sign_search(problem: SignProblem, max_nodes: Optional[int] = None,
+                                 max_solutions: Optional[int] = None) -> dict:
+    """
+    Enumerate every block-sign vector with zero summed NPAF for a fixed block order.
+
+    Signs are fixed from the outermost blocks inwards (see
+    ``_assignment_order``). A shift whose pairs all fall inside assigned
+    blocks is then known exactly, and every other shift is bounded by the absolute couplings still involving
+    an unassigned block; a partial assignment is pruned as soon as some
+    known part exceeds what the remaining blocks could cancel. Negating all
+    signs leaves the NPAF unchanged, so the first block's sign is fixed to
+    +1 and each reported solution stands for itself and its negation.
+
+    The result's ``exhaustive`` flag is True when the tree was searched to
+    completion, in which case ``solutions`` is the full list (empty means
+    no assignment exists). ``max_nodes`` and ``max_solutions`` stop early.
+    """
+    num_blocks = problem.num_blocks
+    coupling = problem.coupling.astype(np.int64)
+    abs_coupling = np.abs(coupling)
+    order = _assignment_order(problem)
+    signs = np.zeros(num_blocks, dtype=np.int8)
+    unassigned = np.ones(num_blocks, dtype=bool)
+    known = problem.constant.astype(np.int64)
+    fields = np.zeros_like(coupling[0])
+    pair_bound = abs_coupling.sum(axis=(0, 1)) // 2
+    solutions: List[np.ndarray] = []
+    nodes = 0
+    stopped = False
+
+    def feasible() -> bool:
+        bound = np.abs(fields[unassigned]).sum(axis=0) + pair_bound
+        return bool(np.all(np.abs(known) <= bound))
+
+    def descend(depth: int) -> None:
+        nonlocal nodes, stopped
+        if depth == num_blocks:
+            if not known.any():
+                solutions.append(signs.copy())
+                if max_solutions is not None and len(solutions) >= max_solutions:
+                    stopped = True
+            return
+        block = order[depth]
+        unassigned[block] = False
+        released = abs_coupling[block, unassigned].sum(axis=0)
+        pair_bound[:] -= released
+        for sign in ((1,) if depth == 0 else (1, -1)):
+            nodes += 1
+            if max_nodes is not None and nodes > max_nodes:
+                stopped = True
+            if stopped:
+                break
+            signs[block] = sign
+            known[:] += sign * fields[block]
+            fields[:] += sign * coupling[:, block]
+            if feasible():
+                descend(depth + 1)
+            fields[:] -= sign * coupling[:, block]
+            known[:] -= sign * fields[block]
+        signs[block] = 0
+        pair_bound[:] += released
+        unassigned[block] = True
+
+    descend(0)
+    return {
+        'solutions': solutions,
+        'nodes': nodes,
+        'exhaustive': not stopped,
+    }
+
+
+def coupling_components(problem: SignProblem) -> List[np.ndarray]:
+    """Groups of blocks that interact; the form is a sum of one term per group.
+
+    Negating every sign inside one group leaves the summed NPAF unchanged.
+    """
+    adjacency = np.any(problem.coupling != 0, axis=2)
+    label = np.full(problem.num_blocks, -1)
+    components = []
+    for root in range(problem.num_blocks):
+        if label[root] >= 0:
+            continue
+        label[root] = len(components)
+        stack, members = [root], [root]
+        while stack:
+            for other in np.flatnonzero(adjacency[stack.pop()] & (label < 0)):
+                label[other] = len(components)
+                stack.append(other)
+                members.append(int(other))
+        components.append(np.array(sorted(members)))
+    return components
+
+
+def _sign_table(count: int, pinned: bool) -> np.ndarray:
+    """All sign vectors of ``count`` entries (first entry +1 when ``pinned``)."""
+    free = count - 1 if pinned else count
+    bits = (np.arange(1 << free)[:, None] >> np.arange(free)[::-1]) & 1
+    table = (1 - 2 * bits).astype(np.int8)
+    if pinned:
+        table = np.hstack((np.ones((table.shape[0], 1), dtype=np.int8), table))
+    return table
+
+
+def _part_values(problem: SignProblem, blocks: np.ndarray, table: np.ndarray,
+                 fields: np.ndarray) -> np.ndarray:
+    """Form restricted to ``blocks`` (plus linear ``fields``) for every row of ``table``."""
+    sigma = table.astype(np.int64)
+    values = sigma @ fields
+    local = problem.coupling[np.ix_(blocks, blocks)]
+    for i, j in zip(*np.nonzero(np.triu(np.any(local != 0, axis=2), k=1))):
+        values += (sigma[:, i] * sigma[:, j])[:, None] * local[i, j]
+    return values
+
+
+def _combine(parts: Sequence[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+    """Hashes of every combination of the parts' rows (row-major over ``parts``)."""
+    hashes = np.zeros(1, dtype=np.int64)
+    for _, part_hashes in parts:
+        hashes = (hashes[:, None] + part_hashes[None, :]).ravel()
+    return hashes
+
+
+def _split_halves(problem: SignProblem) -> Tuple[List[np.ndarray], List[np.ndarray], np.ndarray, bool]:
+    """Choose the two halves and the blocks conditioned on outside the join.
+
+    Independent coupling groups are dealt greedily to the lighter half and
+    need no conditioning. A single group is cut in block order and the
+    smaller boundary (blocks coupled across the cut) is enumerated outright,
+    which makes the remaining two halves independent.
+    """
+    components = coupling_components(problem)
+    if len(components) > 1 or components[0].size == 1:
+        halves: Tuple[List[np.ndarray], List[np.ndarray]] = ([], [])
+        weights = [0, 0]
+        for component in sorted(components, key=len, reverse=True):
+            side = int(weights[1] < weights[0])
+            halves[side].append(component)
+            weights[side] += component.size - 1
+        return halves[0], halves[1], np.zeros(0, dtype=np.int64), True
+    blocks = components[0]
+    left, right = blocks[:blocks.size // 2], blocks[blocks.size // 2:]
+    adjacency = np.any(problem.coupling != 0, axis=2)
+    left_edge = left[adjacency[np.ix_(left, right)].any(axis=1)]
+    right_edge = right[adjacency[np.ix_(right, left)].any(axis=1)]
+    if right_edge.size < left_edge.size:
+        left, right, left_edge = right, left, right_edge
+    return [np.setdiff1d(left, left_edge)], [right], left_edge, False
+
+
+def meet_in_the_middle_sign_search(problem: SignProblem,
+                                   max_solutions: Optional[int] = None,
+                                   seed: int = 0,
+                                   store: Optional['ResultStore'] = None) -> dict:
+    """
+    Find every block-sign vector with zero summed NPAF by joining two half tables.
+
+    The blocks are split into two halves that do not couple to each other
+    (independent coupling groups, or a cut whose boundary blocks are
+    enumerated in an outer loop). Each half's contribution to every shift
+    is tabulated for all of its sign choices, reduced to a random linear
+    64-bit hash, and the halves are joined with a sorted lookup on
+    ``hash(left) == -hash(right + constant)``. Hash matches are re-checked
+    exactly, so no solution is missed and none is reported falsely.
+
+    Negating a whole coupling group is a symmetry, so one block per group is
+    pinned to +1 and each solution stands for ``result['symmetry']``
+    assignments. ``exhaustive`` is False only when ``max_solutions`` stopped
+    the join early. With a ``store`` the result for the same problem and
+    ``max_solutions`` is looked up before searching.
+    """
+    if store is not None:
+        from .result_store import cached_sign_search
+
+        return cached_sign_search(store, 'meet_in_the_middle_sign_search', problem,
+                                  {'max_solutions': max_solutions},
+                                  lambda: meet_in_the_middle_sign_search(problem, max_solutions, seed))
+    rng = np.random.default_rng(seed)
+    weights = rng.integers(np.iinfo(np.int64).min, np.iinfo(np.int64).max,
+                           size=problem.constant.size, dtype=np.int64, endpoint=True)
+    coupling = problem.coupling.astype(np.int64)
+    left, right, boundary, separable = _split_halves(problem)
+    symmetry = 2 ** (len(left) + len(right) if separable else 1)
+    target = problem.constant.astype(np.int64) @ weights
+    solutions: List[np.ndarray] = []
+    candidates = 0
+    stopped = False
+
+    for boundary_signs in _sign_table(boundary.size, pinned=boundary.size > 0):
+        fields = np.einsum("b,bcs->cs", boundary_signs.astype(np.int64), coupling[boundary])
+        base = target
+        if boundary.size:
+            base = base + _part_values(problem, boundary, boundary_signs[None, :],
+                                       np.zeros((boundary.size, weights.size), dtype=np.int64)) @ weights
+        sides = []
+        for half in (left, right):
+            parts = []
+            for blocks in half:
+                table = _sign_table(blocks.size, pinned=separable)
+                values = _part_values(problem, blocks, table, fields[blocks])
+                parts.append((table, values @ weights))
+            sides.append(parts)
+        left_hashes = _combine(sides[0])
+        right_keys = -(_combine(sides[1]) + base)
+        # Sorting both sides keeps the lookup a sequential merge.
+        order = np.argsort(right_keys)
+        sorted_keys = right_keys[order]
+        left_order = np.argsort(left_hashes)
+        queries = left_hashes[left_order]
+        lo = np.searchsorted(sorted_keys, queries)
+        hit = np.flatnonzero(sorted_keys[np.minimum(lo, sorted_keys.size - 1)] == queries)
+        hi = np.searchsorted(sorted_keys, queries[hit], side="right")
+        for position, stop in zip(hit, hi):
+            left_index = left_order[position]
+            for right_index in order[lo[position]:stop]:
+                candidates += 1
+                signs = np.zeros(problem.num_blocks, dtype=np.int8)
+                signs[boundary] = boundary_signs
+                for parts, half, index in ((sides[0], left, left_index), (sides[1], right, right_index)):
+                    rows = np.unravel_index(index, [table.shape[0] for table, _ in parts]) if parts else ()
+                    for (table, _), blocks, row in zip(parts, half, rows):
+                        signs[blocks] = table[row]
+                if not problem.evaluate(signs).any():
+                    solutions.append(signs)
+                    if max_solutions is not None and len(solutions) >= max_solutions:
+                        stopped = True
+                        break
+            if stopped:
+                break
+        if stopped:
+            break
+
+    return {
+        'solutions': solutions,
+        'symmetry': symmetry,
+        'candidates': candidates,
+        'exhaustive': not stopped,
+    }
+
+
+def _gray_walk(count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Reflected Gray code over ``count`` signs: the bit flipped at each step and its old sign.
+
+    Step ``t`` (1-based) flips bit ``ctz(t)``; the walk starts from all +1.
+    """
+    steps = np.arange(1, 1 << count)
+    flips = np.zeros(steps.size, dtype=np.int64)
+    for bit in range(1, count):
+        flips[(steps & ((1 << bit) - 1)) == 0] = bit
+    codes = np.arange(1 << count) ^ (np.arange(1 << count) >> 1)
+    old_bits = (codes[:-1] >> flips) & 1
+    return flips, (1 - 2 * old_bits).astype(np.int64)
+
+
+def iter_gray_code_signs(problem: SignProblem, max_deviation: int = 0, batch_bits: int = 12,
+                         probe_shifts: int = 8) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield every block-sign vector whose summed NPAF stays within ``max_deviation``.
+
+    The sign space is walked in Gray-code order, one block flip per step,
+    with block 0 pinned to +1 (negating every sign leaves the NPAF
+    unchanged, so each vector stands for itself and its negation). The
+    outer blocks are walked one flip at a time, updating the summed NPAF
+    and the local fields of the remaining blocks in ``O(num_blocks * L)``.
+    For each outer state, the last ``batch_bits`` blocks run their own Gray
+    walk as one cumulative sum of single-flip updates. That walk is first
+    evaluated at only ``probe_shifts`` shifts (those with the most coupling
+    terms); the few assignments passing there are checked at every shift.
+    Yields ``(signs, sum_series)`` pairs.
+    """
+    num_blocks = problem.num_blocks
+    coupling = problem.coupling.astype(np.int64)
+    inner = np.arange(max(num_blocks - batch_bits, 1), num_blocks)
+    outer = np.arange(1, inner[0]) if inner.size else np.arange(1, num_blocks)
+    signs = np.ones(num_blocks, dtype=np.int64)
+
+    # Outer state: blocks outside the batch, all +1 to start.
+    fixed = np.concatenate(([0], outer))
+    fields = coupling[:, fixed].sum(axis=1)
+    totals = problem.constant.astype(np.int64) + coupling[np.ix_(fixed, fixed)].sum(axis=(0, 1)) // 2
+
+    # Batch walk: sign table in walk order, the batch's own couplings and per-step coefficients.
+    inner_flips, inner_old = _gray_walk(inner.size)
+    codes = np.arange(1 << inner.size) ^ (np.arange(1 << inner.size) >> 1)
+    table = (1 - 2 * ((codes[:, None] >> np.arange(inner.size)) & 1)).astype(np.int8)
+    own = _part_values(problem, inner, table, np.zeros((inner.size, totals.size), dtype=np.int64))
+    probe = np.argsort(-np.count_nonzero(problem.coupling, axis=(0, 1)), kind="stable")[:probe_shifts]
+    own_probe = own[:, probe].astype(np.int32)
+    step_sign = (-2 * inner_old).astype(np.int32)[:, None]
+    updates = np.empty((table.shape[0], probe.size), dtype=np.int32)
+
+    outer_flips, outer_old = _gray_walk(outer.size)
+    for step in range(outer_flips.size + 1):
+        if step:
+            block = outer[outer_flips[step - 1]]
+            sign = outer_old[step - 1]
+            totals = totals - 2 * sign * fields[block]
+            fields = fields - 2 * sign * coupling[:, block]
+            signs[block] = -sign
+        inner_fields = fields[inner]
+        probe_fields = inner_fields[:, probe].astype(np.int32)
+        updates[0] = totals[probe] + probe_fields.sum(axis=0)
+        np.multiply(step_sign, probe_fields[inner_flips], out=updates[1:])
+        rows = np.cumsum(updates, axis=0, out=updates)
+        rows += own_probe
+        if max_deviation == 0:
+            candidates = np.flatnonzero(~rows.any(axis=1))
+        else:
+            candidates = np.flatnonzero(np.abs(rows).max(axis=1, initial=0) <= max_deviation)
+        if not candidates.size:
+            continue
+        full = totals + table[candidates].astype(np.int64) @ inner_fields + own[candidates]
+        for row, sum_series in zip(candidates, full):
+            if np.abs(sum_series).max(initial=0) <= max_deviation:
+                found = signs.astype(np.int8)
+                found[inner] = table[row]
+                yield found, sum_series
+
+
+def gray_code_sign_search(problem: SignProblem, max_deviation: int = 0,
+                          max_solutions: Optional[int] = None, batch_bits: int = 12,
+                          probe_shifts: int = 8, store: Optional['ResultStore'] = None) -> dict:
+    """
+    Exhaustively enumerate block signs in Gray-code order (see ``iter_gray_code_signs``).
+
+    Returns the sign vectors within ``max_deviation`` (zero-NPAF solutions
+    by default), the number of assignments visited (``2^(num_blocks - 1)``
+    when ``exhaustive``) and ``symmetry`` = 2 for the pinned global sign.
+    ``max_solutions`` stops the walk early. With a ``store`` the result for
+    the same problem, ``max_deviation`` and ``max_solutions`` is looked up
+    before walking.
+    """
+    if store is not None:
+        from .result_store import cached_sign_search
+
+        return cached_sign_search(store, 'gray_code_sign_search', problem,
+                                  {'max_deviation': max_deviation, 'max_solutions': max_solutions},
+                                  lambda: gray_code_sign_search(problem, max_deviation, max_solutions,
+                                                                batch_bits, probe_shifts))
+    solutions: List[np.ndarray] = []
+    series: List[np.ndarray] = []
+    stopped = False
+    for signs, sum_series in iter_gray_code_signs(problem, max_deviation, batch_bits, probe_shifts):
+        solutions.append(signs)
+        series.append(sum_series)
+        if max_solutions is not None and len(solutions) >= max_solutions:
+            stopped = True
+            break
     return {
-        'plan': best_plan,
-        'sequences': best_seqs,
-        'diagnostics': best_diag,
-        'iterations': max_iterations
+        'solutions': solutions,
+        'sum_series': series,
+        'symmetry': 2,
+        'visited': None if stopped else 1 << max(problem.num_blocks - 1, 0),
+        'exhaustive': not stopped,
     }
 
 
-__all__ = ['exhaustive_sign_search', 'simulated_annealing_search']
+__all__ = [
+    'exhaustive_sign_search',
+    'simulated_annealing_search',
+    'branch_and_bound_sign_search',
+    'coupling_components',
+    'meet_in_the_middle_sign_search',
+    'iter_gray_code_signs',
+    'gray_code_sign_search',
+]
@@ -0,0 +1,175 @@
+"""Golay complementary pairs for the Construction 2 inputs."""
+from __future__ import annotations
+
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .npaf import npaf_all_shifts
+from .sequences import SequenceArray
+
+GolayPair = Tuple[SequenceArray, SequenceArray]
+
+GOLAY_CACHE_ENV = "SARUKHANIAN_GOLAY_CACHE"
+
+
+def _default_cache_dir() -> Path | None:
+    """``$SARUKHANIAN_GOLAY_CACHE`` (empty disables the cache), else the user cache dir."""
+    override = os.environ.get(GOLAY_CACHE_ENV)
+    if override is not None:
+        return Path(override) if override else None
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "sarukhanian" / "golay"
+
+
+GOLAY_CACHE_DIR = _default_cache_dir()
+
+# Primitive pairs; every other supported length is built from these.
+GOLAY_KERNELS: Dict[int, Tuple[Tuple[int, ...], Tuple[int, ...]]] = {
+    1: ((1,), (1,)),
+    2: ((1, 1), (1, -1)),
+    10: (
+        (1, 1, -1, 1, -1, 1, -1, -1, 1, 1),
+        (1, 1, -1, 1, 1, 1, 1, 1, -1, -1),
+    ),
+    26: (
+        (1, -1, 1, -1, -1, -1, 1, 1, -1, -1, -1, -1, -1, -1, -1, 1, 1, 1, 1, -1, 1, 1, -1, -1, 1, -1),
+        (1, -1, 1, -1, -1, -1, 1, 1, -1, -1, -1, -1, 1, -1, 1, -1, -1, -1, -1, 1, -1, -1, 1, 1, -1, 1),
+    ),
+}
+
+_MEMO: Dict[int, GolayPair] = {}
+
+
+def golay_exponents(k: int) -> Tuple[int, int, int] | None:
+    """Return (a, b, c) with k = 2^a 10^b 26^c, or ``None`` if k has no such form."""
+    if k < 1:
+        return None
+    exponents = []
+    for base in (26, 10):
+        count = 0
+        while k % base == 0:
+            k //= base
+            count += 1
+        exponents.append(count)
+    if k & (k - 1):
+        return None
+    return k.bit_length() - 1, exponents[1], exponents[0]
+
+
+def is_golay_length(k: int) -> bool:
+    """True when :func:`golay_pair` can build a pair of length *k*."""
+    return golay_exponents(k) is not None
+
+
+def golay_lengths(limit: int) -> List[int]:
+    """Supported Golay lengths up to and including *limit*."""
+    return [k for k in range(1, limit + 1) if is_golay_length(k)]
+
+
+def is_complementary(a: SequenceArray, b: SequenceArray) -> bool:
+    """True when the NPAFs of *a* and *b* cancel at every nonzero shift."""
+    return a.size == b.size and not np.any(npaf_all_shifts(a) + npaf_all_shifts(b))
+
+
+def _doubled(pair: GolayPair) -> GolayPair:
+    a, b = pair
+    return np.concatenate((a, b)), np.concatenate((a, -b))
+
+
+def _product(outer: GolayPair, inner: GolayPair) -> GolayPair:
+    """Turyn's product of a length-m pair and a length-n pair, giving length mn.
+
+    With P = (C + D) / 2 and Q = (C - D) / 2 (disjoint supports), the pair
+    F(z) = A(z^n) P(z) + B(z^n) Q(z) and G(z) = B*(z^n) P(z) - A*(z^n) Q(z)
+    is complementary, where * reverses a sequence.
+    """
+    a, b = (seq.astype(np.int16) for seq in outer)
+    c, d = (seq.astype(np.int16) for seq in inner)
+    p, q = (c + d) // 2, (c - d) // 2
+    f = np.outer(a, p) + np.outer(b, q)
+    g = np.outer(b[::-1], p) - np.outer(a[::-1], q)
+    return f.ravel().astype(np.int8), g.ravel().astype(np.int8)
+
+
+def _build(k: int) -> GolayPair:
+    if k in GOLAY_KERNELS:
+        first, second = GOLAY_KERNELS[k]
+        return np.array(first, dtype=np.int8), np.array(second, dtype=np.int8)
+    for kernel in (26, 10):
+        if k % kernel == 0:
+            return _product(golay_pair(kernel, cache_dir=None), golay_pair(k // kernel, cache_dir=None))
+    return _doubled(golay_pair(k // 2, cache_dir=None))
+
+
+def _cache_file(cache_dir: Path, k: int) -> Path:
+    return cache_dir / f"golay_{k}.npz"
+
+
+def _load_cached(path: Path) -> GolayPair | None:
+    try:
+        with np.load(path) as data:
+            pair = data["a"].astype(np.int8), data["b"].astype(np.int8)
+    except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+        return None
+    return pair if is_complementary(*pair) else None
+
+
+def _store_cached(path: Path, pair: GolayPair) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".npz.tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            np.savez(handle, a=pair[0], b=pair[1])
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def golay_pair(k: int, cache_dir: Path | None = GOLAY_CACHE_DIR) -> GolayPair:
+    """Return a Golay complementary pair (F, G) of length *k* as int8 arrays.
+
+    Supported lengths are k = 2^a 10^b 26^c. Pairs are memoized in-process
+    and, unless ``cache_dir`` is ``None``, persisted as ``.npz`` files there
+    so later processes skip the construction. The default directory is
+    ``$SARUKHANIAN_GOLAY_CACHE`` or a ``sarukhanian/golay`` folder in the
+    user cache, never the source tree. A cache file that cannot be read is
+    rebuilt and one that cannot be written is skipped. The returned arrays
+    are shared with the cache and read-only.
+    """
+    if golay_exponents(k) is None:
+        raise ValueError(f"No Golay pair construction for length {k}; need k = 2^a 10^b 26^c.")
+    pair = _MEMO.get(k)
+    if pair is None and cache_dir is not None:
+        pair = _load_cached(_cache_file(Path(cache_dir), k))
+    if pair is None:
+        pair = _build(k)
+        if not is_complementary(*pair):
+            raise AssertionError(f"Golay construction for length {k} is not complementary.")
+        if cache_dir is not None:
+            try:
+                _store_cached(_cache_file(Path(cache_dir), k), pair)
+            except OSError:
+                pass
+    for seq in pair:
+        seq.setflags(write=False)
+    _MEMO[k] = pair
+    return pair
+
+
+__all__ = [
+    "GolayPair",
+    "GOLAY_CACHE_DIR",
+    "GOLAY_CACHE_ENV",
+    "GOLAY_KERNELS",
+    "golay_exponents",
+    "is_golay_length",
+    "golay_lengths",
+    "is_complementary",
+    "golay_pair",
+]
@@ -1,94 +1,207 @@
 """
-Improved repair algorithm using beam search and gradient descent.
+Greedy sign search over the blocks of a Sarukhanian plan.
+
+Each step scores every single-block flip (and optionally every pair flip)
+in one vectorized pass over the summed NPAF, with optional tabu memory to
+climb out of local minima; ``multi_start_greedy`` restarts it from random
+sign patterns.
 """
 from copy import deepcopy
+from pathlib import Path
+from random import Random
+from typing import TYPE_CHECKING, Callable, Optional, Tuple, Union
 import numpy as np
-from .construction import PlanType, plan_to_sequences, verify_four_sequences
+from .checkpoint import Checkpointer, load_checkpoint
+from .compiled_plan import compile_plan
+from .construction import PlanType, diagnostics_from_sum_series, plan_to_sequences, verify_four_sequences
+from .sign_problem import sign_problem_from_plan
+
+if TYPE_CHECKING:
+    from .result_store import ResultStore
+
+
+def _series_score(totals: np.ndarray) -> Tuple[int, int]:
+    return int(np.count_nonzero(totals)), int(np.abs(totals).max(initial=0))
+
 
+def _neighbourhood_scores(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """``(num_nonzero_shifts, max_abs_deviation)`` of every candidate row."""
+    nonzero = np.count_nonzero(rows, axis=1)
+    max_dev = np.abs(rows).max(axis=1, initial=0)
+    return nonzero, max_dev
 
-def greedy_sign_optimization(plan: PlanType, max_iterations: int = 1000) -> dict:
+
+def greedy_sign_optimization(plan: PlanType, max_iterations: int = 1000,
+                             should_stop: Optional[Callable[[], bool]] = None,
+                             pair_flips: bool = False,
+                             tabu_tenure: int = 0,
+                             max_stall: Optional[int] = None,
+                             verbose: bool = False,
+                             store: Optional['ResultStore'] = None) -> dict:
     """
     Greedy optimization: iteratively flip the sign that gives the best improvement.
+
+    Every iteration scores the whole single-flip neighbourhood (and, with
+    ``pair_flips``, every two-block flip) in one vectorized pass from the
+    current summed NPAF and the ``SignProblem`` local fields. Ties go to the
+    lowest block index. With ``tabu_tenure == 0`` the search stops at the
+    first local minimum. Otherwise it always takes the best allowed move,
+    even an uphill one, and a flipped block stays tabu for ``tabu_tenure``
+    iterations unless flipping it beats the best score so far; it then
+    stops after ``max_iterations`` or ``max_stall`` iterations without a new
+    best. The best plan seen is returned.
+
+    ``should_stop`` is polled before each iteration; returning True ends the
+    search with the best plan so far. ``iterations`` in the result counts
+    neighbourhood scans. Progress is printed only with ``verbose``.
+
+    With a ``store`` a finished search with the same plan and options is
+    returned from the store instead of rerun.
     """
-    current_plan = deepcopy(plan)
-    current_seqs = plan_to_sequences(current_plan).as_tuple()
-    current_diag = verify_four_sequences(*current_seqs)
-    current_score = (current_diag['num_nonzero_shifts'], current_diag['max_abs_deviation'])
-    
-    print(f"Starting greedy optimization from score: {current_score}")
-    
-    for iteration in range(max_iterations):
-        best_flip_idx = None
-        best_flip_score = current_score
-        best_flip_diag = None
-        best_flip_plan = None
-        
-        # Try flipping each block's sign
-        for idx in range(len(current_plan)):
-            test_plan = deepcopy(current_plan)
-            test_plan[idx] = {**test_plan[idx], 'sign': -test_plan[idx].get('sign', 1)}
-            
-            test_seqs = plan_to_sequences(test_plan).as_tuple()
-            test_diag = verify_four_sequences(*test_seqs)
-            test_score = (test_diag['num_nonzero_shifts'], test_diag['max_abs_deviation'])
-            
-            if test_score < best_flip_score:
-                best_flip_idx = idx
-                best_flip_score = test_score
-                best_flip_diag = test_diag
-                best_flip_plan = test_plan
-        
-        # If we found an improvement, apply it
-        if best_flip_idx is not None:
-            current_plan = best_flip_plan
-            current_seqs = plan_to_sequences(current_plan).as_tuple()
-            current_diag = best_flip_diag
-            current_score = best_flip_score
-            
-            print(f"  Iteration {iteration}: flipped block {best_flip_idx}, "
+    if store is not None:
+        from .result_store import cached_search
+
+        params = {'max_iterations': max_iterations, 'pair_flips': pair_flips,
+                  'tabu_tenure': tabu_tenure, 'max_stall': max_stall}
+        return cached_search(store, 'greedy_sign_optimization', plan, params,
+                             lambda poll: greedy_sign_optimization(plan, should_stop=poll, verbose=verbose, **params),
+                             should_stop=should_stop)
+    compiled = compile_plan(plan)
+    problem, signs = sign_problem_from_plan(compiled)
+    signs = signs.astype(np.int64)
+    coupling = problem.coupling.astype(np.int64)
+    totals = problem.evaluate(signs)
+    fields = problem.local_fields(signs)
+    current_score = _series_score(totals)
+    best_signs, best_totals, best_score = signs.copy(), totals.copy(), current_score
+    tabu_until = np.zeros(problem.num_blocks, dtype=np.int64)
+    last_improvement = 0
+
+    if verbose:
+        print(f"Starting greedy optimization from score: {current_score}")
+
+    iteration = scans = 0
+    while iteration < max_iterations and best_score[0] != 0:
+        if should_stop is not None and should_stop():
+            break
+        if max_stall is not None and iteration - last_improvement >= max_stall:
+            break
+        scans += 1
+        rows = problem.flip_neighbourhood(signs, totals, fields)
+        moves = [np.arange(problem.num_blocks)[:, None]]
+        if pair_flips:
+            pair_rows, first, second = problem.pair_flip_neighbourhood(signs, totals, fields)
+            rows = np.concatenate((rows, pair_rows))
+            moves.append(np.stack((first, second), axis=1))
+        nonzero, max_dev = _neighbourhood_scores(rows)
+        # Lexicographic (nonzero, max) order; lexsort is stable, so ties keep the lowest index.
+        order = np.lexsort((max_dev, nonzero))
+        if tabu_tenure > 0:
+            singles = tabu_until > iteration
+            tabu = singles.copy()
+            if pair_flips:
+                tabu = np.concatenate((tabu, singles[first] | singles[second]))
+            aspiration = (nonzero < best_score[0]) | ((nonzero == best_score[0]) & (max_dev < best_score[1]))
+            order = order[~tabu[order] | aspiration[order]]
+            if order.size == 0:
+                break
+        choice = int(order[0])
+        choice_score = (int(nonzero[choice]), int(max_dev[choice]))
+        if tabu_tenure == 0 and choice_score >= current_score:
+            if verbose:
+                print(f"  Converged at iteration {iteration} (local minimum)")
+            break
+
+        flipped = moves[0][choice] if choice < problem.num_blocks else moves[1][choice - problem.num_blocks]
+        for idx in flipped:
+            fields -= 2 * signs[idx] * coupling[:, idx]
+            signs[idx] = -signs[idx]
+        tabu_until[flipped] = iteration + 1 + tabu_tenure
+        totals = rows[choice].copy()
+        current_score = choice_score
+        iteration += 1
+
+        if verbose:
+            print(f"  Iteration {iteration - 1}: flipped block(s) {flipped.tolist()}, "
                   f"score={current_score[0]} non-zero, max_dev={current_score[1]}")
-            
-            if current_score[0] == 0:
+        if current_score < best_score:
+            best_signs, best_totals, best_score = signs.copy(), totals.copy(), current_score
+            last_improvement = iteration
+            if verbose and best_score[0] == 0:
                 print("  ✓✓✓ FOUND PERFECT SOLUTION! ✓✓✓")
-                return {
-                    'plan': current_plan,
-                    'sequences': current_seqs,
-                    'diagnostics': current_diag,
-                    'iterations': iteration + 1
-                }
-        else:
-            # No improvement found, we're at a local minimum
-            print(f"  Converged at iteration {iteration} (local minimum)")
-            break
-    
+
+    best = compiled.copy()
+    best.signs[:] = best_signs
     return {
-        'plan': current_plan,
-        'sequences': current_seqs,
-        'diagnostics': current_diag,
-        'iterations': iteration + 1
+        'plan': best.to_plan(),
+        'sequences': best.to_sequences().as_tuple(),
+        'diagnostics': diagnostics_from_sum_series(best_totals),
+        'iterations': scans,
     }
 
 
-def multi_start_greedy(plan: PlanType, num_starts: int = 50) -> dict:
+def multi_start_greedy(plan: PlanType, num_starts: int = 50,
+                       random_seed: Optional[int] = None,
+                       checkpoint_path: Optional[Union[str, Path]] = None,
+                       checkpoint_every: int = 1,
+                       resume_from: Optional[Union[str, Path]] = None,
+                       verbose: bool = False,
+                       **greedy_options) -> dict:
     """
     Run greedy optimization from multiple random starting points.
+
+    Pass ``random_seed`` for reproducible starts (the starts come from a
+    private ``random.Random``, not the global ``random.seed``);
+    ``parallel_search`` runs the same starts across worker processes. With ``checkpoint_path`` the
+    best result and RNG state are saved every ``checkpoint_every`` starts;
+    ``resume_from`` continues from such a file with the remaining starts.
+    Extra ``greedy_options`` (e.g. ``tabu_tenure``, ``pair_flips``) go to
+    every ``greedy_sign_optimization`` call.
     """
-    import random
-    
+    rng = Random(random_seed)
+
     best_result = None
     best_score = (float('inf'), float('inf'))
+    first_start = 0
+    if resume_from is not None:
+        saved = load_checkpoint(resume_from, 'multi_start_greedy')
+        rng.setstate(saved['rng_state'])
+        first_start = saved['start']
+        plan = saved['plan']
+        if saved['best_plan'] is not None:
+            best_seqs = plan_to_sequences(saved['best_plan']).as_tuple()
+            best_result = {
+                'plan': saved['best_plan'],
+                'sequences': best_seqs,
+                'diagnostics': verify_four_sequences(*best_seqs),
+                'iterations': saved['best_iterations'],
+            }
+            best_score = (best_result['diagnostics']['num_nonzero_shifts'],
+                          best_result['diagnostics']['max_abs_deviation'])
+    checkpointer = Checkpointer(checkpoint_path, 'multi_start_greedy', checkpoint_every)
+
+    def snapshot(next_start: int) -> dict:
+        return {
+            'start': next_start,
+            'plan': plan,
+            'rng_state': rng.getstate(),
+            'best_plan': None if best_result is None else best_result['plan'],
+            'best_iterations': None if best_result is None else best_result['iterations'],
+        }
     
-    print(f"Running {num_starts} multi-start greedy searches...")
-    
-    for start in range(num_starts):
+    log = print if verbose else (lambda *args, **kwargs: None)
+    log(f"Running {num_starts} multi-start greedy searches...")
+
+    for start in range(first_start, num_starts):
         # Random initial sign configuration
         test_plan = deepcopy(plan)
         for idx in range(len(test_plan)):
-            if random.random() < 0.5:
+            if rng.random() < 0.5:
                 test_plan[idx] = {**test_plan[idx], 'sign': -test_plan[idx].get('sign', 1)}
         
-        print(f"\n=== Start {start + 1}/{num_starts} ===")
-        result = greedy_sign_optimization(test_plan, max_iterations=100)
+        log(f"\n=== Start {start + 1}/{num_starts} ===")
+        options = {'max_iterations': 100, **greedy_options}
+        result = greedy_sign_optimization(test_plan, verbose=verbose, **options)
         
         diag = result['diagnostics']
         score = (diag['num_nonzero_shifts'], diag['max_abs_deviation'])
@@ -96,19 +209,23 @@ def multi_start_greedy(plan: PlanType, num_starts: int = 50) -> dict:
         if score < best_score:
             best_result = result
             best_score = score
-            print(f"  *** New overall best: {best_score} ***")
+            log(f"  *** New overall best: {best_score} ***")
             
             if best_score[0] == 0:
-                print("\n" + "="*60)
-                print("✓✓✓ PERFECT SOLUTION FOUND! ✓✓✓")
-                print("="*60)
+                log("\n" + "="*60)
+                log("✓✓✓ PERFECT SOLUTION FOUND! ✓✓✓")
+                log("="*60)
+                checkpointer.save(snapshot(start + 1))
                 return best_result
-    
-    print(f"\n{'='*60}")
-    print(f"Best result across all starts:")
-    print(f"  Non-zero shifts: {best_result['diagnostics']['num_nonzero_shifts']}")
-    print(f"  Max deviation: {best_result['diagnostics']['max_abs_deviation']}")
-    print(f"{'='*60}")
+
+        checkpointer.maybe_save(start + 1, lambda: snapshot(start + 1))
+
+    checkpointer.save(snapshot(num_starts))
+    log(f"\n{'='*60}")
+    log(f"Best result across all starts:")
+    log(f"  Non-zero shifts: {best_result['diagnostics']['num_nonzero_shifts']}")
+    log(f"  Max deviation: {best_result['diagnostics']['max_abs_deviation']}")
+    log(f"{'='*60}")
     
     return best_result
 
@@ -0,0 +1,274 @@
+"""Cyclic T-matrices and Goethals-Seidel Hadamard matrices.
+
+Four sequences with zero summed NPAF also have zero summed periodic
+autocorrelation (PAF), so their circulant matrices satisfy
+``sum_i M_i M_i^T = (sum of squared entries) I``. This module turns such
+quadruples into
+
+* T-sequences: four ``{0, ±1}`` sequences with exactly one non-zero entry
+  per position, whose circulants are cyclic T-matrices, and
+* Hadamard matrices from the Goethals-Seidel array over four ``±1``
+  circulants ``A, B, C, D``
+
+        [  A     BR     CR     DR  ]
+        [ -BR    A     D^T R -C^T R]
+        [ -CR  -D^T R   A     B^T R]
+        [ -DR   C^T R -B^T R   A   ]
+
+  where ``R`` is the back-diagonal identity.
+
+Nothing here needs a dense matrix product. The array identity reduces
+``H H^T = 4n I`` to a zero PAF sum of the first rows, checked with one
+FFT (:func:`src.npaf.paf_sum_four`). ``GoethalsSeidel.check_gram`` also tests the assembled operator
+itself (Freivalds' check with FFT circulant products), and
+``verify_hadamard_matrix`` does the same for a stored dense or
+memory-mapped ``H`` one row chunk at a time. ``GoethalsSeidel.save``
+streams ``H`` to an ``.npy`` file, either as int8 or bit-packed with one
+bit per entry (bit set means -1, as in :mod:`src.packed`).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .npaf import paf_sum_four
+
+# Rows of the Goethals-Seidel array: (sign, first row, transposed, reflected) per block.
+_GS_BLOCKS = (
+    ((1, 0, False, False), (1, 1, False, True), (1, 2, False, True), (1, 3, False, True)),
+    ((-1, 1, False, True), (1, 0, False, False), (1, 3, True, True), (-1, 2, True, True)),
+    ((-1, 2, False, True), (-1, 3, True, True), (1, 0, False, False), (1, 1, True, True)),
+    ((-1, 3, False, True), (1, 2, True, True), (-1, 1, True, True), (1, 0, False, False)),
+)
+
+# Rows of a 4x4 Hadamard matrix; combining T-matrices with them gives four ±1 circulants.
+_T_COMBINATIONS = np.array([[1, 1, 1, 1], [-1, 1, 1, -1], [-1, -1, 1, 1], [-1, 1, -1, 1]], dtype=np.int8)
+
+
+def _as_rows(rows: Sequence[NDArray] | NDArray) -> NDArray[np.int8]:
+    stacked = np.asarray(rows)
+    if stacked.ndim != 2 or stacked.shape[0] != 4:
+        raise ValueError("Expected four equal-length first rows.")
+    return stacked.astype(np.int8)
+
+
+def circulant(first_row: NDArray) -> NDArray[np.int8]:
+    """Dense circulant whose row ``i`` is ``first_row`` rotated right by ``i``."""
+    row = np.asarray(first_row, dtype=np.int8)
+    n = row.size
+    return row[(np.arange(n)[None, :] - np.arange(n)[:, None]) % n]
+
+
+def t_sequences(rows: Sequence[NDArray] | NDArray) -> NDArray[np.int8]:
+    """T-sequences from four rows with zero summed NPAF.
+
+    Rows that already are T-sequences are returned unchanged. Otherwise
+    X, Y must share a support and so must Z, W, and the result is
+    ``(X+Y)/2, (X-Y)/2, (Z+W)/2, (Z-W)/2``, which halves the summed NPAF.
+    When the two supports are complementary (as in Construction 2) these
+    have the original length. When both cover every position (as with the
+    ``±1`` rows of ``build_sarukhanian``) the (X, Y) pair is followed and
+    the (Z, W) pair preceded by ``n`` zeros, giving length ``2n``.
+    """
+    values = _as_rows(rows).astype(np.int64)
+    if _is_t_sequences(values):
+        return values.astype(np.int8)
+    x, y, z, w = values
+    if not (np.array_equal(x != 0, y != 0) and np.array_equal(z != 0, w != 0)):
+        raise ValueError("X and Y (and Z and W) must have the same support.")
+    first = np.stack(((x + y) // 2, (x - y) // 2))
+    second = np.stack(((z + w) // 2, (z - w) // 2))
+    xy, zw = x != 0, z != 0
+    if np.all(xy ^ zw):
+        result = np.concatenate((first, second))
+    elif np.all(xy) and np.all(zw):
+        zeros = np.zeros_like(first)
+        result = np.concatenate((np.hstack((first, zeros)), np.hstack((zeros, second))))
+    else:
+        raise ValueError("The (X, Y) and (Z, W) supports must be complementary or both full.")
+    return result.astype(np.int8)
+
+
+def _is_t_sequences(values: NDArray) -> bool:
+    return bool(np.all(np.abs(values) <= 1) and np.all(np.count_nonzero(values, axis=0) == 1))
+
+
+@dataclass(frozen=True)
+class TMatrices:
+    """Four cyclic T-matrices, held as their first rows."""
+
+    first_rows: NDArray[np.int8]
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[NDArray] | NDArray) -> "TMatrices":
+        """T-matrices from four rows with zero summed NPAF (see :func:`t_sequences`)."""
+        return cls(t_sequences(rows))
+
+    @property
+    def order(self) -> int:
+        return int(self.first_rows.shape[1])
+
+    def circulants(self) -> Tuple[NDArray[np.int8], ...]:
+        """The four dense ``order x order`` circulants."""
+        return tuple(circulant(row) for row in self.first_rows)
+
+    def verify(self) -> bool:
+        """Disjoint supports covering every position and ``sum_i T_i T_i^T = order * I``."""
+        return _is_t_sequences(self.first_rows) and not paf_sum_four(*self.first_rows).any()
+
+    def williamson_rows(self) -> NDArray[np.int8]:
+        """Four ``±1`` first rows ``sum_j h_ij T_j`` (``h`` a 4x4 Hadamard matrix) with zero summed PAF."""
+        return (_T_COMBINATIONS.astype(np.int64) @ self.first_rows.astype(np.int64)).astype(np.int8)
+
+    def hadamard(self) -> "GoethalsSeidel":
+        """Goethals-Seidel Hadamard matrix of order ``4 * order``."""
+        return GoethalsSeidel(self.williamson_rows())
+
+
+@dataclass(frozen=True)
+class GoethalsSeidel:
+    """The Goethals-Seidel Hadamard matrix over four ``±1`` circulant first rows."""
+
+    first_rows: NDArray[np.int8]
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "first_rows", _as_rows(self.first_rows))
+
+    @property
+    def block_size(self) -> int:
+        return int(self.first_rows.shape[1])
+
+    @property
+    def order(self) -> int:
+        return 4 * self.block_size
+
+    def verify(self) -> bool:
+        """Exact check of ``H H^T = order * I``: ``±1`` rows with zero summed PAF."""
+        return bool(np.all(np.abs(self.first_rows) == 1)) and not paf_sum_four(*self.first_rows).any()
+
+    def _spectra(self) -> NDArray[np.complex128]:
+        return np.fft.fft(self.first_rows.astype(np.float64), axis=1)
+
+    def _apply(self, vectors: NDArray, transpose: bool) -> NDArray[np.int64]:
+        n = self.block_size
+        values = np.asarray(vectors, dtype=np.float64)
+        single = values.ndim == 1
+        blocks = values.reshape(4, n, -1)
+        spectra = self._spectra()[:, :, None]
+        out = np.zeros_like(blocks)
+        for p in range(4):
+            for q in range(4):
+                sign, row, transposed, reflected = _GS_BLOCKS[q][p] if transpose else _GS_BLOCKS[p][q]
+                # Circulant X v correlates v with x; X^T v convolves. Transposing flips it.
+                part = blocks[q]
+                if reflected and not transpose:
+                    part = part[::-1]
+                spectrum = spectra[row] if transposed != transpose else np.conj(spectra[row])
+                product = np.fft.ifft(spectrum * np.fft.fft(part, axis=0), axis=0).real
+                if reflected and transpose:
+                    product = product[::-1]
+                out[p] += sign * product
+        result = np.rint(out).astype(np.int64).reshape(4 * n, -1)
+        return result[:, 0] if single else result
+
+    def matvec(self, vectors: NDArray) -> NDArray[np.int64]:
+        """``H @ vectors`` for a vector or ``(order, k)`` block, using FFT circulant products."""
+        return self._apply(vectors, transpose=False)
+
+    def rmatvec(self, vectors: NDArray) -> NDArray[np.int64]:
+        """``H.T @ vectors``, as :meth:`matvec`."""
+        return self._apply(vectors, transpose=True)
+
+    def check_gram(self, trials: int = 4, seed: int | None = 0) -> bool:
+        """Freivalds' test of ``H (H^T v) = order * v`` on the assembled operator.
+
+        A wrong ``H`` passes one random ``±1`` vector with probability at
+        most 1/2, so ``trials`` vectors leave at most ``2**-trials``.
+        """
+        rng = np.random.default_rng(seed)
+        probes = rng.choice(np.array([-1, 1], dtype=np.int64), size=(self.order, trials))
+        return bool(np.array_equal(self.matvec(self.rmatvec(probes)), self.order * probes))
+
+    def iter_row_blocks(self, rows_per_chunk: int = 1024) -> Iterator[Tuple[int, NDArray[np.int8]]]:
+        """Yield ``(start_row, rows)`` chunks of ``H`` without building the whole matrix."""
+        n = self.block_size
+        columns = np.arange(n)
+        for start in range(0, self.order, rows_per_chunk):
+            stop = min(start + rows_per_chunk, self.order)
+            chunk = np.empty((stop - start, self.order), dtype=np.int8)
+            for p in range(4):
+                lo, hi = max(start, p * n), min(stop, (p + 1) * n)
+                if lo >= hi:
+                    continue
+                local = np.arange(lo, hi)[:, None] - p * n
+                for q, (sign, row, transposed, reflected) in enumerate(_GS_BLOCKS[p]):
+                    cols = n - 1 - columns if reflected else columns
+                    index = (local - cols) % n if transposed else (cols - local) % n
+                    chunk[lo - start:hi - start, q * n:(q + 1) * n] = sign * self.first_rows[row][index]
+            yield start, chunk
+
+    def dense(self) -> NDArray[np.int8]:
+        """The full ``order x order`` int8 matrix."""
+        return np.concatenate([chunk for _, chunk in self.iter_row_blocks()])
+
+    def save(self, path: str | Path, packed: bool = False, rows_per_chunk: int = 1024) -> Path:
+        """Stream ``H`` into an ``.npy`` file, int8 or bit-packed (``(order, ceil(order / 8))`` uint8)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shape = (self.order, (self.order + 7) // 8) if packed else (self.order, self.order)
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8 if packed else np.int8, shape=shape)
+        for start, chunk in self.iter_row_blocks(rows_per_chunk):
+            if packed:
+                out[start:start + chunk.shape[0]] = np.packbits(chunk < 0, axis=1, bitorder="little")
+            else:
+                out[start:start + chunk.shape[0]] = chunk
+        out.flush()
+        del out
+        return path
+
+
+def load_hadamard(path: str | Path) -> NDArray[np.int8]:
+    """Load a matrix written by :meth:`GoethalsSeidel.save`; int8 files are memory-mapped."""
+    stored = np.load(path, mmap_mode="r")
+    if stored.dtype == np.int8:
+        return stored
+    bits = np.unpackbits(stored, axis=1, count=stored.shape[0], bitorder="little")
+    return (1 - 2 * bits.astype(np.int8)).astype(np.int8)
+
+
+def verify_hadamard_matrix(matrix: NDArray, trials: int = 4, seed: int | None = 0,
+                           rows_per_chunk: int = 4096) -> bool:
+    """Freivalds' test of ``H H^T = order * I`` for a dense or memory-mapped ``±1`` matrix.
+
+    Costs ``O(trials * order^2)``, reading ``rows_per_chunk`` rows at a time.
+    """
+    order = matrix.shape[0]
+    if matrix.shape != (order, order):
+        raise ValueError("Expected a square matrix.")
+    rng = np.random.default_rng(seed)
+    probes = rng.choice(np.array([-1, 1], dtype=np.int64), size=(order, trials))
+    transposed = np.zeros_like(probes)
+    for start in range(0, order, rows_per_chunk):
+        chunk = np.asarray(matrix[start:start + rows_per_chunk], dtype=np.int64)
+        if np.any(np.abs(chunk) != 1):
+            return False
+        transposed += chunk.T @ probes[start:start + rows_per_chunk]
+    for start in range(0, order, rows_per_chunk):
+        chunk = np.asarray(matrix[start:start + rows_per_chunk], dtype=np.int64)
+        if not np.array_equal(chunk @ transposed, order * probes[start:start + rows_per_chunk]):
+            return False
+    return True
+
+
+__all__ = [
+    "TMatrices",
+    "GoethalsSeidel",
+    "circulant",
+    "t_sequences",
+    "load_hadamard",
+    "verify_hadamard_matrix",
+]
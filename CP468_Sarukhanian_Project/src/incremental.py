@@ -0,0 +1,111 @@
+"""Incremental summed-NPAF bookkeeping for local block edits."""
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .npaf import npaf_sum_four
+from .sequences import SequenceArray
+
+_HistoryEntry = Tuple[int, NDArray[np.int8], NDArray[np.int32]]
+
+
+class IncrementalNPAF:
+    """Hold four rows and their summed NPAF, updating it under segment edits.
+
+    Flipping the sign of columns ``start:stop`` in all four rows only changes
+    the pairs with exactly one end inside the segment, so the summed NPAF is
+    updated with a cross-correlation of the segment against the rest of each
+    row (``O(n * len(segment))``) instead of a full recomputation.
+    """
+
+    def __init__(self, x: SequenceArray, y: SequenceArray, z: SequenceArray, w: SequenceArray) -> None:
+        self.sum_series = npaf_sum_four(x, y, z, w)
+        self.rows = np.stack((x, y, z, w)).astype(np.int8)
+        self._history: List[_HistoryEntry] = []
+
+    @classmethod
+    def from_rows(cls, rows: NDArray[np.int8]) -> "IncrementalNPAF":
+        """Build the state from a ``(4, n)`` array of X, Y, Z, W rows."""
+        if rows.ndim != 2 or rows.shape[0] != 4:
+            raise ValueError("Rows must be a (4, n) array.")
+        return cls(*rows)
+
+    @property
+    def length(self) -> int:
+        return int(self.rows.shape[1])
+
+    def as_tuple(self) -> Tuple[SequenceArray, SequenceArray, SequenceArray, SequenceArray]:
+        """Return copies of the current X, Y, Z, W rows."""
+        x, y, z, w = self.rows.copy()
+        return x, y, z, w
+
+    def score(self, sum_series: NDArray[np.int32] | None = None) -> Tuple[int, int]:
+        """Return ``(num_nonzero_shifts, max_abs_deviation)`` of a summed series."""
+        series = self.sum_series if sum_series is None else sum_series
+        max_abs = int(np.max(np.abs(series))) if series.size else 0
+        return int(np.count_nonzero(series)), max_abs
+
+    def _check_segment(self, start: int, stop: int) -> None:
+        if not 0 <= start < stop <= self.length:
+            raise IndexError(f"Segment [{start}, {stop}) is outside [0, {self.length}).")
+
+    def _cross_delta(self, start: int, diff: NDArray[np.int64]) -> NDArray[np.int32]:
+        """Change in the summed NPAF from adding *diff* to the segment at *start*.
+
+        Only pairs with one end in the segment and the other outside are
+        accounted for; callers add any change internal to the segment.
+        """
+        n = self.length
+        m = diff.shape[1]
+        rest = self.rows.astype(np.int64)
+        rest[:, start:start + m] = 0
+        corr = sum(np.correlate(rest[row], diff[row], mode="full") for row in range(4))
+        # corr[k] pairs segment offset i with row position start + i + k - (m - 1).
+        base = start + m - 1
+        delta = np.zeros(n - 1, dtype=np.int64)
+        forward = corr[base + 1:base + n]
+        delta[:forward.size] += forward
+        if base > 0:
+            backward = corr[base - 1::-1][:n - 1]
+            delta[:backward.size] += backward
+        return delta.astype(np.int32)
+
+    def flip_delta(self, start: int, stop: int) -> NDArray[np.int32]:
+        """Change in the summed NPAF if columns ``start:stop`` were negated."""
+        self._check_segment(start, stop)
+        diff = -2 * self.rows[:, start:stop].astype(np.int64)
+        return self._cross_delta(start, diff)
+
+    def propose_flip(self, start: int, stop: int) -> NDArray[np.int32]:
+        """Return the summed NPAF after a segment flip without changing state."""
+        return self.sum_series + self.flip_delta(start, stop)
+
+    def apply_flip(self, start: int, stop: int, delta: NDArray[np.int32] | None = None) -> None:
+        """Negate columns ``start:stop`` and record the edit for :meth:`undo`.
+
+        *delta* may be passed back from :meth:`flip_delta` to avoid
+        recomputing it for an accepted proposal.
+        """
+        if delta is None:
+            delta = self.flip_delta(start, stop)
+        self._history.append((start, self.rows[:, start:stop].copy(), delta))
+        self.rows[:, start:stop] *= -1
+        self.sum_series = self.sum_series + delta
+
+    def undo(self) -> None:
+        """Revert the most recent applied edit."""
+        if not self._history:
+            raise IndexError("Nothing to undo.")
+        start, previous, delta = self._history.pop()
+        self.rows[:, start:start + previous.shape[1]] = previous
+        self.sum_series = self.sum_series - delta
+
+    def clear_history(self) -> None:
+        """Forget recorded edits once they no longer need to be undone."""
+        self._history.clear()
+
+
+__all__ = ["IncrementalNPAF"]
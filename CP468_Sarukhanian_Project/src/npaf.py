@@ -1,4 +1,10 @@
-"""Nonperiodic autocorrelation helpers."""
+"""Nonperiodic and periodic autocorrelation helpers.
+
+The periodic autocorrelation (PAF) at shift ``s`` is
+``NPAF(s) + NPAF(n - s)``, so any summed NPAF series folds into the
+summed PAF with no further pass over the data. PAF inputs may contain
+zeros, as T-sequences do.
+"""
 from __future__ import annotations
 
 from typing import Tuple
@@ -8,45 +14,262 @@ from numpy.typing import NDArray
 
 SequenceArray = NDArray[np.int8]
 
+# Sequences at least this long use the FFT backend when ``method="auto"``.
+FFT_LENGTH_THRESHOLD = 256
+# Batched scoring amortises the FFT plan over many rows, so it switches earlier.
+BATCH_FFT_LENGTH_THRESHOLD = 64
+
+NPAF_METHODS = ("auto", "direct", "fft")
 
-def _validate_sequence(a: SequenceArray) -> None:
+
+def _validate_sequence(a: SequenceArray, allow_zero: bool = False) -> None:
     if a.ndim != 1:
         raise ValueError("Sequence must be 1-D.")
-    if not np.issubdtype(a.dtype, np.integer):
+    _validate_entries(a, allow_zero)
+
+
+def _validate_entries(values: NDArray, allow_zero: bool) -> None:
+    if not np.issubdtype(values.dtype, np.integer):
         raise TypeError("Sequence must have integer dtype.")
-    if not np.all((a == 1) | (a == -1)):
+    if allow_zero:
+        if np.any(np.abs(values) > 1):
+            raise ValueError("Sequence entries must be 0 or ±1.")
+    elif not np.all((values == 1) | (values == -1)):
         raise ValueError("Sequence entries must be ±1.")
 
 
+def _resolve_method(method: str, n: int, threshold: int = FFT_LENGTH_THRESHOLD) -> str:
+    if method not in NPAF_METHODS:
+        raise ValueError(f"Unknown NPAF method '{method}', expected one of {NPAF_METHODS}.")
+    if method == "auto":
+        return "fft" if n >= threshold else "direct"
+    return method
+
+
+def _fft_size(n: int) -> int:
+    """Smallest power of two that avoids circular wrap-around for length *n*."""
+    return 1 << max(2 * n - 1, 1).bit_length()
+
+
+def _power_spectrum(a: NDArray, size: int) -> NDArray[np.float64]:
+    spectrum = np.fft.rfft(a.astype(np.float64), size, axis=-1)
+    return spectrum.real ** 2 + spectrum.imag ** 2
+
+
+def _npaf_direct(a: SequenceArray) -> NDArray[np.int32]:
+    wide = a.astype(np.int64)
+    full = np.correlate(wide, wide, mode="full")
+    return full[a.size:].astype(np.int32)
+
+
+def _npaf_from_power(power: NDArray[np.float64], size: int, n: int) -> NDArray[np.int32]:
+    corr = np.fft.irfft(power, size, axis=-1)[..., 1:n]
+    return np.rint(corr).astype(np.int32)
+
+
+def _paf_from_npaf(npaf_series: NDArray[np.int32]) -> NDArray[np.int32]:
+    """Fold NPAF shifts 1..n-1 into PAF shifts 1..n-1."""
+    return npaf_series + npaf_series[..., ::-1]
+
+
+def _paf_fft(stack: NDArray, n: int) -> NDArray[np.int32]:
+    """Summed PAF over axis -2 (or of one row) through an unpadded length-n FFT."""
+    power = _power_spectrum(stack, n)
+    if power.ndim > 1:
+        power = power.sum(axis=-2)
+    return np.rint(np.fft.irfft(power, n, axis=-1)[..., 1:]).astype(np.int32)
+
+
+def _four_lengths(sequences: Tuple[SequenceArray, ...]) -> int:
+    lengths = {seq.size for seq in sequences}
+    if len(lengths) != 1:
+        raise ValueError("All sequences must have the same length.")
+    return lengths.pop()
+
+
+def _npaf_sum_rows(rows: NDArray, method: str) -> NDArray[np.int32]:
+    """Summed NPAF of validated equal-length rows."""
+    n = rows.shape[-1]
+    if n <= 1:
+        return np.zeros(0, dtype=np.int32)
+    if _resolve_method(method, n) == "direct":
+        return sum(_npaf_direct(row) for row in rows)
+    # The summed autocorrelation is the inverse transform of the summed
+    # power spectra, so one inverse FFT covers all four sequences.
+    size = _fft_size(n)
+    return _npaf_from_power(_power_spectrum(rows, size).sum(axis=0), size, n)
+
+
 def npaf(a: SequenceArray, s: int) -> int:
     """Compute the nonperiodic autocorrelation of *a* at shift *s*."""
     _validate_sequence(a)
     n = a.size
     if not 0 <= s < n:
         raise ValueError(f"Shift s must be in [0, {n - 1}].")
+    wide = a.astype(np.int64)  # int8 dot products overflow past length 127
     if s == 0:
-        return int(np.dot(a, a))
-    return int(np.dot(a[:-s], a[s:]))
+        return int(np.dot(wide, wide))
+    return int(np.dot(wide[:-s], wide[s:]))
 
 
-def npaf_all_shifts(a: SequenceArray) -> NDArray[np.int32]:
-    """Return the NPAF for shifts 1..n-1 as a vector."""
+def npaf_all_shifts(a: SequenceArray, method: str = "auto") -> NDArray[np.int32]:
+    """Return the NPAF for shifts 1..n-1 as a vector.
+
+    ``method`` selects the backend: ``"direct"`` is an exact integer
+    ``np.correlate``, ``"fft"`` correlates through a zero-padded real FFT and
+    rounds back to integers (exact for any practical length), and ``"auto"``
+    picks FFT once the sequence reaches ``FFT_LENGTH_THRESHOLD``.
+    """
     _validate_sequence(a)
     n = a.size
     if n <= 1:
         return np.zeros(0, dtype=np.int32)
-    result = np.empty(n - 1, dtype=np.int32)
-    for shift in range(1, n):
-        result[shift - 1] = npaf(a, shift)
-    return result
+    if _resolve_method(method, n) == "direct":
+        return _npaf_direct(a)
+    size = _fft_size(n)
+    return _npaf_from_power(_power_spectrum(a, size), size, n)
 
 
-def npaf_sum_four(x: SequenceArray, y: SequenceArray, z: SequenceArray, w: SequenceArray) -> NDArray[np.int32]:
+def npaf_sum_four(
+    x: SequenceArray,
+    y: SequenceArray,
+    z: SequenceArray,
+    w: SequenceArray,
+    method: str = "auto",
+) -> NDArray[np.int32]:
     """Sum the NPAFs of four equal-length sequences over shifts 1..n-1."""
-    lengths = {seq.size for seq in (x, y, z, w)}
-    if len(lengths) != 1:
-        raise ValueError("All sequences must have the same length.")
-    return npaf_all_shifts(x) + npaf_all_shifts(y) + npaf_all_shifts(z) + npaf_all_shifts(w)
+    _four_lengths((x, y, z, w))
+    for seq in (x, y, z, w):
+        _validate_sequence(seq)
+    return _npaf_sum_rows(np.stack((x, y, z, w)), method)
+
+
+def paf_all_shifts(a: SequenceArray, method: str = "auto") -> NDArray[np.int32]:
+    """Return the periodic autocorrelation for shifts 1..n-1 (entries 0 or ±1).
+
+    ``"direct"`` folds the exact integer NPAF, ``"fft"`` uses an unpadded
+    length-n real FFT; ``"auto"`` switches at ``FFT_LENGTH_THRESHOLD``.
+    """
+    _validate_sequence(a, allow_zero=True)
+    n = a.size
+    if n <= 1:
+        return np.zeros(0, dtype=np.int32)
+    if _resolve_method(method, n) == "direct":
+        return _paf_from_npaf(_npaf_direct(a))
+    return _paf_fft(a, n)
+
+
+def paf_sum_four(
+    x: SequenceArray,
+    y: SequenceArray,
+    z: SequenceArray,
+    w: SequenceArray,
+    method: str = "auto",
+) -> NDArray[np.int32]:
+    """Sum the PAFs of four equal-length sequences over shifts 1..n-1.
+
+    A zero result means the four circulants satisfy
+    ``sum_i M_i M_i^T = (sum of squared entries) I``.
+    """
+    n = _four_lengths((x, y, z, w))
+    for seq in (x, y, z, w):
+        _validate_sequence(seq, allow_zero=True)
+    if n <= 1:
+        return np.zeros(0, dtype=np.int32)
+    rows = np.stack((x, y, z, w))
+    if _resolve_method(method, n) == "direct":
+        return _paf_from_npaf(sum(_npaf_direct(row) for row in rows))
+    return _paf_fft(rows, n)
+
+
+def npaf_and_paf_sum_four(
+    x: SequenceArray,
+    y: SequenceArray,
+    z: SequenceArray,
+    w: SequenceArray,
+    method: str = "auto",
+) -> Tuple[NDArray[np.int32], NDArray[np.int32]]:
+    """Summed NPAF and PAF of four sequences (entries 0 or ±1) from one correlation pass."""
+    _four_lengths((x, y, z, w))
+    for seq in (x, y, z, w):
+        _validate_sequence(seq, allow_zero=True)
+    sum_series = _npaf_sum_rows(np.stack((x, y, z, w)), method)
+    return sum_series, _paf_from_npaf(sum_series)
+
+
+def _validate_batch(stack: NDArray, allow_zero: bool = False) -> None:
+    if stack.ndim != 3:
+        raise ValueError("Batched sequences must be 2-D (batch, n) arrays.")
+    _validate_entries(stack, allow_zero)
+
+
+def batch_scores(sum_matrix: NDArray[np.int32]) -> NDArray[np.int32]:
+    """Return per-row ``(num_nonzero, max_abs)`` scores for a summed-NPAF matrix."""
+    scores = np.zeros((sum_matrix.shape[0], 2), dtype=np.int32)
+    if sum_matrix.shape[1]:
+        scores[:, 0] = np.count_nonzero(sum_matrix, axis=1)
+        scores[:, 1] = np.abs(sum_matrix).max(axis=1)
+    return scores
+
+
+def npaf_sum_four_batch(
+    x: NDArray[np.int8],
+    y: NDArray[np.int8],
+    z: NDArray[np.int8],
+    w: NDArray[np.int8],
+    method: str = "auto",
+) -> Tuple[NDArray[np.int32], NDArray[np.int32]]:
+    """Score a stack of candidate quadruples in one vectorized call.
+
+    Each argument is a ``(batch, n)`` ±1 array whose rows are the X, Y, Z, W
+    sequences of one candidate. Returns the ``(batch, n-1)`` summed-NPAF
+    matrix together with a ``(batch, 2)`` array of ``(num_nonzero, max_abs)``
+    scores, row-aligned with the inputs.
+    """
+    shapes = {np.shape(seq) for seq in (x, y, z, w)}
+    if len(shapes) != 1:
+        raise ValueError("All sequence stacks must share the same (batch, n) shape.")
+    stack = np.stack((x, y, z, w))
+    _validate_batch(stack)
+    batch, n = stack.shape[1:]
+    if n <= 1:
+        sums = np.zeros((batch, 0), dtype=np.int32)
+    elif _resolve_method(method, n, BATCH_FFT_LENGTH_THRESHOLD) == "direct":
+        wide = stack.astype(np.int32)
+        sums = np.empty((batch, n - 1), dtype=np.int32)
+        for shift in range(1, n):
+            sums[:, shift - 1] = np.einsum("kbi,kbi->b", wide[:, :, :-shift], wide[:, :, shift:])
+    else:
+        size = _fft_size(n)
+        power = _power_spectrum(stack, size).sum(axis=0)
+        sums = _npaf_from_power(power, size, n)
+    return sums, batch_scores(sums)
+
+
+def paf_sum_four_batch(
+    x: NDArray[np.int8],
+    y: NDArray[np.int8],
+    z: NDArray[np.int8],
+    w: NDArray[np.int8],
+    method: str = "auto",
+) -> Tuple[NDArray[np.int32], NDArray[np.int32]]:
+    """Periodic counterpart of :func:`npaf_sum_four_batch` (entries 0 or ±1)."""
+    shapes = {np.shape(seq) for seq in (x, y, z, w)}
+    if len(shapes) != 1:
+        raise ValueError("All sequence stacks must share the same (batch, n) shape.")
+    stack = np.stack((x, y, z, w))
+    _validate_batch(stack, allow_zero=True)
+    batch, n = stack.shape[1:]
+    if n <= 1:
+        sums = np.zeros((batch, 0), dtype=np.int32)
+    elif _resolve_method(method, n, BATCH_FFT_LENGTH_THRESHOLD) == "direct":
+        wide = stack.astype(np.int32)
+        sums = np.empty((batch, n - 1), dtype=np.int32)
+        for shift in range(1, n):
+            sums[:, shift - 1] = np.einsum("kbi,kbi->b", wide, np.roll(wide, -shift, axis=-1))
+    else:
+        sums = _paf_fft(np.moveaxis(stack, 0, 1), n)
+    return sums, batch_scores(sums)
 
 
 def summarized_diagnostics(x: SequenceArray, y: SequenceArray, z: SequenceArray, w: SequenceArray) -> Tuple[int, int]:
@@ -58,8 +281,17 @@ def summarized_diagnostics(x: SequenceArray, y: SequenceArray, z: SequenceArray,
 
 
 __all__ = [
+    "FFT_LENGTH_THRESHOLD",
+    "BATCH_FFT_LENGTH_THRESHOLD",
+    "NPAF_METHODS",
     "npaf",
     "npaf_all_shifts",
     "npaf_sum_four",
     "summarized_diagnostics",
+    "npaf_sum_four_batch",
+    "batch_scores",
+    "paf_all_shifts",
+    "paf_sum_four",
+    "paf_sum_four_batch",
+    "npaf_and_paf_sum_four",
 ]
@@ -0,0 +1,167 @@
+"""Bit-packed ±1 sequences and popcount-based NPAF.
+
+A ±1 sequence of length n is stored as ceil(n / 64) little-endian uint64
+words with bit ``i % 64`` of word ``i // 64`` set when entry ``i`` is -1.
+The product of two entries is -1 exactly when their bits differ, so
+
+    sum_i a[i] * a[i + s] = (n - s) - 2 * popcount(bits[:-s] XOR bits[s:])
+
+and a whole shift costs a handful of word operations instead of n
+multiplications. Leading axes are batch axes throughout, which keeps
+large candidate populations at one bit per entry (8x smaller than int8).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .npaf import SequenceArray
+
+WORD_BITS = 64
+PackedWords = NDArray[np.uint64]
+
+_BYTE_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def num_words(length: int) -> int:
+    """Number of uint64 words holding ``length`` entries."""
+    return max((length + WORD_BITS - 1) // WORD_BITS, 1)
+
+
+def popcount(words: PackedWords) -> NDArray[np.int64]:
+    """Per-word set-bit counts (``np.bitwise_count`` when available)."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).astype(np.int64, copy=False)
+    as_bytes = np.ascontiguousarray(words).view(np.uint8).reshape(words.shape + (8,))
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+def pack_pm1(sequences: NDArray[np.integer]) -> PackedWords:
+    """Pack ±1 entries along the last axis into uint64 words."""
+    values = np.asarray(sequences)
+    length = values.shape[-1]
+    bits = np.packbits(values < 0, axis=-1, bitorder="little")
+    padded = np.zeros(values.shape[:-1] + (num_words(length) * 8,), dtype=np.uint8)
+    padded[..., :bits.shape[-1]] = bits
+    return padded.view("<u8").astype(np.uint64)
+
+
+def unpack_pm1(words: PackedWords, length: int) -> SequenceArray:
+    """Inverse of ``pack_pm1``: int8 ±1 entries along the last axis."""
+    as_bytes = np.ascontiguousarray(words, dtype="<u8").view(np.uint8)
+    bits = np.unpackbits(as_bytes, axis=-1, count=length, bitorder="little")
+    return (1 - 2 * bits.astype(np.int8)).astype(np.int8)
+
+
+def _shift_down(words: PackedWords, shift: int) -> PackedWords:
+    """Words of the bit string starting at entry ``shift`` (zero-filled at the end)."""
+    q, r = divmod(shift, WORD_BITS)
+    out = np.zeros_like(words)
+    count = words.shape[-1] - q
+    if count <= 0:
+        return out
+    out[..., :count] = words[..., q:] >> np.uint64(r)
+    if r and count > 1:
+        out[..., :count - 1] |= words[..., q + 1:] << np.uint64(WORD_BITS - r)
+    return out
+
+
+def _prefix_mask(num_bits: int, total_words: int) -> PackedWords:
+    """Mask selecting the first ``num_bits`` bits of a ``total_words``-word string."""
+    mask = np.zeros(total_words, dtype=np.uint64)
+    full, rest = divmod(num_bits, WORD_BITS)
+    mask[:full] = np.uint64(0xFFFFFFFFFFFFFFFF)
+    if rest:
+        mask[full] = np.uint64((1 << rest) - 1)
+    return mask
+
+
+def packed_correlation(words: PackedWords, length: int, shift: int) -> NDArray[np.int64]:
+    """``a[:-shift] . a[shift:]`` for every packed sequence in ``words``."""
+    if not 0 < shift < length:
+        raise ValueError(f"Shift must be in [1, {length - 1}].")
+    overlap = length - shift
+    differ = (words ^ _shift_down(words, shift)) & _prefix_mask(overlap, words.shape[-1])
+    return overlap - 2 * popcount(differ).sum(axis=-1)
+
+
+def packed_npaf_all_shifts(words: PackedWords, length: int, chunk_rows: int = 16384) -> NDArray[np.int64]:
+    """NPAF at shifts 1..length-1, shape ``words.shape[:-1] + (length - 1,)``.
+
+    The batch is transposed to word-major order and processed ``chunk_rows``
+    sequences at a time, so every step is a contiguous vector operation.
+    """
+    total_words = words.shape[-1]
+    flat = np.ascontiguousarray(words, dtype=np.uint64).reshape(-1, total_words)
+    out = np.empty((max(length - 1, 0), flat.shape[0]), dtype=np.int64)
+    for start in range(0, flat.shape[0], chunk_rows):
+        planes = np.ascontiguousarray(flat[start:start + chunk_rows].T)
+        width = planes.shape[1]
+        word = np.empty(width, dtype=np.uint64)
+        spill = np.empty(width, dtype=np.uint64)
+        ones = np.empty(width, dtype=np.int64)
+        for shift in range(1, length):
+            q, r = divmod(shift, WORD_BITS)
+            overlap = length - shift
+            ones[:] = 0
+            for w in range(num_words(overlap)):
+                np.right_shift(planes[w + q], np.uint64(r), out=word)
+                if r and w + q + 1 < total_words:
+                    np.left_shift(planes[w + q + 1], np.uint64(WORD_BITS - r), out=spill)
+                    word |= spill
+                word ^= planes[w]
+                valid = overlap - w * WORD_BITS
+                if valid < WORD_BITS:
+                    word &= np.uint64((1 << valid) - 1)
+                ones += popcount(word)
+            out[shift - 1, start:start + width] = overlap - 2 * ones
+    return out.T.reshape(words.shape[:-1] + (max(length - 1, 0),))
+
+
+def packed_npaf_sum_four(words: PackedWords, length: int) -> NDArray[np.int64]:
+    """Summed NPAF of packed quadruples shaped ``(..., 4, num_words)``."""
+    if words.shape[-2] != 4:
+        raise ValueError("Expected four packed sequences along axis -2.")
+    return packed_npaf_all_shifts(words, length).sum(axis=-2)
+
+
+@dataclass
+class PackedSequences:
+    """A batch of equal-length ±1 sequences held one bit per entry."""
+
+    words: PackedWords
+    length: int
+
+    @classmethod
+    def from_int8(cls, sequences: Sequence[SequenceArray] | NDArray[np.int8]) -> "PackedSequences":
+        values = np.asarray(sequences)
+        return cls(pack_pm1(values), int(values.shape[-1]))
+
+    def to_int8(self) -> SequenceArray:
+        return unpack_pm1(self.words, self.length)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.words.nbytes)
+
+    def npaf_all_shifts(self) -> NDArray[np.int64]:
+        return packed_npaf_all_shifts(self.words, self.length)
+
+    def npaf_sum_four(self) -> NDArray[np.int64]:
+        return packed_npaf_sum_four(self.words, self.length)
+
+
+__all__ = [
+    "WORD_BITS",
+    "PackedSequences",
+    "num_words",
+    "popcount",
+    "pack_pm1",
+    "unpack_pm1",
+    "packed_correlation",
+    "packed_npaf_all_shifts",
+    "packed_npaf_sum_four",
+]
@@ -0,0 +1,198 @@
+"""Multiprocess multi-start driver for the plan search routines.
+
+Each start runs one of the serial searches (greedy, simulated annealing or
+``auto_local_search``) in a worker process with its own seed, derived from a
+single ``numpy.random.SeedSequence`` so a whole run is reproducible. Plans
+cross the process boundary as three int8 arrays rather than lists of dicts,
+and the first start to reach a perfect ``(0, 0)`` score stops the others.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .compiled_plan import CompiledPlan, build_block_table, compile_plan, default_block_table
+from .construction import ConstructionResult, PlanType, SequenceArray, diagnostics_from_sum_series
+from .exhaustive_search import simulated_annealing_search
+from .greedy_search import greedy_sign_optimization
+from .npaf import npaf_sum_four
+from .repair import auto_local_search
+
+if TYPE_CHECKING:
+    from .result_store import ResultStore
+
+SEARCH_METHODS = ("greedy", "annealing", "local")
+
+# Minimum seconds between reads of the shared stop event inside a worker.
+_POLL_INTERVAL = 0.01
+
+CompactPlan = Tuple[NDArray[np.int8], NDArray[np.int8], NDArray[np.int8]]
+
+
+@dataclass
+class StartResult:
+    """Outcome of one start, as sent back from a worker."""
+
+    start: int
+    seed: int
+    method: str
+    plan: CompactPlan
+    score: Tuple[int, int]
+    iterations: Optional[int]
+
+
+_stop_event = None
+
+
+def _init_worker(stop_event) -> None:
+    global _stop_event
+    _stop_event = stop_event
+
+
+def _stop_poller() -> Callable[[], bool]:
+    """Cheap ``should_stop`` callback reading the shared event at most every ``_POLL_INTERVAL``."""
+    next_poll = time.monotonic()
+
+    def should_stop() -> bool:
+        nonlocal next_poll
+        now = time.monotonic()
+        if _stop_event is None or now < next_poll:
+            return False
+        next_poll = now + _POLL_INTERVAL
+        return _stop_event.is_set()
+
+    return should_stop
+
+
+def _pack(compiled: CompiledPlan) -> CompactPlan:
+    return compiled.pattern_ids.copy(), compiled.seq_ids.copy(), compiled.signs.copy()
+
+
+def _unpack(packed: CompactPlan, sequences: Optional[Mapping[str, SequenceArray]]) -> CompiledPlan:
+    table = default_block_table() if sequences is None else build_block_table(sequences)
+    pattern_ids, seq_ids, signs = packed
+    return CompiledPlan(pattern_ids.copy(), seq_ids.copy(), signs.copy(), table)
+
+
+def _score(compiled: CompiledPlan) -> Tuple[int, int]:
+    diag = diagnostics_from_sum_series(npaf_sum_four(*compiled.expand()))
+    return diag["num_nonzero_shifts"], diag["max_abs_deviation"]
+
+
+def _run_start(method: str, start: int, seed: int, packed: CompactPlan,
+               sequences: Optional[Mapping[str, SequenceArray]], random_start: bool,
+               options: Dict[str, object]) -> StartResult:
+    """Worker entry point: one seeded start of ``method`` from ``packed``."""
+    compiled = _unpack(packed, sequences)
+    if random_start:
+        rng = np.random.default_rng(seed)
+        compiled.signs *= rng.choice(np.array([-1, 1], dtype=np.int8), size=compiled.num_blocks)
+    plan = compiled.to_plan()
+    should_stop = _stop_poller()
+    if method == "greedy":
+        result = greedy_sign_optimization(plan, should_stop=should_stop, **options)
+    elif method == "annealing":
+        result = simulated_annealing_search(plan, random_seed=seed, should_stop=should_stop, **options)
+    else:
+        result = auto_local_search(plan, random_seed=seed, should_stop=should_stop, **options)
+    final = compile_plan(result["plan"], sequences)
+    return StartResult(start, seed, method, _pack(final), _score(final), result.get("iterations"))
+
+
+def start_seeds(num_starts: int, seed: Optional[int]) -> List[int]:
+    """Independent 32-bit seeds for each start, spawned from one ``SeedSequence``."""
+    children = np.random.SeedSequence(seed).spawn(num_starts)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def parallel_multi_start(
+    plan: PlanType,
+    num_starts: int = 32,
+    method: str = "greedy",
+    max_workers: Optional[int] = None,
+    seed: Optional[int] = 0,
+    random_start: bool = True,
+    sequences: Optional[Mapping[str, SequenceArray]] = None,
+    store: Optional[ResultStore] = None,
+    **options: object,
+) -> Dict[str, object]:
+    """
+    Run ``num_starts`` independent searches across a process pool and keep the best.
+
+    ``method`` is one of ``SEARCH_METHODS``; extra keyword ``options`` go to the
+    underlying routine (e.g. ``max_iterations`` or ``max_steps``). With
+    ``random_start`` every start begins from randomly flipped signs, as in
+    ``multi_start_greedy``. A start reaching ``(0, 0)`` sets a shared stop
+    flag: queued starts are cancelled and running ones return at their next
+    poll. The same ``seed`` gives the same per-start results regardless of
+    ``max_workers``; which starts finish before a perfect hit can vary.
+
+    With a ``store`` a run with the same plan, sequences, method, seed and
+    options is returned from the store (best plan, diagnostics, score,
+    start and seed; not the per-start records) instead of rerun. Unseeded
+    runs (``seed=None``) bypass it.
+    """
+    if method not in SEARCH_METHODS:
+        raise ValueError(f"Unknown search method {method!r}; expected one of {SEARCH_METHODS}.")
+    if num_starts < 1:
+        raise ValueError("num_starts must be at least 1.")
+    if store is not None and seed is not None:
+        from .result_store import cached_search
+
+        params = {"num_starts": num_starts, "method": method, "seed": seed, "random_start": random_start,
+                  "options": dict(options)}
+        result = cached_search(
+            store, "parallel_multi_start", plan, params,
+            lambda poll: parallel_multi_start(plan, num_starts, method, max_workers, seed, random_start,
+                                              sequences, **options),
+            sequences=sequences,
+        )
+        result["score"] = tuple(result["score"])
+        return result
+    packed = _pack(compile_plan(plan, sequences))
+    seeds = start_seeds(num_starts, seed)
+    workers = max_workers or os.cpu_count() or 1
+    context = multiprocessing.get_context()
+    stop_event = context.Event()
+    results: List[StartResult] = []
+
+    with ProcessPoolExecutor(max_workers=min(workers, max(num_starts, 1)), mp_context=context,
+                             initializer=_init_worker, initargs=(stop_event,)) as pool:
+        pending = {
+            pool.submit(_run_start, method, start, start_seed, packed, sequences, random_start, dict(options))
+            for start, start_seed in enumerate(seeds)
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                result = future.result()
+                results.append(result)
+                if result.score == (0, 0) and not stop_event.is_set():
+                    stop_event.set()
+                    for other in pending:
+                        other.cancel()
+
+    best = min(results, key=lambda item: (item.score, item.start))
+    compiled = _unpack(best.plan, sequences)
+    rows = compiled.expand()
+    return {
+        "plan": compiled.to_plan(),
+        "sequences": ConstructionResult(*rows).as_tuple(),
+        "diagnostics": diagnostics_from_sum_series(npaf_sum_four(*rows)),
+        "score": best.score,
+        "start": best.start,
+        "seed": best.seed,
+        "starts": sorted(results, key=lambda item: item.start),
+    }
+
+
+__all__ = ["SEARCH_METHODS", "StartResult", "start_seeds", "parallel_multi_start"]
@@ -1,11 +1,21 @@
 """Repair utilities for tweaking the Sarukhanian block plan."""
 from __future__ import annotations
 
+import time
 from copy import deepcopy
+from pathlib import Path
 from random import Random
-from typing import Callable, Dict, Iterable, List, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Tuple
 
-from .construction import PlanBlock, PlanType, plan_to_sequences, verify_four_sequences
+from .checkpoint import Checkpointer, load_checkpoint
+from .compiled_plan import compile_plan
+from .construction import PlanBlock, PlanType, diagnostics_from_sum_series
+from .correlation_tables import IncrementalPlanScore
+
+if TYPE_CHECKING:
+    from .result_store import ResultStore
+
+MOVE_KINDS = ("flip", "swap_equal", "swap_unequal")
 
 
 def _clone_plan(plan: PlanType) -> PlanType:
@@ -41,55 +51,117 @@ def swap_blocks(plan: PlanType, i: int, j: int) -> PlanType:
 def auto_local_search(
     plan: PlanType,
     max_steps: int = 500,
-    random_seed: int = 0,
+    random_seed: int | None = 0,
+    should_stop: Callable[[], bool] | None = None,
+    checkpoint_path: str | Path | None = None,
+    checkpoint_every: int = 1000,
+    resume_from: str | Path | None = None,
+    profile: bool = False,
+    store: ResultStore | None = None,
 ) -> Dict[str, object]:
-    """Stochastic local search over the plan using sign flips and swaps."""
-    rng = Random(random_seed)
-    current_plan = _clone_plan(plan)
-    current_sequences = plan_to_sequences(current_plan).as_tuple()
-    current_diag = verify_four_sequences(*current_sequences)
-    best_plan = _clone_plan(current_plan)
-    best_sequences = current_sequences
-    best_diag = current_diag
-
+    """Stochastic local search over the plan using sign flips and swaps.
+
+    ``should_stop`` is polled once per step; returning True ends the search
+    early with the best plan found so far. With ``checkpoint_path`` the
+    search state is saved every ``checkpoint_every`` steps and on exit;
+    ``resume_from`` continues such a run (``plan`` and ``random_seed`` are
+    then taken from the checkpoint) and gives the same result as an
+    uninterrupted run with the same ``max_steps``.
+
+    With ``profile=True`` the result also holds a ``"profile"`` dict giving,
+    for each of ``MOVE_KINDS``, the number of moves proposed and accepted
+    and the seconds spent evaluating them.
+
+    With a ``store`` a finished search with the same plan, ``max_steps`` and
+    ``random_seed`` is returned from the store instead of rerun (without a
+    profile); unseeded (``random_seed=None``) and resumed runs bypass it.
+    """
+    if store is not None and random_seed is not None and resume_from is None:
+        from .result_store import cached_search
+
+        return cached_search(
+            store, "auto_local_search", plan, {"max_steps": max_steps, "random_seed": random_seed},
+            lambda poll: auto_local_search(plan, max_steps, random_seed, should_stop=poll,
+                                           checkpoint_path=checkpoint_path, checkpoint_every=checkpoint_every,
+                                           profile=profile),
+            should_stop=should_stop,
+        )
     def score(diag: Dict[str, object]) -> Tuple[int, int]:
         return diag["num_nonzero_shifts"], diag["max_abs_deviation"]
 
-    best_score = score(best_diag)
-    current_score = best_score
+    rng = Random(random_seed)
+    first_step = 0
+    if resume_from is not None:
+        state = load_checkpoint(resume_from, "auto_local_search")
+        rng.setstate(state["rng_state"])
+        first_step = state["step"]
+        plan = state["current_plan"]
+    # Moves are scored incrementally from cached block-pair correlations;
+    # only the returned best plan is ever expanded into sequences.
+    current = IncrementalPlanScore(compile_plan(plan))
+    current_diag = diagnostics_from_sum_series(current.sum_series)
+    best_plan = current.plan.copy()
+    best_diag = current_diag
+    if resume_from is not None:
+        best_plan = compile_plan(state["best_plan"])
+        best_diag = diagnostics_from_sum_series(IncrementalPlanScore(best_plan, current.tables).sum_series)
 
-    for _ in range(max_steps):
-        candidate_plan = _clone_plan(current_plan)
+    best_score = score(best_diag)
+    current_score = score(current_diag)
+    checkpointer = Checkpointer(checkpoint_path, "auto_local_search", checkpoint_every)
+    stats = {kind: {"proposed": 0, "accepted": 0, "seconds": 0.0} for kind in MOVE_KINDS}
+    step = first_step
+
+    def snapshot() -> Dict[str, object]:
+        return {
+            "step": step,
+            "current_plan": current.plan.to_plan(),
+            "best_plan": best_plan.to_plan(),
+            "rng_state": rng.getstate(),
+        }
+
+    while step < max_steps and best_score != (0, 0):
+        if should_stop is not None and should_stop():
+            break
+        started = time.perf_counter() if profile else 0.0
         if rng.random() < 0.6:
-            idx = rng.randrange(len(candidate_plan))
-            candidate_plan[idx] = {
-                **candidate_plan[idx],
-                "sign": -int(candidate_plan[idx].get("sign", 1)),
-            }
+            kind = "flip"
+            idx = rng.randrange(current.plan.num_blocks)
+            delta = current.flip_delta(idx)
         else:
-            i, j = rng.sample(range(len(candidate_plan)), 2)
-            candidate_plan[i], candidate_plan[j] = candidate_plan[j], candidate_plan[i]
-        sequences = plan_to_sequences(candidate_plan).as_tuple()
-        diag = verify_four_sequences(*sequences)
+            i, j = rng.sample(range(current.plan.num_blocks), 2)
+            lengths = current.plan.block_lengths
+            kind = "swap_equal" if lengths[i] == lengths[j] else "swap_unequal"
+            delta = current.swap_delta(i, j)
+        diag = diagnostics_from_sum_series(current.sum_series + delta)
         cand_score = score(diag)
-        if cand_score <= current_score:
-            current_plan = candidate_plan
-            current_sequences = sequences
-            current_diag = diag
+        accepted = cand_score <= current_score
+        if accepted:
+            if kind == "flip":
+                current.apply_flip(idx, delta)
+            else:
+                current.apply_swap(i, j, delta)
             current_score = cand_score
+        if profile:
+            stats[kind]["proposed"] += 1
+            stats[kind]["accepted"] += int(accepted)
+            stats[kind]["seconds"] += time.perf_counter() - started
         if cand_score < best_score:
-            best_plan = _clone_plan(candidate_plan)
-            best_sequences = sequences
+            best_plan = current.plan.copy()
             best_diag = diag
             best_score = cand_score
-        if best_score == (0, 0):
-            break
+        step += 1
+        checkpointer.maybe_save(step, snapshot)
 
-    return {
-        "plan": best_plan,
-        "sequences": best_sequences,
+    checkpointer.save(snapshot())
+    result: Dict[str, object] = {
+        "plan": best_plan.to_plan(),
+        "sequences": best_plan.to_sequences().as_tuple(),
         "diagnostics": best_diag,
     }
+    if profile:
+        result["profile"] = stats
+    return result
 
 
-__all__ = ["apply_sign_flip", "swap_blocks", "auto_local_search"]
+__all__ = ["MOVE_KINDS", "apply_sign_flip", "swap_blocks", "auto_local_search"]
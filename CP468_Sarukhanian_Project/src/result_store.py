@@ -0,0 +1,342 @@
+"""On-disk store of built and verified sequence quadruples.
+
+Results are keyed by ``(construction, n, k, plan_hash)``: the construction
+name (``"sarukhanian"``, ``"construction2"``, ...), the Turyn order, the
+Golay length (0 when unused) and a digest of everything else that decides
+the output (plan, signs, input sequences). Each row keeps the four
+sequences packed eight entries to a byte, the ``verify_four_sequences``
+diagnostics and a free-form provenance dict recording how the result was
+obtained. ``get_or_compute`` is the intended entry point: builders and
+searches look a key up first and only run on a miss.
+
+Searches (annealing, local search, greedy, the parallel driver, the
+exact sign searches and ``solve_construction_2``) take ``store=`` as well
+and go through ``cached_search`` / ``cached_sign_search``. Their results
+are stored under the routine name, keyed by ``search_hash`` of the
+starting plan or problem and every parameter that changes the outcome.
+Plan searches use ``n`` = output sequence length. The provenance records
+the routine, its parameters, the resulting plan and any JSON-serialisable
+extras such as the iteration count. Exact sign searches store their
+solution sign vectors in place of the four sequences.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from .construction import PlanType, SequenceArray, verify_four_sequences
+
+RESULT_STORE_PATH = Path(__file__).resolve().parents[1] / ".cache" / "results.sqlite"
+
+FourSequences = Tuple[SequenceArray, SequenceArray, SequenceArray, SequenceArray]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    construction TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    k INTEGER NOT NULL,
+    plan_hash TEXT NOT NULL,
+    lengths TEXT NOT NULL,
+    packed BLOB NOT NULL,
+    sum_series BLOB NOT NULL,
+    diagnostics TEXT NOT NULL,
+    provenance TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (construction, n, k, plan_hash)
+)
+"""
+
+
+@dataclass
+class StoredResult:
+    """One stored quadruple with its diagnostics and provenance."""
+
+    construction: str
+    n: int
+    k: int
+    plan_hash: str
+    sequences: FourSequences
+    diagnostics: Dict[str, object]
+    provenance: Dict[str, object]
+    created: float
+
+    @property
+    def is_perfect(self) -> bool:
+        return self.diagnostics.get("num_nonzero_shifts") == 0
+
+
+def plan_hash(plan: PlanType | None = None, *arrays: Sequence[int] | np.ndarray) -> str:
+    """Stable digest of a block plan and any sign vectors or input sequences."""
+    digest = hashlib.sha256()
+    if plan is not None:
+        blocks = [(str(b["pattern"]), str(b["seq"]), int(b.get("sign", 1))) for b in plan]
+        digest.update(json.dumps(blocks).encode())
+    for array in arrays:
+        values = np.asarray(array, dtype=np.int8)
+        digest.update(str(values.shape).encode())
+        digest.update(values.tobytes())
+    return digest.hexdigest()[:32]
+
+
+def search_hash(routine: str, params: Mapping[str, object], plan: PlanType | None = None,
+                *arrays: Sequence[int] | np.ndarray) -> str:
+    """Stable digest of a search: routine, parameters, starting plan and any input arrays."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps({"routine": routine, "params": params}, sort_keys=True, default=str).encode())
+    if plan is not None:
+        digest.update(plan_hash(plan).encode())
+    for array in arrays:
+        values = np.ascontiguousarray(array)
+        digest.update(f"{values.dtype}{values.shape}".encode())
+        digest.update(values.tobytes())
+    return digest.hexdigest()[:32]
+
+
+def _json_safe(value: object) -> object:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _json_safe(item) for key, item in value.items()}
+    return value
+
+
+def _extras(result: Mapping[str, object], skip: Sequence[str]) -> Dict[str, object]:
+    """Result entries that survive a JSON round trip (profiles and worker records are dropped)."""
+    extras = {}
+    for key, value in result.items():
+        if key in skip:
+            continue
+        try:
+            json.dumps(_json_safe(value))
+        except TypeError:
+            continue
+        extras[key] = _json_safe(value)
+    return extras
+
+
+def _plain_plan(plan: PlanType) -> list:
+    return [{"pattern": str(b["pattern"]), "seq": str(b["seq"]), "sign": int(b.get("sign", 1))} for b in plan]
+
+
+def cached_search(
+    store: "ResultStore",
+    routine: str,
+    plan: PlanType,
+    params: Mapping[str, object],
+    run: Callable[[Callable[[], bool] | None], Dict[str, object]],
+    should_stop: Callable[[], bool] | None = None,
+    sequences: Mapping[str, np.ndarray] | None = None,
+) -> Dict[str, object]:
+    """Look a plan search up in ``store``; on a miss run it and record the result.
+
+    ``run`` receives the ``should_stop`` poller to pass on; a run that it
+    interrupts is returned but not stored. A miss returns the run's result
+    unchanged. A hit returns ``plan``,
+    ``sequences``, ``diagnostics``, the stored JSON-serialisable extras
+    (``iterations``, ``score``, ...) and the stored ``provenance``.
+    """
+    from .compiled_plan import compile_plan
+
+    inputs = [] if sequences is None else [np.asarray(sequences[token]) for token in sorted(sequences)]
+    key = search_hash(routine, params, plan, *inputs)
+    length = int(compile_plan(plan, sequences).block_lengths.sum())
+    stored = store.get(routine, length, 0, key)
+    if stored is not None:
+        extras = {name: value for name, value in stored.provenance.items()
+                  if name not in ("source", "params", "plan")}
+        return {"plan": stored.provenance["plan"], "sequences": stored.sequences,
+                "diagnostics": stored.diagnostics, **extras, "provenance": stored.provenance}
+    interrupted = []
+
+    def poll() -> bool:
+        if should_stop is not None and should_stop():
+            interrupted.append(True)
+            return True
+        return False
+
+    result = run(poll if should_stop is not None else None)
+    if interrupted:
+        return result
+    provenance = {"source": routine, "params": _json_safe(dict(params)), "plan": _plain_plan(result["plan"]),
+                  **_extras(result, ("plan", "sequences", "diagnostics"))}
+    store.put(routine, length, 0, key, result["sequences"], diagnostics=result["diagnostics"], provenance=provenance)
+    return result
+
+
+def cached_sign_search(
+    store: "ResultStore",
+    routine: str,
+    problem: object,
+    params: Mapping[str, object],
+    run: Callable[[], Dict[str, object]],
+) -> Dict[str, object]:
+    """Look an exact sign search over a ``SignProblem`` up in ``store``.
+
+    The solution sign vectors are stored as the sequences and the other
+    result entries in the provenance. A hit rebuilds the result dict with
+    the solutions (and any ``sum_series``) as int arrays.
+    """
+    arrays = (problem.coupling, problem.constant, problem.offsets)  # type: ignore[attr-defined]
+    key = search_hash(routine, params, None, *arrays)
+    num_blocks = int(problem.num_blocks)  # type: ignore[attr-defined]
+    stored = store.get(routine, num_blocks, 0, key)
+    if stored is not None:
+        result = {name: value for name, value in stored.provenance.items() if name not in ("source", "params")}
+        if "sum_series" in result:
+            result["sum_series"] = [np.asarray(series, dtype=np.int64) for series in result["sum_series"]]
+        return {"solutions": [np.asarray(signs, dtype=np.int8) for signs in stored.sequences], **result,
+                "provenance": stored.provenance}
+    result = run()
+    diagnostics = {"num_solutions": len(result["solutions"]), "sum_series": np.zeros(0, dtype=np.int32)}
+    provenance = {"source": routine, "params": _json_safe(dict(params)), **_extras(result, ("solutions",))}
+    store.put(routine, num_blocks, 0, key, result["solutions"], diagnostics=diagnostics, provenance=provenance)
+    return result
+
+
+def pack_sequences(sequences: Sequence[np.ndarray]) -> Tuple[Tuple[int, ...], bytes]:
+    """Pack ±1 sequences into one bit string (+1 -> 1); returns lengths and bytes."""
+    lengths = tuple(int(np.size(seq)) for seq in sequences)
+    bits = np.concatenate([np.asarray(seq).ravel() > 0 for seq in sequences]) if lengths else np.zeros(0, bool)
+    return lengths, np.packbits(bits).tobytes()
+
+
+def unpack_sequences(lengths: Sequence[int], packed: bytes) -> Tuple[np.ndarray, ...]:
+    """Inverse of ``pack_sequences``; returns int8 ±1 arrays."""
+    if not lengths:
+        return ()
+    total = int(sum(lengths))
+    bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), count=total)
+    values = (2 * bits.astype(np.int8) - 1)
+    return tuple(np.split(values, np.cumsum(lengths)[:-1]))
+
+
+def _without_series(diagnostics: Dict[str, object]) -> Dict[str, object]:
+    return {key: _without_series(value) if isinstance(value, dict) else value  # type: ignore[arg-type]
+            for key, value in diagnostics.items() if key != "sum_series"}
+
+
+def _diagnostics_json(diagnostics: Dict[str, object]) -> str:
+    return json.dumps(_without_series(diagnostics))
+
+
+class ResultStore:
+    """SQLite-backed result store; usable as a context manager."""
+
+    def __init__(self, path: str | Path = RESULT_STORE_PATH) -> None:
+        self.path = Path(path)
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return int(self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0])
+
+    def get(self, construction: str, n: int, k: int, key: str) -> StoredResult | None:
+        """The stored result for a key, or ``None`` on a miss."""
+        row = self._conn.execute(
+            "SELECT construction, n, k, plan_hash, lengths, packed, sum_series, diagnostics, provenance, created "
+            "FROM results WHERE construction = ? AND n = ? AND k = ? AND plan_hash = ?",
+            (construction, int(n), int(k), key),
+        ).fetchone()
+        return None if row is None else self._from_row(row)
+
+    def put(
+        self,
+        construction: str,
+        n: int,
+        k: int,
+        key: str,
+        sequences: Sequence[np.ndarray],
+        diagnostics: Dict[str, object] | None = None,
+        provenance: Dict[str, object] | None = None,
+    ) -> StoredResult:
+        """Insert or replace a result; diagnostics are computed when not given."""
+        sequences = tuple(np.asarray(seq, dtype=np.int8) for seq in sequences)
+        if diagnostics is None:
+            diagnostics = verify_four_sequences(*sequences)
+        lengths, packed = pack_sequences(sequences)
+        sum_series = np.asarray(diagnostics["sum_series"], dtype=np.int32)
+        created = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                construction, int(n), int(k), key, json.dumps(lengths), packed,
+                sum_series.tobytes(), _diagnostics_json(diagnostics),
+                json.dumps(provenance or {}, default=str), created,
+            ),
+        )
+        self._conn.commit()
+        return StoredResult(construction, int(n), int(k), key, sequences,  # type: ignore[arg-type]
+                            dict(diagnostics), dict(provenance or {}), created)
+
+    def get_or_compute(
+        self,
+        construction: str,
+        n: int,
+        k: int,
+        key: str,
+        compute: Callable[[], Tuple[Sequence[np.ndarray], Dict[str, object]]],
+    ) -> StoredResult:
+        """Return the stored result, or run ``compute() -> (sequences, provenance)`` and store it."""
+        stored = self.get(construction, n, k, key)
+        if stored is not None:
+            return stored
+        sequences, provenance = compute()
+        return self.put(construction, n, k, key, sequences, provenance=provenance)
+
+    def results(self, construction: str | None = None) -> Iterator[StoredResult]:
+        """Every stored result, optionally for one construction, ordered by key."""
+        query = ("SELECT construction, n, k, plan_hash, lengths, packed, sum_series, diagnostics, "
+                 "provenance, created FROM results")
+        params: Tuple[object, ...] = ()
+        if construction is not None:
+            query += " WHERE construction = ?"
+            params = (construction,)
+        for row in self._conn.execute(query + " ORDER BY construction, n, k, plan_hash", params):
+            yield self._from_row(row)
+
+    @staticmethod
+    def _from_row(row: Tuple[object, ...]) -> StoredResult:
+        construction, n, k, key, lengths, packed, sum_series, diagnostics, provenance, created = row
+        diag = json.loads(diagnostics)  # type: ignore[arg-type]
+        if "nonzero_pairs" in diag:
+            diag["nonzero_pairs"] = [tuple(pair) for pair in diag["nonzero_pairs"]]
+        diag["sum_series"] = np.frombuffer(sum_series, dtype=np.int32).copy()  # type: ignore[arg-type]
+        sequences = unpack_sequences(json.loads(lengths), packed)  # type: ignore[arg-type]
+        return StoredResult(str(construction), int(n), int(k), str(key), sequences,  # type: ignore[arg-type]
+                            diag, json.loads(provenance), float(created))  # type: ignore[arg-type]
+
+
+__all__ = [
+    "RESULT_STORE_PATH",
+    "StoredResult",
+    "ResultStore",
+    "plan_hash",
+    "search_hash",
+    "cached_search",
+    "cached_sign_search",
+    "pack_sequences",
+    "unpack_sequences",
+]
@@ -1,12 +1,13 @@
 """Utilities for base Sarukhanian sequences and small helper ops."""
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, Tuple
 
 import numpy as np
 from numpy.typing import NDArray
 
 SequenceArray = NDArray[np.int8]
+TurynQuadruple = Tuple[SequenceArray, SequenceArray, SequenceArray, SequenceArray]
 
 BASE_SEQUENCES: Dict[str, SequenceArray] = {
     "A": np.array([1, 1, 1], dtype=np.int8),
@@ -28,6 +29,29 @@ def rev(vec: SequenceArray) -> SequenceArray:
     return vec[::-1].copy()
 
 
+def validate_turyn(turyn: TurynQuadruple) -> int:
+    """Check a quadruple has lengths (n, n, n-1, n-1) and ±1 entries; return n."""
+    if len(turyn) != 4:
+        raise ValueError("A Turyn quadruple needs exactly four sequences (A, B, C, D).")
+    a, b, c, d = (np.asarray(seq) for seq in turyn)
+    n = a.size
+    if n < 2 or any(seq.ndim != 1 for seq in (a, b, c, d)):
+        raise ValueError("Turyn sequences must be 1-D with n >= 2.")
+    if (b.size, c.size, d.size) != (n, n - 1, n - 1):
+        raise ValueError(f"Turyn sequences must have lengths (n, n, n-1, n-1); got {(a.size, b.size, c.size, d.size)}.")
+    for seq in (a, b, c, d):
+        if not np.all(np.isin(seq, (-1, 1))):
+            raise ValueError("Turyn sequences must be ±1.")
+    return int(n)
+
+
+def make_sequence_table(turyn: TurynQuadruple) -> Dict[str, SequenceArray]:
+    """Build the token table (A..D and reversals rA..rD) for one Turyn quadruple."""
+    validate_turyn(turyn)
+    base = {name: np.asarray(seq).astype(np.int8) for name, seq in zip("ABCD", turyn)}
+    return {**base, **{f"r{name}": rev(seq) for name, seq in base.items()}}
+
+
 REVERSED_SEQUENCES: Dict[str, SequenceArray] = {
     "rA": rev(BASE_SEQUENCES["A"]),
     "rB": rev(BASE_SEQUENCES["B"]),
@@ -67,6 +91,7 @@ def tile_block(pattern_col: SequenceArray, row_vector: SequenceArray) -> NDArray
 
 __all__ = [
     "SequenceArray",
+    "TurynQuadruple",
     "BASE_SEQUENCES",
     "PATTERN_COLUMNS",
     "ALL_SEQUENCES",
@@ -74,4 +99,6 @@ __all__ = [
     "get_pattern",
     "tile_block",
     "rev",
+    "validate_turyn",
+    "make_sequence_table",
 ]
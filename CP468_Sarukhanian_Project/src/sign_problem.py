@@ -0,0 +1,132 @@
+"""Block-sign search problems as quadratic forms in the signs.
+
+For a fixed block order, the rows are ``sum_b sign_b * T_b`` where ``T_b``
+is block ``b``'s unsigned 4xlen tile placed at its offset. The summed NPAF
+at every shift is then
+
+    total(s) = constant(s) + sum_{b < c} sign_b * sign_c * coupling[b, c, s - 1]
+
+where ``constant`` collects each block's own (sign-independent)
+autocorrelation and ``coupling[b, c]`` is the cross-correlation of blocks
+``b`` and ``c``. Exact and stochastic sign searches work from these
+arrays instead of expanding sequences.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .compiled_plan import CompiledPlan, compile_plan
+from .construction import PlanType
+from .construction2 import Construction2Layout
+from .correlation_tables import correlation_tables
+
+
+@dataclass
+class SignProblem:
+    """Summed NPAF of a fixed block order as a function of the block signs."""
+
+    coupling: NDArray[np.int32]
+    constant: NDArray[np.int32]
+    offsets: NDArray[np.int64]
+
+    @property
+    def num_blocks(self) -> int:
+        return int(self.coupling.shape[0])
+
+    @property
+    def length(self) -> int:
+        return int(self.offsets[-1])
+
+    def evaluate(self, signs: Sequence[int] | NDArray) -> NDArray[np.int64]:
+        """Summed NPAF over shifts 1..L-1 for one sign vector."""
+        sigma = np.asarray(signs, dtype=np.int64)
+        return self.constant + np.einsum("b,bcs,c->s", sigma, self.coupling, sigma) // 2
+
+    def evaluate_batch(self, signs: NDArray) -> NDArray[np.int64]:
+        """Summed NPAF rows for a ``(batch, num_blocks)`` stack of sign vectors."""
+        sigma = np.asarray(signs, dtype=np.int64)
+        fields = np.tensordot(sigma, self.coupling, axes=([1], [1]))
+        return self.constant + np.einsum("nb,nbs->ns", sigma, fields) // 2
+
+    def local_fields(self, signs: Sequence[int] | NDArray) -> NDArray[np.int64]:
+        """``fields[b] = sum_c sign_c * coupling[b, c]``; flipping b changes the total by ``-2 sign_b fields[b]``."""
+        sigma = np.asarray(signs, dtype=np.int64)
+        return np.einsum("bcs,c->bs", self.coupling, sigma)
+
+    def flip_neighbourhood(self, signs: NDArray, totals: NDArray, fields: NDArray) -> NDArray[np.int64]:
+        """Summed NPAF after flipping each single block: row ``b`` flips block ``b``."""
+        sigma = np.asarray(signs, dtype=np.int64)
+        return totals - 2 * sigma[:, None] * fields
+
+    def pair_flip_neighbourhood(
+        self, signs: NDArray, totals: NDArray, fields: NDArray
+    ) -> Tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.int64]]:
+        """Summed NPAF after flipping each pair ``b < c`` of blocks, with the pair indices.
+
+        Flipping both blocks changes every term touching either one except
+        their own coupling, which the two single-flip updates each negate.
+        """
+        sigma = np.asarray(signs, dtype=np.int64)
+        first, second = np.triu_indices(self.num_blocks, k=1)
+        step = 2 * sigma[:, None] * fields
+        rows = (totals - step[first] - step[second]
+                + 4 * (sigma[first] * sigma[second])[:, None] * self.coupling[first, second])
+        return rows, first, second
+
+
+def sign_problem_from_tiles(tiles: Sequence[NDArray[np.int8]]) -> SignProblem:
+    """Build the quadratic form for unsigned ``(4, len)`` tiles laid end to end."""
+    lengths = np.array([tile.shape[1] for tile in tiles], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    total = int(offsets[-1])
+    num_blocks = len(tiles)
+    wide = [tile.astype(np.int64) for tile in tiles]
+    constant = np.zeros(max(total - 1, 0), dtype=np.int64)
+    coupling = np.zeros((num_blocks, num_blocks, max(total - 1, 0)), dtype=np.int64)
+    for b, tile_b in enumerate(wide):
+        len_b = tile_b.shape[1]
+        for s in range(1, len_b):
+            constant[s - 1] += int(np.sum(tile_b[:, :-s] * tile_b[:, s:]))
+        for c in range(b + 1, num_blocks):
+            tile_c = wide[c]
+            corr = sum(np.correlate(tile_c[row], tile_b[row], mode="full") for row in range(4))
+            # corr[k] pairs block b entry i with block c entry i + k - (len_b - 1).
+            first_shift = int(offsets[c] - offsets[b]) - (len_b - 1)
+            coupling[b, c, first_shift - 1:first_shift - 1 + corr.size] = corr
+            coupling[c, b] = coupling[b, c]
+    return SignProblem(coupling.astype(np.int32), constant.astype(np.int32), offsets)
+
+
+def sign_problem_from_plan(plan: PlanType | CompiledPlan) -> Tuple[SignProblem, NDArray[np.int8]]:
+    """Quadratic form over a plan's block signs, plus the plan's current signs.
+
+    The couplings are scattered from the plan's cached correlation-table
+    layout, which holds exactly the non-zero block-pair terms, so no tile is
+    correlated here.
+    """
+    compiled = plan if isinstance(plan, CompiledPlan) else compile_plan(plan)
+    layout = correlation_tables(compiled.table).layout(compiled.pattern_ids, compiled.seq_ids)
+    num_blocks = compiled.num_blocks
+    coupling = np.zeros((num_blocks, num_blocks, layout.constant.size), dtype=np.int32)
+    first, second = layout.first[layout.pair], layout.second[layout.pair]
+    coupling[first, second, layout.positions] = layout.values
+    coupling[second, first, layout.positions] = layout.values
+    problem = SignProblem(coupling, layout.constant.astype(np.int32), compiled.offsets.copy())
+    return problem, compiled.signs.copy()
+
+
+def sign_problem_from_layout(layout: Construction2Layout) -> SignProblem:
+    """Quadratic form over the per-block signs of a Construction 2 layout."""
+    return sign_problem_from_tiles(layout.block_tiles())
+
+
+__all__ = [
+    "SignProblem",
+    "sign_problem_from_tiles",
+    "sign_problem_from_plan",
+    "sign_problem_from_layout",
+]
@@ -0,0 +1,159 @@
+"""Replica-exchange (parallel tempering) search over block signs.
+
+K replicas of the sign vector run Metropolis single-block flips at fixed,
+geometrically spaced temperatures. All replicas live in one ``(K, B)`` array
+and are advanced together: each keeps its summed NPAF and its local fields
+(see ``SignProblem.local_fields``), so scoring a proposed flip is one
+vectorized update rather than a rebuild of the sequences. Every few steps,
+neighbouring temperatures exchange replicas with the usual acceptance rule,
+which lets good states found hot drift down to the cold end instead of
+being discarded by a restart.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .compiled_plan import CompiledPlan, compile_plan
+from .construction import ConstructionResult, PlanType, diagnostics_from_sum_series
+from .sign_problem import SignProblem, sign_problem_from_plan
+
+ENERGIES = ("squares", "lexicographic")
+
+# Default (t_min, t_max) per energy. The squares ladder was tuned on random
+# starts of the 44-block plan, where it solves far more runs per evaluation
+# than restarting ``simulated_annealing_search``.
+DEFAULT_LADDERS = {"squares": (30.0, 3000.0), "lexicographic": (1.0, 2000.0)}
+
+
+def batch_energy(totals: NDArray[np.int64], energy: str = "squares") -> NDArray[np.int64]:
+    """Energy of each row of summed NPAF values.
+
+    ``squares`` is the sum of squared deviations; ``lexicographic`` is the
+    ``1000 * nonzero + max`` score used by ``simulated_annealing_search``.
+    """
+    if energy == "squares":
+        return np.einsum("ks,ks->k", totals, totals)
+    if energy == "lexicographic":
+        return 1000 * np.count_nonzero(totals, axis=-1) + np.abs(totals).max(axis=-1, initial=0)
+    raise ValueError(f"Unknown energy {energy!r}; expected one of {ENERGIES}.")
+
+
+def temperature_ladder(num_replicas: int, t_min: float, t_max: float) -> NDArray[np.float64]:
+    """Geometric temperatures from ``t_min`` (coldest) to ``t_max``."""
+    if num_replicas == 1:
+        return np.array([float(t_min)])
+    return np.geomspace(t_min, t_max, num_replicas)
+
+
+def parallel_tempering(
+    problem: SignProblem,
+    num_replicas: int = 16,
+    max_steps: int = 20000,
+    energy: str = "squares",
+    t_min: Optional[float] = None,
+    t_max: Optional[float] = None,
+    swap_every: int = 10,
+    initial_signs: Optional[Sequence[int] | NDArray] = None,
+    random_seed: Optional[int] = None,
+) -> Dict[str, object]:
+    """
+    Run ``num_replicas`` Metropolis chains with replica exchange until a zero is found.
+
+    Each step proposes one random block flip in every replica; ``swap_every``
+    steps, adjacent temperatures try to exchange replicas (alternating even
+    and odd pairs). Unset temperatures come from ``DEFAULT_LADDERS[energy]``.
+    Replicas start from ``initial_signs`` when given, otherwise at random.
+
+    Returns the best sign vector seen, its summed NPAF and diagnostics,
+    whether it is a zero-NPAF solution, the number of steps taken, the
+    number of flip evaluations (steps times replicas) and the swap
+    acceptance rate.
+    """
+    if energy not in ENERGIES:
+        raise ValueError(f"Unknown energy {energy!r}; expected one of {ENERGIES}.")
+    default_min, default_max = DEFAULT_LADDERS[energy]
+    t_min = default_min if t_min is None else t_min
+    t_max = default_max if t_max is None else t_max
+    rng = np.random.default_rng(random_seed)
+    num_blocks = problem.num_blocks
+    coupling = problem.coupling.astype(np.int64)
+
+    if initial_signs is None:
+        signs = rng.choice(np.array([-1, 1], dtype=np.int8), size=(num_replicas, num_blocks))
+    else:
+        signs = np.tile(np.asarray(initial_signs, dtype=np.int8), (num_replicas, 1))
+    totals = problem.evaluate_batch(signs)
+    fields = np.tensordot(signs.astype(np.int64), coupling, axes=([1], [1]))
+    energies = batch_energy(totals, energy)
+    # betas[k] is the inverse temperature replica k currently runs at.
+    betas = 1.0 / temperature_ladder(num_replicas, t_min, t_max)
+    replicas = np.arange(num_replicas)
+
+    best = int(np.argmin(energies))
+    best_signs, best_totals, best_energy = signs[best].copy(), totals[best].copy(), int(energies[best])
+    swaps_tried = swaps_accepted = 0
+    steps = 0
+
+    while steps < max_steps and best_totals.any():
+        steps += 1
+        blocks = rng.integers(num_blocks, size=num_replicas)
+        old = signs[replicas, blocks].astype(np.int64)
+        proposed = totals - 2 * old[:, None] * fields[replicas, blocks]
+        proposed_energies = batch_energy(proposed, energy)
+        delta = (proposed_energies - energies).astype(np.float64)
+        accept = (delta <= 0) | (rng.random(num_replicas) < np.exp(-np.clip(delta * betas, 0, 700)))
+        moved = np.flatnonzero(accept)
+        if moved.size:
+            totals[moved] = proposed[moved]
+            energies[moved] = proposed_energies[moved]
+            signs[moved, blocks[moved]] *= -1
+            fields[moved] -= 2 * old[moved, None, None] * coupling[blocks[moved]]
+            leader = moved[np.argmin(energies[moved])]
+            if energies[leader] < best_energy:
+                best_signs, best_totals = signs[leader].copy(), totals[leader].copy()
+                best_energy = int(energies[leader])
+
+        if num_replicas > 1 and steps % swap_every == 0:
+            # Replicas ordered from coldest to hottest; try pairs (0,1),(2,3),.. then (1,2),(3,4),..
+            ladder = np.argsort(-betas)
+            first = (steps // swap_every) % 2
+            cold, hot = ladder[first:-1:2], ladder[first + 1::2]
+            cold, hot = cold[:hot.size], hot[:cold.size]
+            log_ratio = (betas[cold] - betas[hot]) * (energies[cold] - energies[hot])
+            swap = (log_ratio >= 0) | (rng.random(cold.size) < np.exp(np.minimum(log_ratio, 0)))
+            swaps_tried += cold.size
+            swaps_accepted += int(swap.sum())
+            betas[cold[swap]], betas[hot[swap]] = betas[hot[swap]], betas[cold[swap]]
+
+    return {
+        'signs': best_signs,
+        'sum_series': best_totals,
+        'diagnostics': diagnostics_from_sum_series(best_totals),
+        'energy': best_energy,
+        'solved': not best_totals.any(),
+        'steps': steps,
+        'evaluations': steps * num_replicas,
+        'swap_rate': swaps_accepted / swaps_tried if swaps_tried else 0.0,
+    }
+
+
+def tempering_search(plan: PlanType | CompiledPlan, **options: object) -> Dict[str, object]:
+    """``parallel_tempering`` over a plan's block signs, returned in the plan-search result shape."""
+    compiled = plan if isinstance(plan, CompiledPlan) else compile_plan(plan)
+    problem, _ = sign_problem_from_plan(compiled)
+    result = parallel_tempering(problem, **options)
+    best = compiled.copy()
+    best.signs[:] = result['signs']
+    return {
+        'plan': best.to_plan(),
+        'sequences': ConstructionResult(*best.expand()).as_tuple(),
+        'diagnostics': result['diagnostics'],
+        'iterations': result['steps'],
+        'tempering': result,
+    }
+
+
+__all__ = ['ENERGIES', 'DEFAULT_LADDERS', 'batch_energy', 'temperature_ladder', 'parallel_tempering', 'tempering_search']
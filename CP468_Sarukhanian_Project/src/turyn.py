@@ -0,0 +1,179 @@
+"""Enumeration of Turyn-type base sequence quadruples.
+
+The Proposition 1 builder consumes quadruples (A, B, C, D) with lengths
+(n, n, n-1, n-1) whose NPAFs sum to zero at every nonzero shift. Each
+solution has a large orbit under the operations that preserve that
+property: negating or reversing any one sequence, alternating the signs of
+all four at once, and swapping A with B or C with D.
+
+The search splits the quadruple into the (A, B) and (C, D) pairs. Negation
+is fixed by starting every sequence with +1 and swapping by keeping each
+pair ordered. A pair survives only if its power spectral density stays
+below the 4n - 2 total and every partial NPAF sum can still be cancelled
+by the other pair. Surviving pairs are matched on a linear hash of their
+NPAF vectors, and only the canonical (lexicographically smallest) member
+of each orbit is yielded.
+"""
+from __future__ import annotations
+
+from typing import Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .sequences import TurynQuadruple, validate_turyn
+
+_HASH_WEIGHTS_SEED = 0x7E57
+
+
+def _normalized(seq: Sequence[int]) -> Tuple[int, ...]:
+    return tuple(seq) if seq[0] == 1 else tuple(-v for v in seq)
+
+
+def _canonical_key(seqs: Sequence[Sequence[int]]) -> Tuple[Tuple[int, ...], ...]:
+    a, b, c, d = (list(seq) for seq in seqs)
+    best = None
+    for alternate in (False, True):
+        if alternate:
+            a, b, c, d = ([v if i % 2 == 0 else -v for i, v in enumerate(seq)] for seq in (a, b, c, d))
+        forms = [(_normalized(seq), _normalized(seq[::-1])) for seq in (a, b, c, d)]
+        pair_ab = sorted(min(pair) for pair in (forms[0], forms[1]))
+        pair_cd = sorted(min(pair) for pair in (forms[2], forms[3]))
+        key = (pair_ab[0], pair_ab[1], pair_cd[0], pair_cd[1])
+        if best is None or key < best:
+            best = key
+    return best  # type: ignore[return-value]
+
+
+def canonical_form(turyn: TurynQuadruple) -> TurynQuadruple:
+    """Return the canonical representative of a quadruple's equivalence class."""
+    validate_turyn(turyn)
+    key = _canonical_key([np.asarray(seq).tolist() for seq in turyn])
+    return tuple(np.array(seq, dtype=np.int8) for seq in key)  # type: ignore[return-value]
+
+
+def is_turyn(turyn: TurynQuadruple) -> bool:
+    """True when the quadruple's NPAFs sum to zero at every nonzero shift."""
+    n = validate_turyn(turyn)
+    total = np.zeros(n - 1, dtype=np.int64)
+    for seq in turyn:
+        naf = _naf_rows(np.asarray(seq, dtype=np.int8)[None, :])[0]
+        total[:naf.size] += naf
+    return not total.any()
+
+
+def _normalized_sequences(length: int) -> NDArray[np.int8]:
+    """All ±1 sequences of *length* starting with +1, in lexicographic order."""
+    if length == 1:
+        return np.ones((1, 1), dtype=np.int8)
+    codes = np.arange(1 << (length - 1), dtype=np.int64)[:, None]
+    bits = (codes >> np.arange(length - 2, -1, -1)) & 1
+    rows = np.ones((codes.shape[0], length), dtype=np.int8)
+    rows[:, 1:] = 2 * bits.astype(np.int8) - 1
+    return rows
+
+
+def _naf_rows(rows: NDArray[np.int8]) -> NDArray[np.int64]:
+    wide = rows.astype(np.int64)
+    length = wide.shape[1]
+    out = np.zeros((wide.shape[0], max(length - 1, 0)), dtype=np.int64)
+    for s in range(1, length):
+        out[:, s - 1] = np.einsum("ij,ij->i", wide[:, :-s], wide[:, s:])
+    return out
+
+
+def _psd_rows(rows: NDArray[np.int8], size: int) -> NDArray[np.float64]:
+    spectrum = np.fft.rfft(rows.astype(np.float64), size, axis=1)
+    return spectrum.real ** 2 + spectrum.imag ** 2
+
+
+class _PairTable:
+    """Ordered pairs of equal-length sequences that pass the pair-level filters."""
+
+    def __init__(self, length: int, n: int, psd_size: int, other_cap: NDArray[np.int64]) -> None:
+        self.rows = _normalized_sequences(length)
+        naf = np.zeros((self.rows.shape[0], n - 1), dtype=np.int64)
+        naf[:, :length - 1] = _naf_rows(self.rows)
+        psd = _psd_rows(self.rows, psd_size)
+        limit = 4 * n - 2 + 1e-6
+        keep = np.all(psd <= limit, axis=1)
+        self.rows, self.naf, self.psd = self.rows[keep], naf[keep], psd[keep]
+        weights = np.random.default_rng(_HASH_WEIGHTS_SEED).integers(
+            -(1 << 62), 1 << 62, size=n - 1, dtype=np.int64
+        )
+        with np.errstate(over="ignore"):
+            self.hashes = self.naf @ weights
+        self.limit = limit
+        self.other_cap = other_cap
+
+    def pairs_for(self, i: int) -> NDArray[np.int64]:
+        """Indices j >= i whose pair (i, j) passes the spectral and NPAF bounds."""
+        psd_ok = np.all(self.psd[i] + self.psd[i:] <= self.limit, axis=1)
+        naf_ok = np.all(np.abs(self.naf[i] + self.naf[i:]) <= self.other_cap, axis=1)
+        return np.nonzero(psd_ok & naf_ok)[0] + i
+
+    def all_pairs(self) -> Tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.int64]]:
+        firsts, seconds = [], []
+        for i in range(self.rows.shape[0]):
+            js = self.pairs_for(i)
+            firsts.append(np.full(js.size, i, dtype=np.int64))
+            seconds.append(js)
+        first = np.concatenate(firsts) if firsts else np.zeros(0, dtype=np.int64)
+        second = np.concatenate(seconds) if seconds else np.zeros(0, dtype=np.int64)
+        with np.errstate(over="ignore"):
+            hashes = self.hashes[first] + self.hashes[second]
+        return first, second, hashes
+
+
+def enumerate_turyn(n: int, limit: Optional[int] = None) -> Iterator[TurynQuadruple]:
+    """Yield one canonical quadruple of lengths (n, n, n-1, n-1) per equivalence class.
+
+    The (C, D) table is built up front; (A, B) pairs are then streamed one
+    first sequence at a time, so the generator can be abandoned early or
+    capped with ``limit``.
+    """
+    if n < 2:
+        raise ValueError("Turyn quadruples need n >= 2.")
+    shifts = np.arange(1, n)
+    psd_size = max(64, 1 << (4 * n).bit_length())
+    # |NAF_C(s) + NAF_D(s)| <= 2(n-1-s) and |NAF_A(s) + NAF_B(s)| <= 2(n-s).
+    ab = _PairTable(n, n, psd_size, np.maximum(2 * (n - 1 - shifts), 0))
+    cd = _PairTable(n - 1, n, psd_size, 2 * (n - shifts))
+    cd_first, cd_second, cd_hashes = cd.all_pairs()
+    order = np.argsort(cd_hashes, kind="stable")
+    cd_first, cd_second, cd_hashes = cd_first[order], cd_second[order], cd_hashes[order]
+    found = 0
+    for i in range(ab.rows.shape[0]):
+        js = ab.pairs_for(i)
+        if not js.size:
+            continue
+        with np.errstate(over="ignore"):
+            targets = -(ab.hashes[i] + ab.hashes[js])
+        lo = np.searchsorted(cd_hashes, targets, side="left")
+        hi = np.searchsorted(cd_hashes, targets, side="right")
+        for j, start, stop in zip(js, lo, hi):
+            for match in range(start, stop):
+                c_idx, d_idx = cd_first[match], cd_second[match]
+                if np.any(ab.naf[i] + ab.naf[j] + cd.naf[c_idx] + cd.naf[d_idx]):
+                    continue  # hash collision
+                seqs = [ab.rows[i], ab.rows[j], cd.rows[c_idx], cd.rows[d_idx]]
+                lists = [seq.tolist() for seq in seqs]
+                if _canonical_key(lists) != tuple(tuple(seq) for seq in lists):
+                    continue
+                yield tuple(seq.copy() for seq in seqs)  # type: ignore[misc]
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+
+
+def first_turyn(n: int) -> Optional[TurynQuadruple]:
+    """Return the first canonical quadruple of order *n*, or ``None`` if none exist."""
+    return next(enumerate_turyn(n, limit=1), None)
+
+
+__all__ = [
+    "canonical_form",
+    "is_turyn",
+    "enumerate_turyn",
+    "first_turyn",
+]
@@ -1,62 +1,289 @@
-"""Plotting helpers for Sarukhanian experiments."""
+"""Plotting helpers for Sarukhanian experiments.
+
+matplotlib is imported on the first plot rather than with this module,
+and figure directories are created only when a figure is saved into them.
+Figures are drawn on the Agg canvas directly (no pyplot state), so every
+helper works headless and inside worker processes.
+
+The batch helpers take many items at once: summed-NPAF series
+(``kind="sum"``), single ±1 sequences (``"sequence"``) or ``(4, n)``
+quadruples (``"quadruple"``), the latter two scored with the
+:mod:`src.npaf` kernels. ``render_pdf`` writes one multi-page PDF,
+``plot_heatmap_grid`` one heatmap with a row per item, and
+``render_batch`` one image per item, optionally over worker processes.
+Batch renderers reuse a single figure and only swap the plotted data.
+"""
 from __future__ import annotations
 
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional, Sequence
 
-import matplotlib.pyplot as plt
 import numpy as np
 from numpy.typing import NDArray
 
+from .npaf import npaf_all_shifts, npaf_sum_four, npaf_sum_four_batch
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
 REPORT_FIG_DIR = Path(__file__).resolve().parents[1] / "report" / "figures"
-REPORT_FIG_DIR.mkdir(parents=True, exist_ok=True)
+SERIES_KINDS = ("sum", "sequence", "quadruple")
+BATCH_DPI = 100
+
+
+def _figure(figsize: tuple) -> "Figure":
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _prepare_path(path: Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _save_figure(fig: "Figure", path: Path, dpi: int = 200) -> Path:
+    path = _prepare_path(path)
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi)
+    return path
+
+
+def _fix_layout(fig: "Figure") -> None:
+    """Lay a reused figure out once; a kept layout engine would redo it on every save."""
+    fig.tight_layout()
+    fig.set_layout_engine("none")
+
+
+def _slug(title: str) -> str:
+    slug = title.lower().replace(" ", "_")
+    for sep in {"/", "\\", os.sep, os.altsep} - {None}:
+        slug = slug.replace(sep, "_")
+    return slug.lstrip(".") or "figure"
 
 
 def _default_save_path(basename: str, ext: str = "png") -> Path:
-    slug = basename.lower().replace(" ", "_")
     timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
-    return REPORT_FIG_DIR / f"{slug}_{timestamp}.{ext}"
+    return REPORT_FIG_DIR / f"{_slug(basename)}_{timestamp}.{ext}"
 
 
-def plot_npaf_series(a: NDArray[np.int8], title: str, save_path: Optional[Path] = None) -> Path:
-    """Plot the NPAF(a,s) curve for s>=1 and save it."""
-    n = a.size
-    shifts = np.arange(1, n)
-    values = np.empty_like(shifts, dtype=np.int32)
-    for idx, shift in enumerate(shifts):
-        values[idx] = int(np.dot(a[:-shift], a[shift:]))
-    fig, ax = plt.subplots(figsize=(8, 3))
-    ax.plot(shifts, values, marker="o", linestyle="-", linewidth=1)
+def _style_axes(ax, ylabel: str) -> None:
     ax.set_xlabel("Shift s")
-    ax.set_ylabel("NPAF")
-    ax.set_title(title)
+    ax.set_ylabel(ylabel)
     ax.axhline(0, color="black", linewidth=0.8)
     ax.grid(True, linewidth=0.4, linestyle=":")
-    path = save_path or _default_save_path(title)
-    fig.tight_layout()
-    fig.savefig(path, dpi=200)
-    plt.close(fig)
-    return path
+
+
+def _npaf_values(a: NDArray) -> NDArray:
+    """NPAF for shifts 1..n-1; ±1 sequences use the :mod:`src.npaf` kernel, other numbers ``np.correlate``."""
+    a = np.asarray(a)
+    if a.ndim == 1 and np.issubdtype(a.dtype, np.integer) and np.all(np.abs(a) == 1):
+        return npaf_all_shifts(a)
+    if a.size <= 1:
+        return np.zeros(0, dtype=np.int32)
+    if np.issubdtype(a.dtype, np.integer) or a.dtype == np.bool_:
+        a = a.astype(np.int64)
+    return np.correlate(a, a, mode="full")[a.size:]
+
+
+def plot_npaf_series(a: NDArray[np.int8], title: str, save_path: Optional[Path] = None) -> Path:
+    """Plot the NPAF(a,s) curve for s>=1 and save it.
+
+    ``a`` may hold any real numbers (e.g. 0/±1 or weighted sequences), not just ±1.
+    """
+    values = _npaf_values(a)
+    fig = _figure((8, 3))
+    ax = fig.subplots()
+    ax.plot(np.arange(1, values.size + 1), values, marker="o", linestyle="-", linewidth=1)
+    ax.set_title(title)
+    _style_axes(ax, "NPAF")
+    return _save_figure(fig, save_path or _default_save_path(title))
 
 
 def plot_sum_series(sum_series: NDArray[np.int32], title: str, save_path: Optional[Path] = None) -> Path:
     """Plot the sum of four NPAFs across shifts."""
     shifts = np.arange(1, sum_series.size + 1)
-    fig, ax = plt.subplots(figsize=(8, 3))
+    fig = _figure((8, 3))
+    ax = fig.subplots()
     markerline, stemlines, baseline = ax.stem(shifts, sum_series)
-    plt.setp(stemlines, linewidth=1.5)
-    plt.setp(markerline, markersize=4)
-    ax.set_xlabel("Shift s")
-    ax.set_ylabel("Σ NPAF")
+    stemlines.set_linewidth(1.5)
+    markerline.set_markersize(4)
     ax.set_title(title)
-    ax.axhline(0, color="black", linewidth=0.8)
-    ax.grid(True, linewidth=0.4, linestyle=":")
-    path = save_path or _default_save_path(title)
-    fig.tight_layout()
-    fig.savefig(path, dpi=200)
-    plt.close(fig)
-    return path
+    _style_axes(ax, "Σ NPAF")
+    return _save_figure(fig, save_path or _default_save_path(title))
+
+
+def series_batch(data: Sequence[NDArray] | NDArray, kind: str = "sum") -> List[NDArray[np.int32]]:
+    """The series plotted for each item of ``data`` (lengths may differ).
+
+    Equal-length quadruples are scored in one ``npaf_sum_four_batch`` call.
+    """
+    if kind not in SERIES_KINDS:
+        raise ValueError(f"Unknown series kind '{kind}', expected one of {SERIES_KINDS}.")
+    items = [np.asarray(item) for item in data]
+    if kind == "sum":
+        return [item.astype(np.int32) for item in items]
+    if kind == "sequence":
+        return [npaf_all_shifts(item) for item in items]
+    if items and len({item.shape for item in items}) == 1:
+        sums, _ = npaf_sum_four_batch(*np.moveaxis(np.stack(items), 1, 0))
+        return list(sums)
+    return [npaf_sum_four(*item) for item in items]
+
+
+def _titles(titles: Optional[Sequence[str]], count: int) -> List[str]:
+    if titles is None:
+        return [f"candidate {index}" for index in range(count)]
+    if len(titles) != count:
+        raise ValueError(f"Expected {count} titles, got {len(titles)}.")
+    return list(titles)
+
+
+def _ylabel(kind: str) -> str:
+    return "NPAF" if kind == "sequence" else "Σ NPAF"
+
+
+def render_pdf(
+    data: Sequence[NDArray] | NDArray,
+    path: Path,
+    kind: str = "sum",
+    titles: Optional[Sequence[str]] = None,
+    per_page: int = 6,
+) -> Path:
+    """Write every item's series to one multi-page PDF, ``per_page`` panels a page."""
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    series = series_batch(data, kind)
+    titles = _titles(titles, len(series))
+    fig = _figure((8, 1.8 * per_page))
+    axes = fig.subplots(per_page, 1, squeeze=False)[:, 0]
+    lines = []
+    for ax in axes:
+        lines.append(ax.plot([], [], marker="o", markersize=2, linewidth=1)[0])
+        _style_axes(ax, _ylabel(kind))
+        ax.set_title(" ", fontsize=9)
+    _fix_layout(fig)
+    with PdfPages(_prepare_path(path)) as pdf:
+        for start in range(0, max(len(series), 1), per_page):
+            for offset, (ax, line) in enumerate(zip(axes, lines)):
+                index = start + offset
+                ax.set_visible(index < len(series))
+                if index < len(series):
+                    line.set_data(np.arange(1, series[index].size + 1), series[index])
+                    ax.set_title(titles[index], fontsize=9)
+                    ax.relim()
+                    ax.autoscale_view()
+            pdf.savefig(fig)
+    return Path(path)
+
+
+def plot_heatmap_grid(
+    data: Sequence[NDArray] | NDArray,
+    kind: str = "sum",
+    titles: Optional[Sequence[str]] = None,
+    save_path: Optional[Path] = None,
+    dpi: int = BATCH_DPI,
+) -> Path:
+    """One heatmap with a row per item and a column per shift (shorter rows padded blank)."""
+    series = series_batch(data, kind)
+    titles = _titles(titles, len(series))
+    width = max((values.size for values in series), default=0)
+    grid = np.full((len(series), max(width, 1)), np.nan)
+    for row, values in enumerate(series):
+        grid[row, :values.size] = values
+    limit = max(float(np.nanmax(np.abs(grid))) if np.isfinite(grid).any() else 0.0, 1.0)
+    fig = _figure((8, min(2 + 0.2 * len(series), 40)))
+    ax = fig.subplots()
+    image = ax.imshow(grid, aspect="auto", interpolation="nearest", cmap="coolwarm", vmin=-limit, vmax=limit,
+                      extent=(0.5, width + 0.5, len(series) - 0.5, -0.5))
+    if len(series) <= 50:
+        ax.set_yticks(range(len(series)), titles, fontsize=6)
+    ax.set_xlabel("Shift s")
+    fig.colorbar(image, ax=ax, label=_ylabel(kind))
+    return _save_figure(fig, save_path or _default_save_path(f"{kind} heatmap"), dpi=dpi)
+
+
+def _render_files(series: List[NDArray[np.int32]], titles: List[str], paths: List[Path], ylabel: str,
+                  dpi: int) -> List[Path]:
+    fig = _figure((8, 3))
+    ax = fig.subplots()
+    line = ax.plot([], [], marker="o", markersize=3, linewidth=1)[0]
+    _style_axes(ax, ylabel)
+    ax.set_title(" ")
+    _fix_layout(fig)
+    for values, title, path in zip(series, titles, paths):
+        line.set_data(np.arange(1, values.size + 1), values)
+        ax.set_title(title)
+        ax.relim()
+        ax.autoscale_view()
+        fig.savefig(_prepare_path(path), dpi=dpi)
+    return paths
+
+
+def _batch_paths(out_dir: Path, titles: List[str], fmt: str) -> List[Path]:
+    """One file per title inside ``out_dir``; repeated slugs get an ``_<index>`` suffix."""
+    names: List[str] = []
+    taken = set()
+    for index, title in enumerate(titles):
+        name = _slug(title)
+        if name in taken:
+            name = f"{name}_{index}"
+            while name in taken:
+                name += "_"
+        taken.add(name)
+        names.append(name)
+    return [Path(out_dir) / f"{name}.{fmt}" for name in names]
+
+
+def render_batch(
+    data: Sequence[NDArray] | NDArray,
+    out_dir: Path,
+    kind: str = "sum",
+    titles: Optional[Sequence[str]] = None,
+    fmt: str = "png",
+    dpi: int = BATCH_DPI,
+    workers: Optional[int] = None,
+) -> List[Path]:
+    """Save one plot per item as ``out_dir/<title>.<fmt>``; returns the paths in input order.
+
+    Titles are slugged with path separators replaced, so every file lands
+    directly in ``out_dir``; a title whose slug repeats an earlier one gets
+    its item index appended instead of overwriting that file.
+
+    ``workers`` > 1 splits the items into contiguous chunks rendered by a
+    process pool (``0`` means one per CPU); each worker reuses one figure.
+    """
+    series = series_batch(data, kind)
+    titles = _titles(titles, len(series))
+    paths = _batch_paths(out_dir, titles, fmt)
+    workers = (os.cpu_count() or 1) if workers == 0 else (workers or 1)
+    workers = min(workers, max(len(series), 1))
+    if workers == 1:
+        return _render_files(series, titles, paths, _ylabel(kind), dpi)
+    bounds = np.linspace(0, len(series), workers + 1).astype(int)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context()) as pool:
+        futures = [
+            pool.submit(_render_files, series[lo:hi], titles[lo:hi], paths[lo:hi], _ylabel(kind), dpi)
+            for lo, hi in zip(bounds[:-1], bounds[1:])
+        ]
+        return [path for future in futures for path in future.result()]
 
 
-__all__ = ["plot_npaf_series", "plot_sum_series", "REPORT_FIG_DIR"]
+__all__ = [
+    "plot_npaf_series",
+    "plot_sum_series",
+    "series_batch",
+    "render_pdf",
+    "plot_heatmap_grid",
+    "render_batch",
+    "REPORT_FIG_DIR",
+    "SERIES_KINDS",
+]
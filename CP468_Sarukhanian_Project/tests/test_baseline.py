@@ -1,4 +1,10 @@
-from src.construction import build_sarukhanian_110, verify_four_sequences
+from src.construction import (
+    build_sarukhanian_110,
+    get_default_plan,
+    plan_to_sequences,
+    plan_total_length,
+    verify_four_sequences,
+)
 
 
 def test_baseline_length_and_bug():
@@ -7,3 +13,14 @@ def test_baseline_length_and_bug():
     diag = verify_four_sequences(x, y, z, w)
     assert diag["num_nonzero_shifts"] == 0
     assert diag["max_abs_deviation"] == 0
+
+
+def test_unchecked_expansion_matches_checked():
+    plan = get_default_plan()
+    checked = plan_to_sequences(plan).as_tuple()
+    trusted = plan_to_sequences(plan, unchecked=True)
+    assert trusted.x.base is trusted.w.base
+    for expected, actual in zip(checked, trusted.as_tuple()):
+        assert expected.dtype == actual.dtype
+        assert expected.tolist() == actual.tolist()
+    assert plan_total_length(plan) == 110
@@ -0,0 +1,39 @@
+import json
+
+from benchmarks.run import Comparison, discover, load_baselines, main, save_baselines, time_benchmark
+
+
+def test_discovery_covers_each_area_and_params():
+    names = [benchmark.name for benchmark in discover()]
+    assert len(names) == len(set(names))
+    for prefix in ("bench_npaf", "bench_plan", "bench_search", "bench_construction2"):
+        assert any(name.startswith(prefix) for name in names)
+    lengths = [name for name in names if ".time_npaf_all_shifts(" in name]
+    assert lengths[0].endswith("(10)") and lengths[-1].endswith("(100000)")
+
+
+def test_every_benchmark_runs_once():
+    for benchmark in discover():
+        assert time_benchmark(benchmark, quick=True) >= 0.0
+
+
+def test_regression_threshold_and_baseline_roundtrip(tmp_path):
+    assert Comparison("a", 1.0, 1.4).regressed(0.5) is False
+    assert Comparison("a", 1.0, 1.6).regressed(0.5) is True
+    assert Comparison("a", None, 9.0).regressed(0.5) is False
+
+    path = tmp_path / "baselines.json"
+    save_baselines({"x": 2.0}, path)
+    save_baselines({"y": 3.0}, path)
+    assert load_baselines(path) == {"x": 2.0, "y": 3.0}
+    assert "numpy" in json.loads(path.read_text())["machine"]
+
+
+def test_main_flags_regressions(tmp_path, capsys):
+    path = tmp_path / "baselines.json"
+    name = "bench_plan.DefaultPlan.time_compiled_expand"
+    save_baselines({name: 1e-12}, path)
+    assert main(["--filter", name, "--baseline", str(path), "--repeat", "1", "--recheck", "0"]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
+    save_baselines({name: 10.0}, path)
+    assert main(["--filter", name, "--baseline", str(path), "--repeat", "1"]) == 0
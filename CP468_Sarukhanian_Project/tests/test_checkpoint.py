@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from src.checkpoint import Checkpointer, load_checkpoint, save_checkpoint
+from src.construction import get_default_plan
+from src.exhaustive_search import simulated_annealing_search
+from src.greedy_search import multi_start_greedy
+from src.repair import apply_sign_flip, auto_local_search
+
+
+def _scrambled_plan():
+    return apply_sign_flip(get_default_plan(), [0, 5, 9, 17, 30, 41])
+
+
+def _score(result):
+    diag = result["diagnostics"]
+    return diag["num_nonzero_shifts"], diag["max_abs_deviation"]
+
+
+def test_roundtrip_and_kind_check(tmp_path):
+    path = save_checkpoint(tmp_path / "run.ckpt", "search", {"step": 3, "signs": [1, -1]})
+    assert load_checkpoint(path, "search") == {"step": 3, "signs": [1, -1]}
+    assert [p.name for p in tmp_path.iterdir()] == ["run.ckpt"]
+    with pytest.raises(ValueError):
+        load_checkpoint(path, "other")
+
+
+def test_checkpointer_interval(tmp_path):
+    writer = Checkpointer(tmp_path / "every.ckpt", "search", every=5)
+    writer.maybe_save(4, lambda: {"step": 4})
+    assert not (tmp_path / "every.ckpt").exists()
+    writer.maybe_save(10, lambda: {"step": 10})
+    assert load_checkpoint(tmp_path / "every.ckpt", "search") == {"step": 10}
+
+
+def test_auto_local_search_resume_matches_full_run(tmp_path):
+    path = tmp_path / "local.ckpt"
+    full = auto_local_search(_scrambled_plan(), max_steps=80, random_seed=4)
+    auto_local_search(_scrambled_plan(), max_steps=30, random_seed=4, checkpoint_path=path)
+    resumed = auto_local_search(get_default_plan(), max_steps=80, resume_from=path)
+    assert resumed["plan"] == full["plan"]
+    assert _score(resumed) == _score(full)
+
+
+def test_annealing_resume_matches_full_run(tmp_path):
+    path = tmp_path / "sa.ckpt"
+    full = simulated_annealing_search(_scrambled_plan(), max_iterations=600, random_seed=8)
+    simulated_annealing_search(_scrambled_plan(), max_iterations=250, random_seed=8,
+                               checkpoint_path=path, checkpoint_every=100)
+    assert load_checkpoint(path, "simulated_annealing_search")["iteration"] == 250
+    resumed = simulated_annealing_search(None, max_iterations=600, resume_from=path)
+    assert resumed["plan"] == full["plan"]
+    assert _score(resumed) == _score(full)
+    for left, right in zip(resumed["sequences"], full["sequences"]):
+        np.testing.assert_array_equal(left, right)
+
+
+def test_multi_start_greedy_resume_matches_full_run(tmp_path):
+    path = tmp_path / "greedy.ckpt"
+    full = multi_start_greedy(get_default_plan(), num_starts=2, random_seed=1)
+    multi_start_greedy(get_default_plan(), num_starts=1, random_seed=1, checkpoint_path=path)
+    resumed = multi_start_greedy(get_default_plan(), num_starts=2, resume_from=path)
+    assert resumed["plan"] == full["plan"]
+    assert _score(resumed) == _score(full)
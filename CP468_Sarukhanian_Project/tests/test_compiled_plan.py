@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from src.compiled_plan import build_block_table, compile_plan
+from src.construction import get_default_plan, plan_to_sequences
+from src.repair import apply_sign_flip, swap_blocks
+from src.sequences import BASE_SEQUENCES, make_sequence_table
+
+
+def test_compiled_plan_round_trips_and_expands():
+    plan = get_default_plan()
+    compiled = compile_plan(plan)
+    assert compiled.to_plan() == plan
+    assert compiled.total_length == 110
+    expected = np.stack(plan_to_sequences(plan).as_tuple())
+    np.testing.assert_array_equal(compiled.expand(), expected)
+
+
+def test_compiled_plan_mutations_match_dict_helpers():
+    plan = get_default_plan()
+    compiled = compile_plan(plan)
+    mutated = compiled.copy()
+    mutated.swap(0, 1)
+    mutated.flip(3)
+    expected_plan = apply_sign_flip(swap_blocks(plan, 0, 1), 3)
+    assert mutated.to_plan() == expected_plan
+    np.testing.assert_array_equal(mutated.expand(), np.stack(plan_to_sequences(expected_plan).as_tuple()))
+    assert compiled.to_plan() == plan
+
+
+def test_compile_plan_rejects_bad_blocks():
+    with pytest.raises(KeyError):
+        compile_plan([{"pattern": "q", "seq": "A", "sign": 1}])
+    with pytest.raises(ValueError):
+        compile_plan([{"pattern": "x", "seq": "A", "sign": 2}])
+
+
+def test_with_table_does_not_share_block_arrays():
+    compiled = compile_plan(get_default_plan())
+    turyn = tuple(BASE_SEQUENCES[name] for name in "ABCD")
+    other = compiled.with_table(build_block_table(make_sequence_table(turyn)))
+    other.flip(0)
+    other.swap(1, 2)
+    assert compiled.to_plan() == get_default_plan()
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from src.construction2 import build_construction2, construction2_layout, construction2_length
+from src.golay import golay_pair
+from src.sequences import BASE_SEQUENCES
+
+TURYN_N3 = tuple(BASE_SEQUENCES[name] for name in "ABCD")
+
+
+def test_layout_shape_and_blocks():
+    for k in (1, 2, 4):
+        layout = construction2_layout(TURYN_N3, golay_pair(k, cache_dir=None))
+        assert layout.num_blocks == 8 * k + 4
+        assert layout.length == construction2_length(3, k) == 10 * (2 * k + 1)
+        assert set(np.unique(layout.base)) <= {-1, 1}
+
+
+def test_mixed_blocks_follow_formula():
+    a, b, c, d = TURYN_N3
+    layout = construction2_layout(TURYN_N3, golay_pair(2, cache_dir=None))
+    block2 = layout.block_tiles()[layout.labels.index("2")]
+    np.testing.assert_array_equal(block2, np.stack((a, a, -b, -b)))
+    block7 = layout.block_tiles()[layout.labels.index("7")]
+    np.testing.assert_array_equal(block7, np.stack((d, -d, c, -c)))
+
+
+def test_apply_signs_flips_whole_blocks():
+    golay = golay_pair(2, cache_dir=None)
+    layout = construction2_layout(TURYN_N3, golay)
+    signs = np.ones(layout.num_blocks, dtype=np.int8)
+    signs[[0, 7, 19]] = -1
+    rows = np.stack(build_construction2(TURYN_N3, golay, signs))
+    for idx, (start, stop) in enumerate(zip(layout.offsets[:-1], layout.offsets[1:])):
+        np.testing.assert_array_equal(rows[:, start:stop], signs[idx] * layout.base[:, start:stop])
+    with pytest.raises(ValueError):
+        layout.apply_signs(signs[:-1])
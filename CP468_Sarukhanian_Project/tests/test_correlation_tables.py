@@ -0,0 +1,106 @@
+import numpy as np
+
+import src.correlation_tables as correlation_tables_module
+from src.compiled_plan import build_block_table, compile_plan
+from src.construction import get_default_plan, plan_to_sequences, verify_four_sequences, verify_plan
+from src.correlation_tables import TABLE_CACHE_SIZE, IncrementalPlanScore, correlation_tables, plan_sum_series
+from src.npaf import npaf_sum_four
+from src.sequences import make_sequence_table
+
+N4 = (
+    np.array([1, 1, 1, -1], dtype=np.int8),
+    np.array([1, -1, -1, 1], dtype=np.int8),
+    np.array([1, 1, 1], dtype=np.int8),
+    np.array([1, -1, 1], dtype=np.int8),
+)
+
+
+def _scrambled(compiled, seed):
+    rng = np.random.default_rng(seed)
+    plan = compiled.copy()
+    plan.signs *= rng.choice(np.array([-1, 1], dtype=np.int8), size=plan.num_blocks)
+    for _ in range(4):
+        i, j = rng.choice(plan.num_blocks, 2, replace=False)
+        plan.swap(int(i), int(j))
+    return plan
+
+
+def test_table_scoring_matches_expansion():
+    for sequences in (None, make_sequence_table(N4)):
+        base = compile_plan(get_default_plan(), sequences)
+        tables = correlation_tables(base.table)
+        for seed in range(20):
+            plan = _scrambled(base, seed)
+            np.testing.assert_array_equal(tables.plan_sum_series(plan), npaf_sum_four(*plan.expand()))
+
+
+def test_mixed_patterns_and_lengths():
+    plan = [
+        {"pattern": "x", "seq": "A", "sign": 1},
+        {"pattern": "x", "seq": "C", "sign": -1},
+        {"pattern": "y", "seq": "rB", "sign": 1},
+        {"pattern": "x", "seq": "rD", "sign": 1},
+    ]
+    np.testing.assert_array_equal(plan_sum_series(plan),
+                                  npaf_sum_four(*plan_to_sequences(plan).as_tuple()))
+
+
+def test_tables_and_layouts_are_memoized():
+    compiled = compile_plan(get_default_plan())
+    tables = correlation_tables(compiled.table)
+    assert correlation_tables(compile_plan(get_default_plan()).table) is tables
+    layout = tables.layout(compiled.pattern_ids, compiled.seq_ids)
+    assert tables.layout(compiled.pattern_ids.copy(), compiled.seq_ids.copy()) is layout
+
+
+def test_table_cache_is_bounded_and_keyed_on_lengths():
+    split = [
+        build_block_table({"P": np.array([1, 1, -1], dtype=np.int8), "Q": np.array([1], dtype=np.int8)}),
+        build_block_table({"P": np.array([1, 1], dtype=np.int8), "Q": np.array([-1, 1], dtype=np.int8)}),
+    ]
+    assert split[0].columns.tobytes() == split[1].columns.tobytes()
+    first, second = (correlation_tables(table) for table in split)
+    assert first is not second
+    np.testing.assert_array_equal(second.seq_lengths, [2, 2])
+    rng = np.random.default_rng(7)
+    for _ in range(TABLE_CACHE_SIZE + 3):
+        correlation_tables(build_block_table({"P": rng.choice(np.array([-1, 1], dtype=np.int8), size=9)}))
+    assert len(correlation_tables_module._TABLES) == TABLE_CACHE_SIZE
+
+
+def test_incremental_moves_track_expansion():
+    for sequences in (None, make_sequence_table(N4)):
+        state = IncrementalPlanScore(compile_plan(get_default_plan(), sequences))
+        rng = np.random.default_rng(3)
+        for _ in range(60):
+            before = state.sum_series.copy()
+            if rng.random() < 0.4:
+                idx = int(rng.integers(state.plan.num_blocks))
+                delta = state.flip_delta(idx)
+                np.testing.assert_array_equal(state.sum_series, before)
+                state.apply_flip(idx, delta)
+            else:
+                i, j = (int(v) for v in rng.choice(state.plan.num_blocks, 2, replace=False))
+                state.apply_swap(i, j)
+            np.testing.assert_array_equal(state.sum_series, npaf_sum_four(*state.plan.expand()))
+
+
+def test_swap_delta_covers_unequal_lengths():
+    state = IncrementalPlanScore(compile_plan(get_default_plan()))
+    lengths = state.plan.block_lengths
+    i = 0
+    j = int(np.flatnonzero(lengths != lengths[i])[-1])
+    moved = state.plan.copy()
+    moved.swap(i, j)
+    np.testing.assert_array_equal(state.sum_series + state.swap_delta(i, j), npaf_sum_four(*moved.expand()))
+    assert not state.swap_delta(5, 5).any()
+
+
+def test_verify_plan_matches_verify_four_sequences():
+    plan = get_default_plan()
+    assert verify_plan(plan)["num_nonzero_shifts"] == 0
+    plan[7]["sign"] = -plan[7]["sign"]
+    expected = verify_four_sequences(*plan_to_sequences(plan).as_tuple())
+    got = verify_plan(plan)
+    assert got["nonzero_pairs"] == expected["nonzero_pairs"]
+    np.testing.assert_array_equal(got["sum_series"], expected["sum_series"])
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from src.construction import build_sarukhanian, build_sarukhanian_110, iter_sarukhanian_family
+from src.sequences import BASE_SEQUENCES
+
+N3 = tuple(BASE_SEQUENCES[name] for name in "ABCD")
+N2 = (
+    np.array([1, 1], dtype=np.int8),
+    np.array([1, -1], dtype=np.int8),
+    np.array([1], dtype=np.int8),
+    np.array([1], dtype=np.int8),
+)
+N4 = (
+    np.array([1, 1, 1, -1], dtype=np.int8),
+    np.array([1, -1, -1, 1], dtype=np.int8),
+    np.array([1, 1, 1], dtype=np.int8),
+    np.array([1, -1, 1], dtype=np.int8),
+)
+
+
+def test_build_sarukhanian_matches_110_builder():
+    for expected, actual in zip(build_sarukhanian_110(), build_sarukhanian(N3)):
+        np.testing.assert_array_equal(expected, actual)
+
+
+def test_family_streams_verified_codes():
+    members = list(iter_sarukhanian_family([N2, N3, N4]))
+    assert [member.n for member in members] == [2, 3, 4]
+    for member in members:
+        assert member.result.x.size == 22 * (2 * member.n - 1)
+        assert member.diagnostics["num_nonzero_shifts"] == 0
+
+
+def test_build_sarukhanian_rejects_non_turyn_input():
+    bad = (N4[0], N4[0], N4[2], N4[3])
+    with pytest.raises(ValueError):
+        build_sarukhanian(bad)
+    with pytest.raises(ValueError):
+        build_sarukhanian((N3[0], N3[1], N3[2], N3[2][:1]))
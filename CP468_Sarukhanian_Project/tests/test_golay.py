@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from src import golay
+from src.golay import golay_lengths, golay_pair, is_complementary
+
+
+def test_golay_pairs_are_complementary():
+    for k in golay_lengths(520):
+        f, g = golay_pair(k, cache_dir=None)
+        assert f.size == g.size == k
+        assert f.dtype == np.int8
+        assert is_complementary(f, g)
+
+
+def test_golay_pair_persists_to_disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(golay, "_MEMO", {})
+    f, g = golay_pair(40, cache_dir=tmp_path)
+    assert (tmp_path / "golay_40.npz").exists()
+    monkeypatch.setattr(golay, "_MEMO", {})
+    monkeypatch.setattr(golay, "_build", lambda k: pytest.fail("cache miss"))
+    cached_f, cached_g = golay_pair(40, cache_dir=tmp_path)
+    np.testing.assert_array_equal(cached_f, f)
+    np.testing.assert_array_equal(cached_g, g)
+
+
+def test_golay_pair_rejects_unsupported_length():
+    with pytest.raises(ValueError):
+        golay_pair(3, cache_dir=None)
+
+
+def test_golay_pair_survives_unwritable_and_corrupt_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(golay, "_MEMO", {})
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    f, g = golay_pair(20, cache_dir=blocker / "golay")
+    assert is_complementary(f, g)
+    monkeypatch.setattr(golay, "_MEMO", {})
+    (tmp_path / "golay_20.npz").write_bytes(b"PK\x03\x04 truncated")
+    f, g = golay_pair(20, cache_dir=tmp_path)
+    assert is_complementary(f, g)
+    monkeypatch.setattr(golay, "_MEMO", {})
+    monkeypatch.setattr(golay, "_build", lambda k: pytest.fail("corrupt file was not replaced"))
+    np.testing.assert_array_equal(golay_pair(20, cache_dir=tmp_path)[0], f)
+
+
+def test_default_cache_dir_stays_out_of_the_source_tree(monkeypatch, tmp_path):
+    monkeypatch.setenv(golay.GOLAY_CACHE_ENV, str(tmp_path))
+    assert golay._default_cache_dir() == tmp_path
+    monkeypatch.setenv(golay.GOLAY_CACHE_ENV, "")
+    assert golay._default_cache_dir() is None
+    monkeypatch.delenv(golay.GOLAY_CACHE_ENV)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert golay._default_cache_dir() == tmp_path / "sarukhanian" / "golay"
@@ -0,0 +1,69 @@
+import numpy as np
+
+from src.construction import get_default_plan, plan_to_sequences, verify_four_sequences
+from src.exhaustive_search import exhaustive_sign_search, simulated_annealing_search
+from src.greedy_search import greedy_sign_optimization
+from src.repair import apply_sign_flip
+
+
+def _random_signs(seed):
+    flips = np.flatnonzero(np.random.default_rng(seed).random(44) < 0.5)
+    return apply_sign_flip(get_default_plan(), [int(idx) for idx in flips])
+
+
+def _score(plan):
+    diag = verify_four_sequences(*plan_to_sequences(plan).as_tuple())
+    return diag["num_nonzero_shifts"], diag["max_abs_deviation"]
+
+
+def _is_flip_local_minimum(plan):
+    score = _score(plan)
+    return all(_score(apply_sign_flip(plan, idx)) >= score for idx in range(len(plan)))
+
+
+def test_greedy_stops_at_local_minimum_quietly(capsys):
+    result = greedy_sign_optimization(_random_signs(0))
+    assert capsys.readouterr().out == ""
+    diag = result["diagnostics"]
+    assert _score(result["plan"]) == (diag["num_nonzero_shifts"], diag["max_abs_deviation"])
+    assert _is_flip_local_minimum(result["plan"])
+
+
+def test_tabu_and_pair_flips_escape_greedy_minimum():
+    plan = _random_signs(0)
+    greedy = _score(greedy_sign_optimization(plan)["plan"])
+    tabu = greedy_sign_optimization(plan, tabu_tenure=7, max_iterations=300)
+    assert tabu["iterations"] == 300
+    assert _score(tabu["plan"]) < greedy
+    paired = greedy_sign_optimization(_random_signs(2), pair_flips=True, tabu_tenure=7, max_iterations=400)
+    assert _score(paired["plan"]) == (0, 0)
+
+
+def test_greedy_max_stall_ends_tabu_search():
+    result = greedy_sign_optimization(_random_signs(1), tabu_tenure=5, max_stall=10)
+    assert result["iterations"] < 1000
+
+
+def test_exhaustive_sign_search_reaches_flip_local_minimum(capsys):
+    result = exhaustive_sign_search(_random_signs(3))
+    assert capsys.readouterr().out == ""
+    assert _is_flip_local_minimum(result["plan"])
+    assert exhaustive_sign_search(get_default_plan())["iterations"] == 0
+
+
+def test_exhaustive_sign_search_shares_tabu_machinery():
+    plan = _random_signs(0)
+    plain = _score(exhaustive_sign_search(plan)["plan"])
+    tabu = exhaustive_sign_search(plan, tabu_tenure=7, max_configs=300)
+    assert tabu["iterations"] == 300
+    assert _score(tabu["plan"]) < plain
+    assert tabu["plan"] == greedy_sign_optimization(plan, tabu_tenure=7, max_iterations=300)["plan"]
+
+
+def test_simulated_annealing_prints_only_when_verbose(capsys):
+    plan = apply_sign_flip(get_default_plan(), 5)
+    quiet = simulated_annealing_search(plan, max_iterations=3000, random_seed=0)
+    assert quiet["diagnostics"]["num_nonzero_shifts"] == 0
+    assert capsys.readouterr().out == ""
+    simulated_annealing_search(plan, max_iterations=3000, random_seed=0, verbose=True)
+    assert "Found perfect solution" in capsys.readouterr().out
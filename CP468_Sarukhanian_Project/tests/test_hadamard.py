@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from src.construction import build_sarukhanian_110, verify_four_sequences
+from src.hadamard import (
+    GoethalsSeidel,
+    TMatrices,
+    circulant,
+    load_hadamard,
+    t_sequences,
+    verify_hadamard_matrix,
+)
+
+
+def _rows():
+    return np.stack(build_sarukhanian_110())
+
+
+def test_circulant_rows_rotate_right():
+    np.testing.assert_array_equal(circulant(np.array([1, -1, 0])), [[1, -1, 0], [0, 1, -1], [-1, 0, 1]])
+
+
+def test_goethals_seidel_order_440_is_hadamard():
+    hadamard = GoethalsSeidel(_rows())
+    assert hadamard.order == 440
+    assert hadamard.verify()
+    assert hadamard.check_gram()
+    dense = hadamard.dense().astype(np.int64)
+    np.testing.assert_array_equal(dense @ dense.T, 440 * np.eye(440, dtype=np.int64))
+    assert verify_hadamard_matrix(dense)
+
+
+def test_fft_products_match_dense_matrix():
+    hadamard = GoethalsSeidel(_rows())
+    dense = hadamard.dense().astype(np.int64)
+    vectors = np.random.default_rng(1).integers(-3, 4, size=(hadamard.order, 3))
+    np.testing.assert_array_equal(hadamard.matvec(vectors), dense @ vectors)
+    np.testing.assert_array_equal(hadamard.rmatvec(vectors), dense.T @ vectors)
+    np.testing.assert_array_equal(hadamard.matvec(vectors[:, 0]), dense @ vectors[:, 0])
+
+
+def test_broken_rows_are_rejected():
+    rows = _rows()
+    rows[0, 5] *= -1
+    hadamard = GoethalsSeidel(rows)
+    assert not hadamard.verify()
+    assert not hadamard.check_gram()
+    assert not verify_hadamard_matrix(hadamard.dense())
+
+
+def test_t_matrices_from_full_rows_have_double_length():
+    t_matrices = TMatrices.from_rows(_rows())
+    assert t_matrices.order == 220
+    assert t_matrices.verify()
+    diagnostics = verify_four_sequences(*t_matrices.first_rows, include_paf=True)
+    assert diagnostics["num_nonzero_shifts"] == 0 and diagnostics["paf"]["num_nonzero_shifts"] == 0
+    gram = sum(block.astype(np.int64) @ block.T.astype(np.int64) for block in t_matrices.circulants())
+    np.testing.assert_array_equal(gram, 220 * np.eye(220, dtype=np.int64))
+    hadamard = t_matrices.hadamard()
+    assert hadamard.order == 880 and hadamard.verify() and hadamard.check_gram()
+
+
+def test_t_sequences_from_complementary_supports_keep_length():
+    rows = np.array([[1, 1, 0, 0], [1, -1, 0, 0], [0, 0, 1, 1], [0, 0, 1, -1]], dtype=np.int8)
+    np.testing.assert_array_equal(t_sequences(rows), np.eye(4, dtype=np.int8))
+    np.testing.assert_array_equal(t_sequences(np.eye(4, dtype=np.int8)), np.eye(4, dtype=np.int8))
+    with pytest.raises(ValueError):
+        t_sequences(np.array([[1, 1, 0, 0], [1, 0, 0, 0], [0, 0, 1, 1], [0, 0, 1, -1]]))
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_save_and_load_round_trip(tmp_path, packed):
+    hadamard = GoethalsSeidel(_rows())
+    path = hadamard.save(tmp_path / "h440.npy", packed=packed, rows_per_chunk=100)
+    loaded = load_hadamard(path)
+    np.testing.assert_array_equal(loaded, hadamard.dense())
+    assert verify_hadamard_matrix(loaded, rows_per_chunk=128)
+    if packed:
+        assert path.stat().st_size < 440 * 440 // 4
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import src
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+# Generous wall-clock budget for the worker-side imports (numpy dominates).
+IMPORT_BUDGET_SECONDS = 2.0
+
+
+def _run(code):
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_DIR, capture_output=True, text=True,
+                            timeout=60)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+def test_search_imports_stay_within_budget_without_matplotlib():
+    output = _run(
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import src, src.parallel_search, src.hadamard\n"
+        "print(time.perf_counter() - start, 'matplotlib' in sys.modules)\n"
+    )
+    seconds, loaded_matplotlib = output.split()
+    assert loaded_matplotlib == "False"
+    assert float(seconds) < IMPORT_BUDGET_SECONDS
+
+
+def test_viz_import_has_no_side_effects():
+    output = _run(
+        "import pathlib, sys\n"
+        "def refuse(*args, **kwargs):\n"
+        "    raise AssertionError('mkdir at import time')\n"
+        "pathlib.Path.mkdir = refuse\n"
+        "import src.viz\n"
+        "print('matplotlib' in sys.modules)\n"
+    )
+    assert output == "False"
+
+
+def test_submodules_load_on_attribute_access():
+    assert "hadamard" in dir(src)
+    assert src.npaf.npaf_sum_four is not None
+    with pytest.raises(AttributeError):
+        src.not_a_module
+
+
+def test_plot_creates_figure_directory_on_save(tmp_path):
+    pytest.importorskip("matplotlib")
+    from src.viz import plot_sum_series
+
+    path = plot_sum_series(np.array([0, 2, -2], dtype=np.int32), "sum", save_path=tmp_path / "new" / "sum.png")
+    assert path.exists()
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from src.construction import build_sarukhanian_110
+from src.incremental import IncrementalNPAF
+from src.npaf import npaf_sum_four
+
+
+def test_flips_track_full_recomputation():
+    state = IncrementalNPAF(*build_sarukhanian_110())
+    rng = np.random.default_rng(5)
+    for _ in range(25):
+        start = int(rng.integers(0, state.length - 1))
+        stop = int(rng.integers(start + 1, min(start + 4, state.length) + 1))
+        proposed = state.propose_flip(start, stop)
+        state.apply_flip(start, stop)
+        np.testing.assert_array_equal(state.sum_series, proposed)
+        np.testing.assert_array_equal(state.sum_series, npaf_sum_four(*state.rows))
+
+
+def test_undo_restores_rows_and_series():
+    sequences = build_sarukhanian_110()
+    state = IncrementalNPAF(*sequences)
+    state.apply_flip(0, 3)
+    state.apply_flip(50, 52)
+    assert state.score() != (0, 0)
+    state.undo()
+    state.undo()
+    assert state.score() == (0, 0)
+    for row, seq in zip(state.rows, sequences):
+        np.testing.assert_array_equal(row, seq)
+    with pytest.raises(IndexError):
+        state.undo()
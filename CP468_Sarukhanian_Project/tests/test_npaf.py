@@ -1,6 +1,17 @@
 import numpy as np
+import pytest
 
-from src.npaf import npaf, npaf_all_shifts, npaf_sum_four
+from src.construction import diagnostics_from_sum_series, verify_four_sequences
+from src.npaf import (
+    npaf,
+    npaf_all_shifts,
+    npaf_and_paf_sum_four,
+    npaf_sum_four,
+    npaf_sum_four_batch,
+    paf_all_shifts,
+    paf_sum_four,
+    paf_sum_four_batch,
+)
 
 
 def test_npaf_all_ones():
@@ -26,3 +37,97 @@ def test_npaf_sum_four_matches_manual_sum():
     sum_series = npaf_sum_four(*seqs)
     manual = sum(npaf_all_shifts(seq) for seq in seqs)
     np.testing.assert_array_equal(sum_series, manual)
+
+
+def test_npaf_backends_agree_on_long_sequence():
+    rng = np.random.default_rng(7)
+    seq = rng.choice(np.array([-1, 1], dtype=np.int8), size=3001)
+    loop = np.array([npaf(seq, shift) for shift in range(1, seq.size)])
+    np.testing.assert_array_equal(npaf_all_shifts(seq, method="direct"), loop)
+    np.testing.assert_array_equal(npaf_all_shifts(seq, method="fft"), loop)
+    np.testing.assert_array_equal(npaf_all_shifts(seq), loop)
+
+
+def test_npaf_sum_four_fft_matches_direct():
+    rng = np.random.default_rng(11)
+    seqs = [rng.choice(np.array([-1, 1], dtype=np.int8), size=257) for _ in range(4)]
+    np.testing.assert_array_equal(
+        npaf_sum_four(*seqs, method="fft"),
+        npaf_sum_four(*seqs, method="direct"),
+    )
+
+
+def test_npaf_all_shifts_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        npaf_all_shifts(np.ones(4, dtype=np.int8), method="bogus")
+
+
+def test_npaf_sum_four_batch_matches_rowwise_sum():
+    rng = np.random.default_rng(3)
+    stacks = [rng.choice(np.array([-1, 1], dtype=np.int8), size=(6, 110)) for _ in range(4)]
+    for method in ("direct", "fft"):
+        sums, scores = npaf_sum_four_batch(*stacks, method=method)
+        assert sums.shape == (6, 109)
+        for row in range(6):
+            expected = npaf_sum_four(*(stack[row] for stack in stacks))
+            np.testing.assert_array_equal(sums[row], expected)
+            assert scores[row].tolist() == [np.count_nonzero(expected), np.abs(expected).max()]
+
+
+def _circulant_gram_row(rows):
+    n = rows.shape[1]
+    index = (np.arange(n)[None, :] - np.arange(n)[:, None]) % n
+    return sum(row[index].astype(np.int64) @ row[index].T.astype(np.int64) for row in rows)[0, 1:]
+
+
+def test_paf_matches_circulant_gram_with_zero_entries():
+    rng = np.random.default_rng(4)
+    for n in (2, 7, 300):
+        rows = rng.integers(-1, 2, size=(4, n)).astype(np.int8)
+        expected = _circulant_gram_row(rows)
+        for method in ("direct", "fft"):
+            np.testing.assert_array_equal(paf_sum_four(*rows, method=method), expected)
+            np.testing.assert_array_equal(paf_all_shifts(rows[0], method=method), _circulant_gram_row(rows[:1]))
+        np.testing.assert_array_equal(npaf_and_paf_sum_four(*rows)[1], expected)
+
+
+def test_paf_folds_npaf():
+    rng = np.random.default_rng(5)
+    rows = rng.choice(np.array([-1, 1], dtype=np.int8), size=(4, 40))
+    sum_series, paf_series = npaf_and_paf_sum_four(*rows)
+    np.testing.assert_array_equal(sum_series, npaf_sum_four(*rows))
+    np.testing.assert_array_equal(paf_series, sum_series + sum_series[::-1])
+    with pytest.raises(ValueError):
+        paf_all_shifts(np.array([2, 1, 0], dtype=np.int8))
+
+
+def test_paf_sum_four_batch_matches_rowwise_sum():
+    rng = np.random.default_rng(6)
+    stacks = [rng.integers(-1, 2, size=(5, 90)).astype(np.int8) for _ in range(4)]
+    for method in ("direct", "fft"):
+        sums, scores = paf_sum_four_batch(*stacks, method=method)
+        for row in range(5):
+            expected = paf_sum_four(*(stack[row] for stack in stacks))
+            np.testing.assert_array_equal(sums[row], expected)
+            assert scores[row].tolist() == [np.count_nonzero(expected), np.abs(expected).max()]
+
+
+def test_verify_four_sequences_accepts_zeros_only_when_asked():
+    rows = np.array([[1, 0], [0, 1], [0, 0], [0, 0]], dtype=np.int8)
+    with pytest.raises(ValueError, match="±1"):
+        verify_four_sequences(*rows)
+    plain = verify_four_sequences(*rows, allow_zero=True)
+    with_paf = verify_four_sequences(*rows, include_paf=True)
+    assert plain["num_nonzero_shifts"] == with_paf["num_nonzero_shifts"] == 0
+    assert "paf" not in plain and with_paf["paf"]["num_nonzero_shifts"] == 0
+    with pytest.raises(ValueError):
+        verify_four_sequences(*(rows * 2), include_paf=True)
+
+
+def test_diagnostics_report_real_length_for_short_sequences():
+    assert diagnostics_from_sum_series(np.zeros(0, dtype=np.int32))["length"] == 0
+    assert diagnostics_from_sum_series(np.zeros(4, dtype=np.int32))["length"] == 5
+    empty = np.zeros(0, dtype=np.int8)
+    assert verify_four_sequences(empty, empty, empty, empty)["length"] == 0
+    single = np.ones(1, dtype=np.int8)
+    assert verify_four_sequences(single, single, single, single, include_paf=True)["length"] == 1
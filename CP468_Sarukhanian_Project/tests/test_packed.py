@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from src.construction import build_sarukhanian_110
+from src.npaf import npaf_all_shifts, npaf_sum_four_batch
+from src.packed import (
+    PackedSequences,
+    pack_pm1,
+    packed_correlation,
+    packed_npaf_all_shifts,
+    popcount,
+    unpack_pm1,
+)
+
+
+@pytest.mark.parametrize("length", [1, 2, 63, 64, 65, 130])
+def test_pack_roundtrip(length):
+    rng = np.random.default_rng(length)
+    seqs = rng.choice(np.array([-1, 1], dtype=np.int8), size=(3, length))
+    words = pack_pm1(seqs)
+    assert words.dtype == np.uint64 and words.shape == (3, (length + 63) // 64)
+    np.testing.assert_array_equal(unpack_pm1(words, length), seqs)
+
+
+def test_popcount_matches_bin(monkeypatch):
+    words = np.array([0, 1, 0xFFFFFFFFFFFFFFFF, 0x8000000000000001], dtype=np.uint64)
+    np.testing.assert_array_equal(popcount(words), [0, 1, 64, 2])
+    monkeypatch.delattr(np, "bitwise_count", raising=False)
+    np.testing.assert_array_equal(popcount(words), [0, 1, 64, 2])
+
+
+@pytest.mark.parametrize("length", [2, 64, 65, 129])
+def test_packed_npaf_matches_direct(length):
+    rng = np.random.default_rng(7)
+    seqs = rng.choice(np.array([-1, 1], dtype=np.int8), size=(4, length))
+    words = pack_pm1(seqs)
+    got = packed_npaf_all_shifts(words, length, chunk_rows=3)
+    for row, seq in zip(got, seqs):
+        np.testing.assert_array_equal(row, npaf_all_shifts(seq, method="direct"))
+    np.testing.assert_array_equal(packed_correlation(words, length, 1), got[:, 0])
+
+
+def test_packed_quadruples_match_batch_npaf():
+    rng = np.random.default_rng(3)
+    quads = rng.choice(np.array([-1, 1], dtype=np.int8), size=(6, 4, 110))
+    quads[0] = np.stack(build_sarukhanian_110({}))
+    packed = PackedSequences.from_int8(quads)
+    assert packed.nbytes * 5 < quads.nbytes
+    sums = packed.npaf_sum_four()
+    expected, _ = npaf_sum_four_batch(*(quads[:, row] for row in range(4)))
+    np.testing.assert_array_equal(sums, expected)
+    assert not sums[0].any()
+    np.testing.assert_array_equal(packed.to_int8(), quads)
@@ -0,0 +1,40 @@
+import pytest
+
+import src.parallel_search as parallel_search
+from src.construction import get_default_plan
+from src.parallel_search import parallel_multi_start, start_seeds
+
+
+def test_seeds_are_reproducible_and_distinct():
+    seeds = start_seeds(8, seed=5)
+    assert seeds == start_seeds(8, seed=5)
+    assert len(set(seeds)) == 8
+
+
+def test_results_do_not_depend_on_worker_count():
+    runs = [
+        parallel_multi_start(get_default_plan(), num_starts=4, method="local",
+                             max_workers=workers, seed=3, max_steps=20)
+        for workers in (1, 2)
+    ]
+    assert [item.score for item in runs[0]["starts"]] == [item.score for item in runs[1]["starts"]]
+    assert runs[0]["plan"] == runs[1]["plan"]
+
+
+def test_perfect_start_stops_the_run():
+    result = parallel_multi_start(get_default_plan(), num_starts=6, method="local",
+                                  max_workers=1, random_start=False, max_steps=5)
+    assert result["score"] == (0, 0)
+    assert result["diagnostics"]["num_nonzero_shifts"] == 0
+    assert len(result["starts"]) < 6
+
+
+def test_unknown_method_rejected():
+    with pytest.raises(ValueError):
+        parallel_multi_start(get_default_plan(), num_starts=1, method="tabu")
+
+
+def test_zero_starts_rejected_before_starting_a_pool(monkeypatch):
+    monkeypatch.setattr(parallel_search, "ProcessPoolExecutor", None)
+    with pytest.raises(ValueError, match="num_starts"):
+        parallel_multi_start(get_default_plan(), num_starts=0)
@@ -1,5 +1,5 @@
 from src.construction import get_default_plan
-from src.repair import apply_sign_flip, auto_local_search, swap_blocks
+from src.repair import MOVE_KINDS, apply_sign_flip, auto_local_search, swap_blocks
 
 
 def test_apply_sign_flip_single_index():
@@ -26,3 +26,15 @@ def test_auto_local_search_smoke():
     assert all(seq.size == 110 for seq in sequences)
     assert "num_nonzero_shifts" in diag
     assert "max_abs_deviation" in diag
+
+
+def test_auto_local_search_profile_counts_every_move():
+    plan = apply_sign_flip(get_default_plan(), [0, 5, 9])
+    plain = auto_local_search(plan, max_steps=200, random_seed=1)
+    profiled = auto_local_search(plan, max_steps=200, random_seed=1, profile=True)
+    assert profiled["plan"] == plain["plan"]
+    assert "profile" not in plain
+    stats = profiled["profile"]
+    assert set(stats) == set(MOVE_KINDS)
+    assert sum(entry["proposed"] for entry in stats.values()) == 200
+    assert all(0 <= entry["accepted"] <= entry["proposed"] for entry in stats.values())
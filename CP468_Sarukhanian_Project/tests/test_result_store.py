@@ -0,0 +1,156 @@
+import numpy as np
+import pytest
+
+import src.construction as construction
+from src.construction import build_sarukhanian, get_default_plan
+import src.exhaustive_search as exhaustive_search
+import src.repair as repair
+from src.construction import plan_to_sequences
+from src.construction2 import build_construction2
+from src.exhaustive_search import gray_code_sign_search, meet_in_the_middle_sign_search, simulated_annealing_search
+from src.golay import golay_pair
+from src.greedy_search import greedy_sign_optimization
+from src.parallel_search import parallel_multi_start
+from src.repair import auto_local_search
+from src.result_store import ResultStore, pack_sequences, plan_hash, search_hash, unpack_sequences
+from src.sign_problem import sign_problem_from_tiles
+from src.sequences import BASE_SEQUENCES
+
+TURYN_N3 = tuple(BASE_SEQUENCES[name] for name in "ABCD")
+
+
+def test_pack_roundtrip():
+    rng = np.random.default_rng(0)
+    seqs = [rng.choice((-1, 1), size=size).astype(np.int8) for size in (7, 7, 6, 13)]
+    lengths, packed = pack_sequences(seqs)
+    assert len(packed) == (sum(lengths) + 7) // 8
+    for left, right in zip(unpack_sequences(lengths, packed), seqs):
+        np.testing.assert_array_equal(left, right)
+
+
+def test_plan_hash_tracks_plan_and_inputs():
+    plan = get_default_plan()
+    assert plan_hash(plan, *TURYN_N3) == plan_hash(get_default_plan(), *TURYN_N3)
+    plan[3]["sign"] = -plan[3]["sign"]
+    assert plan_hash(plan, *TURYN_N3) != plan_hash(get_default_plan(), *TURYN_N3)
+    assert plan_hash(None, [1, -1]) != plan_hash(None, [-1, 1])
+
+
+def test_build_sarukhanian_hits_store(tmp_path, monkeypatch):
+    with ResultStore(tmp_path / "results.sqlite") as store:
+        first = build_sarukhanian(TURYN_N3, store=store)
+        assert len(store) == 1
+        monkeypatch.setattr(construction, "iter_sarukhanian_family", None)
+        second = build_sarukhanian(TURYN_N3, store=store)
+    for left, right in zip(first, second):
+        np.testing.assert_array_equal(left, right)
+    with ResultStore(tmp_path / "results.sqlite") as reopened:
+        (stored,) = reopened.results("sarukhanian")
+        assert stored.n == 3 and stored.is_perfect
+        assert stored.provenance == {"source": "build_sarukhanian", "verified": True}
+        assert not stored.diagnostics["sum_series"].any()
+
+
+def test_construction2_records_diagnostics(tmp_path):
+    golay = golay_pair(1, cache_dir=None)
+    with ResultStore(tmp_path / "results.sqlite") as store:
+        rows = build_construction2(TURYN_N3, golay, signs=[1] * 12, store=store)
+        stored = store.get("construction2", 3, 1, plan_hash(None, *TURYN_N3, *golay, [1] * 12))
+        assert stored is not None and not stored.is_perfect
+        np.testing.assert_array_equal(stored.sequences[0], rows[0])
+        build_construction2(TURYN_N3, golay, store=store)
+        assert len(store) == 2
+
+
+def test_stored_failure_rejected_when_verifying(tmp_path):
+    with ResultStore(tmp_path / "results.sqlite") as store:
+        key = plan_hash(get_default_plan(), *TURYN_N3)
+        bad = build_sarukhanian(TURYN_N3)
+        store.put("sarukhanian", 3, 0, key, (bad[0], bad[0], bad[2], bad[3]))
+        with pytest.raises(ValueError):
+            build_sarukhanian(TURYN_N3, store=store)
+
+
+def _scrambled_plan():
+    plan = get_default_plan()
+    for idx in (1, 5, 9):
+        plan[idx]["sign"] = -plan[idx]["sign"]
+    return plan
+
+
+def test_search_hash_tracks_parameters():
+    plan = get_default_plan()
+    assert search_hash("greedy", {"a": 1}, plan) == search_hash("greedy", {"a": 1}, get_default_plan())
+    assert search_hash("greedy", {"a": 1}, plan) != search_hash("greedy", {"a": 2}, plan)
+    assert search_hash("greedy", {"a": 1}, plan) != search_hash("local", {"a": 1}, plan)
+
+
+def test_plan_searches_reuse_stored_results(tmp_path, monkeypatch):
+    plan = _scrambled_plan()
+    with ResultStore(tmp_path / "results.sqlite") as store:
+        fresh = {
+            "annealing": simulated_annealing_search(plan, max_iterations=300, random_seed=1, store=store),
+            "local": auto_local_search(plan, max_steps=200, random_seed=1, store=store),
+            "greedy": greedy_sign_optimization(plan, max_iterations=5, store=store),
+        }
+        assert len(store) == 3
+        monkeypatch.setattr(exhaustive_search, "IncrementalNPAF", None)
+        monkeypatch.setattr(repair, "IncrementalPlanScore", None)
+        again = {
+            "annealing": simulated_annealing_search(plan, max_iterations=300, random_seed=1, store=store),
+            "local": auto_local_search(plan, max_steps=200, random_seed=1, store=store),
+            "greedy": greedy_sign_optimization(plan, max_iterations=5, store=store),
+        }
+        for name, result in again.items():
+            assert result["plan"] == fresh[name]["plan"]
+            assert result.get("iterations") == fresh[name].get("iterations")
+            assert result["diagnostics"]["num_nonzero_shifts"] == fresh[name]["diagnostics"]["num_nonzero_shifts"]
+            np.testing.assert_array_equal(result["sequences"][0], plan_to_sequences(result["plan"]).x)
+            assert result["provenance"]["source"] in ("simulated_annealing_search", "auto_local_search",
+                                                      "greedy_sign_optimization")
+        assert again["local"]["provenance"]["params"] == {"max_steps": 200, "random_seed": 1}
+
+
+def test_unseeded_searches_bypass_store(tmp_path):
+    plan = _scrambled_plan()
+    with ResultStore(tmp_path / "results.sqlite") as store:
+        for _ in range(2):
+            annealing = simulated_annealing_search(plan, max_iterations=50, store=store)
+            local = auto_local_search(plan, max_steps=50, random_seed=None, store=store)
+            multi = parallel_multi_start(plan, num_starts=1, max_workers=1, seed=None, store=store,
+                                         max_iterations=1)
+            assert "provenance" not in annealing and "provenance" not in local and "starts" in multi
+        assert len(store) == 0
+
+
+def test_interrupted_search_is_not_stored(tmp_path):
+    with ResultStore(tmp_path / "results.sqlite") as store:
+        auto_local_search(_scrambled_plan(), max_steps=200, store=store, should_stop=lambda: True)
+        assert len(store) == 0
+
+
+def test_parallel_multi_start_reuses_stored_result(tmp_path):
+    plan = _scrambled_plan()
+    with ResultStore(tmp_path / "results.sqlite") as store:
+        fresh = parallel_multi_start(plan, num_starts=2, max_workers=1, store=store, max_iterations=3)
+        again = parallel_multi_start(plan, num_starts=2, max_workers=1, store=store, max_iterations=3)
+    assert "starts" in fresh and "starts" not in again
+    assert again["plan"] == fresh["plan"] and again["score"] == fresh["score"] and again["seed"] == fresh["seed"]
+
+
+def test_sign_searches_store_solutions(tmp_path):
+    rows = np.stack(plan_to_sequences(get_default_plan()).as_tuple())
+    problem = sign_problem_from_tiles(np.split(rows, 10, axis=1))
+    empty = sign_problem_from_tiles([np.ones((4, 2), dtype=np.int8)] * 3)
+    with ResultStore(tmp_path / "results.sqlite") as store:
+        fresh = gray_code_sign_search(problem, store=store)
+        again = gray_code_sign_search(problem, store=store)
+        assert [s.tolist() for s in again["solutions"]] == [s.tolist() for s in fresh["solutions"]]
+        assert again["visited"] == fresh["visited"] and again["exhaustive"]
+        for left, right in zip(again["sum_series"], fresh["sum_series"]):
+            np.testing.assert_array_equal(left, right)
+        meet = meet_in_the_middle_sign_search(problem, store=store)
+        assert len(meet_in_the_middle_sign_search(problem, store=store)["solutions"]) == len(meet["solutions"])
+        assert gray_code_sign_search(empty, store=store)["solutions"] == []
+        assert gray_code_sign_search(empty, store=store)["solutions"] == []
+        assert len(store) == 3
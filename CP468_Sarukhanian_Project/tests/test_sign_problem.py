@@ -0,0 +1,139 @@
+from itertools import product
+
+import numpy as np
+
+from src.compiled_plan import compile_plan
+from src.construction import get_default_plan, plan_to_sequences
+from src.construction2 import construction2_layout
+from src.exhaustive_search import (
+    branch_and_bound_sign_search,
+    coupling_components,
+    gray_code_sign_search,
+    iter_gray_code_signs,
+    meet_in_the_middle_sign_search,
+)
+from src.golay import golay_pair
+from src.npaf import npaf_sum_four
+from src.sequences import BASE_SEQUENCES
+from src.sign_problem import sign_problem_from_layout, sign_problem_from_plan, sign_problem_from_tiles
+
+TURYN_N3 = tuple(BASE_SEQUENCES[name] for name in "ABCD")
+
+
+def test_evaluate_matches_npaf_for_default_plan():
+    problem, signs = sign_problem_from_plan(get_default_plan())
+    assert not problem.evaluate(signs).any()
+    rng = np.random.default_rng(3)
+    flipped = signs * rng.choice((-1, 1), size=signs.size).astype(np.int8)
+    plan = get_default_plan()
+    for block, sign in zip(plan, flipped):
+        block["sign"] = int(sign)
+    expected = npaf_sum_four(*plan_to_sequences(plan).as_tuple())
+    np.testing.assert_array_equal(problem.evaluate(flipped), expected)
+
+
+def test_evaluate_matches_layout_score():
+    layout = construction2_layout(TURYN_N3, golay_pair(1, cache_dir=None))
+    problem = sign_problem_from_layout(layout)
+    signs = np.resize(np.array([1, -1, -1], dtype=np.int8), layout.num_blocks)
+    np.testing.assert_array_equal(problem.evaluate(signs),
+                                  npaf_sum_four(*layout.apply_signs(signs)))
+
+
+def test_plan_problem_matches_tile_construction():
+    compiled = compile_plan(get_default_plan())
+    compiled.swap(0, 40)
+    problem, _ = sign_problem_from_plan(compiled)
+    tiles = [compiled.table.columns[:, start:start + length] for start, length in
+             zip(compiled.table.tile_starts[compiled.pattern_ids, compiled.seq_ids], compiled.block_lengths)]
+    reference = sign_problem_from_tiles(tiles)
+    np.testing.assert_array_equal(problem.coupling, reference.coupling)
+    np.testing.assert_array_equal(problem.constant, reference.constant)
+
+
+def test_flip_neighbourhoods_match_evaluate():
+    problem, signs = sign_problem_from_plan(get_default_plan())
+    signs = signs * np.random.default_rng(5).choice((-1, 1), size=signs.size).astype(np.int8)
+    totals, fields = problem.evaluate(signs), problem.local_fields(signs)
+    singles = np.tile(signs, (signs.size, 1))
+    singles[np.arange(signs.size), np.arange(signs.size)] *= -1
+    np.testing.assert_array_equal(problem.flip_neighbourhood(signs, totals, fields), problem.evaluate_batch(singles))
+    rows, first, second = problem.pair_flip_neighbourhood(signs, totals, fields)
+    for k in (0, 17, rows.shape[0] - 1):
+        flipped = signs.copy()
+        flipped[[first[k], second[k]]] *= -1
+        np.testing.assert_array_equal(rows[k], problem.evaluate(flipped))
+
+
+def test_branch_and_bound_proves_construction2_n3_unsolvable():
+    for k in (1, 2):
+        layout = construction2_layout(TURYN_N3, golay_pair(k, cache_dir=None))
+        result = branch_and_bound_sign_search(sign_problem_from_layout(layout))
+        assert result["exhaustive"]
+        assert result["solutions"] == []
+
+
+def test_branch_and_bound_recovers_planted_solution():
+    rows = np.stack(plan_to_sequences(get_default_plan()).as_tuple())
+    tiles = np.split(rows, 10, axis=1)
+    problem = sign_problem_from_tiles(tiles)
+    result = branch_and_bound_sign_search(problem)
+    assert result["exhaustive"]
+    found = [tuple(int(v) for v in signs) for signs in result["solutions"]]
+    assert (1,) * 10 in found
+    for signs in result["solutions"]:
+        assert not problem.evaluate(signs).any()
+
+
+def test_meet_in_the_middle_matches_brute_force_on_one_component():
+    rows = np.stack(plan_to_sequences(get_default_plan()).as_tuple())
+    problem = sign_problem_from_tiles(np.split(rows, [7, 19, 30, 41, 58, 66, 80, 97], axis=1))
+    assert len(coupling_components(problem)) == 1
+    every = np.array(list(product((1, -1), repeat=problem.num_blocks)), dtype=np.int8)
+    brute = int(np.sum(~problem.evaluate_batch(every).any(axis=1)))
+    result = meet_in_the_middle_sign_search(problem)
+    assert result["exhaustive"]
+    assert len(result["solutions"]) * result["symmetry"] == brute == 2
+
+
+def test_meet_in_the_middle_solves_default_plan_and_construction2():
+    problem, signs = sign_problem_from_plan(get_default_plan())
+    result = meet_in_the_middle_sign_search(problem)
+    assert result["symmetry"] == 2 ** 4
+    canonical = signs.copy()
+    for component in coupling_components(problem):
+        canonical[component] *= canonical[component[0]]
+    assert any(np.array_equal(found, canonical) for found in result["solutions"])
+    for k in (1, 2):
+        layout = construction2_layout(TURYN_N3, golay_pair(k, cache_dir=None))
+        assert meet_in_the_middle_sign_search(sign_problem_from_layout(layout))["solutions"] == []
+
+
+def test_gray_code_matches_brute_force_near_zero():
+    rng = np.random.default_rng(1)
+    problem = sign_problem_from_tiles([rng.choice((-1, 1), size=(4, 1 + b % 2)).astype(np.int8) for b in range(9)])
+    every = np.array(list(product((1, -1), repeat=8)), dtype=np.int8)
+    every = np.hstack((np.ones((every.shape[0], 1), dtype=np.int8), every))
+    deviation = np.abs(problem.evaluate_batch(every)).max(axis=1)
+    expected = sorted(map(tuple, every[deviation <= 6].tolist()))
+    assert expected
+    for batch_bits, probe_shifts in ((0, 8), (3, 1), (20, 100)):
+        result = gray_code_sign_search(problem, max_deviation=6, batch_bits=batch_bits, probe_shifts=probe_shifts)
+        assert result["exhaustive"] and result["visited"] == 2 ** 8
+        assert sorted(map(tuple, (signs.tolist() for signs in result["solutions"]))) == expected
+        for signs, series in zip(result["solutions"], result["sum_series"]):
+            np.testing.assert_array_equal(series, problem.evaluate(signs))
+
+
+def test_gray_code_recovers_planted_solution_and_proves_construction2():
+    rows = np.stack(plan_to_sequences(get_default_plan()).as_tuple())
+    problem = sign_problem_from_tiles(np.split(rows, 10, axis=1))
+    signs, series = next(iter_gray_code_signs(problem, batch_bits=4))
+    assert not series.any() and not problem.evaluate(signs).any()
+    found = [tuple(signs.tolist()) for signs in gray_code_sign_search(problem)["solutions"]]
+    assert (1,) * 10 in found
+    for k in (1, 2):
+        layout = construction2_layout(TURYN_N3, golay_pair(k, cache_dir=None))
+        result = gray_code_sign_search(sign_problem_from_layout(layout))
+        assert result["exhaustive"] and result["solutions"] == []
+        assert result["visited"] == 2 ** (layout.num_blocks - 1)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from src.construction import get_default_plan, plan_to_sequences, verify_four_sequences
+from src.sign_problem import sign_problem_from_plan, sign_problem_from_tiles
+from src.tempering import batch_energy, parallel_tempering, temperature_ladder, tempering_search
+
+
+def test_energies():
+    totals = np.array([[0, 0, 0], [2, -4, 0]])
+    np.testing.assert_array_equal(batch_energy(totals, "squares"), [0, 20])
+    np.testing.assert_array_equal(batch_energy(totals, "lexicographic"), [0, 2004])
+    with pytest.raises(ValueError):
+        batch_energy(totals, "cubes")
+
+
+def test_ladder_is_geometric():
+    ladder = temperature_ladder(4, 1.0, 8.0)
+    np.testing.assert_allclose(ladder, [1.0, 2.0, 4.0, 8.0])
+
+
+@pytest.mark.parametrize("energy", ["squares", "lexicographic"])
+def test_tempering_solves_small_problem(energy):
+    rows = np.stack(plan_to_sequences(get_default_plan()).as_tuple())
+    problem = sign_problem_from_tiles(np.split(rows, 10, axis=1))
+    result = parallel_tempering(problem, num_replicas=8, max_steps=5000, energy=energy, random_seed=0)
+    assert result["solved"]
+    assert not problem.evaluate(result["signs"]).any()
+    assert result["evaluations"] == 8 * result["steps"]
+
+
+def test_tempering_tracks_state_exactly():
+    problem, _ = sign_problem_from_plan(get_default_plan())
+    result = parallel_tempering(problem, num_replicas=4, max_steps=300, random_seed=1)
+    np.testing.assert_array_equal(problem.evaluate(result["signs"]), result["sum_series"])
+
+
+def test_tempering_search_returns_plan_result():
+    result = tempering_search(get_default_plan(), num_replicas=4, max_steps=50, random_seed=2)
+    diag = verify_four_sequences(*plan_to_sequences(result["plan"]).as_tuple())
+    assert diag["num_nonzero_shifts"] == result["diagnostics"]["num_nonzero_shifts"]
+    assert result["iterations"] == result["tempering"]["steps"]
@@ -0,0 +1,29 @@
+import numpy as np
+
+from src.construction import iter_sarukhanian_family
+from src.sequences import BASE_SEQUENCES
+from src.turyn import canonical_form, enumerate_turyn, first_turyn, is_turyn
+
+
+def test_enumerate_turyn_small_orders():
+    assert [len(list(enumerate_turyn(n))) for n in range(2, 9)] == [1, 1, 1, 3, 4, 5, 20]
+    for quadruple in enumerate_turyn(6):
+        assert is_turyn(quadruple)
+        assert [seq.tolist() for seq in canonical_form(quadruple)] == [seq.tolist() for seq in quadruple]
+
+
+def test_canonical_form_collapses_symmetries():
+    base = tuple(BASE_SEQUENCES[name] for name in "ABCD")
+    a, b, c, d = base
+    alternated = tuple(seq * np.where(np.arange(seq.size) % 2, -1, 1).astype(np.int8) for seq in base)
+    variants = [(b, a, d, c), (-a, b[::-1], c, -d), alternated]
+    expected = [seq.tolist() for seq in canonical_form(base)]
+    for variant in variants:
+        assert [seq.tolist() for seq in canonical_form(variant)] == expected
+
+
+def test_enumerated_quadruples_feed_family_builder():
+    quadruples = [first_turyn(n) for n in range(2, 8)]
+    members = list(iter_sarukhanian_family(quadruples))
+    assert [member.result.x.size for member in members] == [22 * (2 * n - 1) for n in range(2, 8)]
+    assert len(list(enumerate_turyn(8, limit=2))) == 2
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from src.npaf import npaf_all_shifts, npaf_sum_four
+from src.viz import plot_heatmap_grid, plot_npaf_series, render_batch, render_pdf, series_batch
+
+
+def _quadruples(count, length, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.choice(np.array([-1, 1], dtype=np.int8), size=(count, 4, length))
+
+
+def test_series_batch_reuses_npaf_kernels():
+    quads = _quadruples(3, 20)
+    for series, quad in zip(series_batch(quads, kind="quadruple"), quads):
+        np.testing.assert_array_equal(series, npaf_sum_four(*quad))
+    ragged = series_batch([quads[0], quads[1][:, :12]], kind="quadruple")
+    assert [series.size for series in ragged] == [19, 11]
+    np.testing.assert_array_equal(series_batch(quads[:, 0], kind="sequence")[1], npaf_all_shifts(quads[1, 0]))
+    with pytest.raises(ValueError):
+        series_batch(quads, kind="matrix")
+
+
+def test_render_pdf_writes_one_page_per_chunk(tmp_path):
+    path = render_pdf(_quadruples(5, 16), tmp_path / "out" / "batch.pdf", kind="quadruple", per_page=2)
+    content = path.read_bytes()
+    assert content.startswith(b"%PDF")
+    assert b"/Count 3" in content
+
+
+def test_heatmap_grid_handles_ragged_series(tmp_path):
+    sums = [np.array([0, 2, -2], dtype=np.int32), np.array([4], dtype=np.int32)]
+    path = plot_heatmap_grid(sums, titles=["a", "b"], save_path=tmp_path / "grid.png")
+    assert path.exists() and path.stat().st_size > 0
+
+
+@pytest.mark.parametrize("values", [[1, -1, 1, 1], [1, 0, -1, 2], [0.5, -1.5, 2.0]])
+def test_plot_npaf_series_accepts_general_numeric_input(tmp_path, values):
+    path = plot_npaf_series(np.array(values), "npaf", save_path=tmp_path / "npaf.png")
+    assert path.exists() and path.stat().st_size > 0
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_render_batch_returns_paths_in_order(tmp_path, workers):
+    sums = [np.arange(-2, 3, dtype=np.int32) * sign for sign in (1, -1, 2)]
+    paths = render_batch(sums, tmp_path, titles=["x one", "x two", "x three"], workers=workers)
+    assert [path.name for path in paths] == ["x_one.png", "x_two.png", "x_three.png"]
+    assert all(path.exists() for path in paths)
+
+
+def test_render_batch_keeps_colliding_titles_inside_out_dir(tmp_path):
+    sums = [np.arange(-2, 3, dtype=np.int32) * sign for sign in (1, -1, 2, 3)]
+    out_dir = tmp_path / "out"
+    paths = render_batch(sums, out_dir, titles=["A b", "a b", "../escape", "a/b"])
+    assert [path.name for path in paths] == ["a_b.png", "a_b_1.png", "_escape.png", "a_b_3.png"]
+    assert all(path.parent == out_dir and path.exists() for path in paths)
+    assert not (tmp_path / "escape.png").exists()